@@ -0,0 +1,116 @@
+# Libraries ----
+import random
+import threading
+import time
+from typing import Dict, List
+
+import pyarrow.parquet
+
+
+class FakeLoadJob:
+    """Load job stand-in whose `result()` runs the simulated load."""
+
+    def __init__(self, run):
+        self._run = run
+        self.dml_stats = None
+
+    def result(self):
+        return self._run()
+
+
+class FakeTable:
+    """Table stand-in carrying the metadata the uploader reads or updates."""
+
+    def __init__(self, table_ref):
+        self.table_ref = table_ref
+        self.schema = None
+        self.expires = None
+
+
+class FakeBigQueryClient:
+    """
+    Local stand-in for google.cloud.bigquery.Client.
+
+    Load jobs parse the uploaded Parquet (so serialization cost is real),
+    then sleep `job_latency` seconds and fail with probability
+    `error_rate`. Only the methods BigQueryUploader calls are implemented.
+    """
+
+    def __init__(self, job_latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.job_latency = job_latency
+        self.error_rate = error_rate
+        self.rows_loaded = 0
+        self.load_jobs = 0
+        self.failed_jobs = 0
+        self.streamed_rows: List[Dict] = []
+        self.tables = set()
+        self.table_expires: Dict[str, object] = {}
+        self.copies: List[tuple] = []
+        self.queries: List[str] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    # Datasets and tables ----
+    def get_dataset(self, dataset_ref):
+        return dataset_ref
+
+    def create_dataset(self, dataset):
+        return dataset
+
+    def get_table(self, table_ref):
+        from google.api_core.exceptions import NotFound
+        if table_ref not in self.tables:
+            raise NotFound(table_ref)
+        return FakeTable(table_ref)
+
+    def update_table(self, table, fields):
+        if "expires" in fields:
+            self.table_expires[table.table_ref] = table.expires
+        return table
+
+    def delete_table(self, table_ref, not_found_ok=False):
+        self.tables.discard(table_ref)
+
+    def copy_table(self, source_ref, destination_ref, job_config=None):
+        def run():
+            time.sleep(self.job_latency)
+            with self._lock:
+                self.copies.append((source_ref, destination_ref))
+                self.tables.add(destination_ref)
+        return FakeLoadJob(run)
+
+    # Loads ----
+    def _job(self, table_ref, count_rows):
+        def run():
+            time.sleep(self.job_latency)
+            with self._lock:
+                self.load_jobs += 1
+                failed = self._random.random() < self.error_rate
+                if failed:
+                    self.failed_jobs += 1
+            if failed:
+                raise RuntimeError("injected load job failure")
+            rows = count_rows()
+            with self._lock:
+                self.rows_loaded += rows
+                self.tables.add(table_ref)
+        return FakeLoadJob(run)
+
+    def load_table_from_file(self, file_obj, table_ref, job_config=None):
+        return self._job(table_ref, lambda: pyarrow.parquet.read_metadata(file_obj).num_rows)
+
+    def load_table_from_dataframe(self, df, table_ref, job_config=None):
+        return self._job(table_ref, lambda: len(df))
+
+    def load_table_from_uri(self, source_uris, table_ref, job_config=None):
+        return self._job(table_ref, lambda: 0)
+
+    def query(self, query):
+        self.queries.append(query)
+        return FakeLoadJob(lambda: time.sleep(self.job_latency))
+
+    def insert_rows_json(self, table_ref, rows, **kwargs):
+        time.sleep(self.job_latency)
+        with self._lock:
+            self.streamed_rows.extend(rows)
+        return []
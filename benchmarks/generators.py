@@ -0,0 +1,242 @@
+# Libraries ----
+import json
+import zipfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+PAYLOAD_DIR = Path(__file__).parent / "payloads"
+
+WEATHER_DESCRIPTIONS = [
+    "clear sky", "few clouds", "scattered clouds", "broken clouds", "overcast clouds",
+    "light rain", "moderate rain", "light snow", "mist", "haze",
+]
+
+
+def load_payload(name: str) -> Union[dict, list]:
+    """Load a recorded API payload from benchmarks/payloads/."""
+    with open(PAYLOAD_DIR / name) as f:
+        return json.load(f)
+
+
+# Function: Weather Snapshots ----
+def make_weather_frame(
+    n_rows: int,
+    n_cities: int = 1,
+    start: str = "2024-12-27 18:39:57",
+    freq: str = "1h",
+    seed: int = 0
+) -> pd.DataFrame:
+    """
+    Generate weather rows with the same columns as get_current_weather_data.
+
+    Args:
+        n_rows (int): Number of rows
+        n_cities (int): Number of distinct cities (rows are spread round-robin)
+        start (str): First request_datetime
+        freq (str): Spacing between snapshots of the same city
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: Synthetic weather snapshots
+    """
+    rng = np.random.default_rng(seed)
+    city_index = np.arange(n_rows) % n_cities
+    step = np.arange(n_rows) // n_cities
+    timestamps = pd.Timestamp(start) + pd.to_timedelta(step * pd.Timedelta(freq).value, unit="ns")
+    temp = rng.normal(45, 15, n_rows)
+
+    return pd.DataFrame({
+        "request_datetime": timestamps.strftime("%Y-%m-%d %H:%M:%S"),
+        "city_name": [f"City {i}" for i in city_index],
+        "city_id": 4364362 + city_index,
+        "city_country": np.where(city_index % 2 == 0, "US", "CA"),
+        "longitude": -76.7002 + (city_index % 360) * 0.5,
+        "latitude": 39.084 + (city_index % 90) * 0.25,
+        "weather_description": rng.choice(WEATHER_DESCRIPTIONS, n_rows),
+        "temp_farenheit": temp,
+        "temp_min_farenheit": temp - rng.uniform(0, 5, n_rows),
+        "temp_max_farenheit": temp + rng.uniform(0, 5, n_rows),
+        "humidity": rng.integers(10, 100, n_rows),
+        "wind_speed": rng.uniform(0, 15, n_rows).round(2),
+    })
+
+
+def make_weather_snapshots(
+    directory: Union[str, Path],
+    n_files: int,
+    rows_per_file: int = 1,
+    seed: int = 0
+) -> Path:
+    """
+    Write a snapshot directory shaped like data/open_weather_data/.
+
+    Args:
+        directory (str): Output directory (created if missing)
+        n_files (int): Number of snapshot CSVs
+        rows_per_file (int): Rows (cities) per snapshot
+        seed (int): Random seed
+
+    Returns:
+        Path: The snapshot directory
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    frame = make_weather_frame(n_files * rows_per_file, n_cities=rows_per_file, seed=seed)
+    start = datetime(2024, 12, 27, 18, 39, 57)
+
+    for i in range(n_files):
+        timestamp = (start + timedelta(hours=i)).strftime("%Y-%m-%d_%H.%M.%S")
+        chunk = frame.iloc[i * rows_per_file:(i + 1) * rows_per_file]
+        chunk.to_csv(directory / f"open_weather_data_{timestamp}.csv", index=False)
+    return directory
+
+
+# Function: YouTube Channel Listing ----
+def make_channel_listing(n_videos: int, days: int = 365, seed: int = 0) -> List[Dict]:
+    """
+    Generate `search` result items for a channel, newest first.
+
+    Args:
+        n_videos (int): Number of videos
+        days (int): Publish dates are spread over this many days back from now
+        seed (int): Random seed
+
+    Returns:
+        list: Items shaped like the recorded youtube_search_item.json
+    """
+    template = load_payload("youtube_search_item.json")
+    rng = np.random.default_rng(seed)
+    now = datetime.now(timezone.utc)
+    offsets = np.sort(rng.uniform(0, days * 86400, n_videos))
+
+    items = []
+    for i, offset in enumerate(offsets):
+        published = (now - timedelta(seconds=float(offset))).strftime("%Y-%m-%dT%H:%M:%SZ")
+        item = json.loads(json.dumps(template))
+        item["id"]["videoId"] = f"vid{i:08d}"
+        item["snippet"]["publishedAt"] = published
+        item["snippet"]["publishTime"] = published
+        item["snippet"]["title"] = f"Synthetic video {i}"
+        items.append(item)
+    return items
+
+
+def page_listing(items: List[Dict], page_token: str = None, page_size: int = 50) -> Dict:
+    """Slice a listing into one `search` response page with nextPageToken."""
+    offset = int(page_token or 0)
+    page = {"kind": "youtube#searchListResponse", "items": items[offset:offset + page_size]}
+    if offset + page_size < len(items):
+        page["nextPageToken"] = str(offset + page_size)
+    return page
+
+
+def page_playlist_items(items: List[Dict], page_token: str = None, page_size: int = 50) -> Dict:
+    """Slice a listing into one uploads `playlistItems` response page."""
+    page = page_listing(items, page_token, page_size)
+    page["kind"] = "youtube#playlistItemListResponse"
+    page["items"] = [
+        {
+            "kind": "youtube#playlistItem",
+            "contentDetails": {
+                "videoId": item["id"]["videoId"],
+                "videoPublishedAt": item["snippet"]["publishedAt"],
+            },
+        }
+        for item in page["items"]
+    ]
+    return page
+
+
+def video_list_response(items: List[Dict], video_ids: List[str]) -> Dict:
+    """Build a `videos` response for the requested IDs of a listing."""
+    by_id = {item["id"]["videoId"]: item for item in items}
+    resources = []
+    for video_id in video_ids:
+        if video_id not in by_id:
+            continue
+        resources.append({
+            "kind": "youtube#video",
+            "id": video_id,
+            "snippet": by_id[video_id]["snippet"],
+            "contentDetails": {"duration": "PT12M34S"},
+            "statistics": {"viewCount": "1000", "likeCount": "50", "commentCount": "5"},
+        })
+    return {"kind": "youtube#videoListResponse", "items": resources}
+
+
+def make_transcript(video_id: str, n_segments: int = 200, seed: int = 0) -> List[Dict]:
+    """Generate transcript segments by cycling the recorded transcript."""
+    recorded = load_payload("youtube_transcript.json")
+    segments = []
+    for i in range(n_segments):
+        entry = recorded[i % len(recorded)]
+        segments.append({"text": entry["text"], "start": round(i * 3.2, 2), "duration": entry["duration"]})
+    return segments
+
+
+# Function: Web Analytics Zip ----
+def make_web_analytics_zip(
+    path: Union[str, Path],
+    n_folders: int = 10,
+    rows_per_file: int = 1000,
+    target_mb: float = 0,
+    seed: int = 0
+) -> Path:
+    """
+    Write a zip shaped like the Toronto web-analytics weekly report.
+
+    Each folder holds a "Key Metrics.csv"; when `target_mb` is set, stored
+    (uncompressed) padding files are added until the archive reaches about
+    that size, so multi-GB downloads can be simulated without holding them
+    in memory.
+
+    Args:
+        path (str): Output zip path
+        n_folders (int): Number of weekly folders
+        rows_per_file (int): Rows per Key Metrics.csv
+        target_mb (float): Approximate archive size in MB (0 for no padding)
+        seed (int): Random seed
+
+    Returns:
+        Path: The zip path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for i in range(n_folders):
+            folder = f"{(datetime(2024, 1, 1) + timedelta(weeks=i)).strftime('%Y-%m-%d')}"
+            metrics = pd.DataFrame({
+                "Date": pd.date_range("2024-01-01", periods=rows_per_file, freq="h").strftime("%Y-%m-%d %H:%M"),
+                "Sessions": rng.integers(0, 10000, rows_per_file),
+                "Users": rng.integers(0, 8000, rows_per_file),
+                "Pageviews": rng.integers(0, 50000, rows_per_file),
+                "Bounce Rate": rng.uniform(0, 1, rows_per_file).round(4),
+            })
+            z.writestr(f"{folder}/Key Metrics.csv", metrics.to_csv(index=False))
+
+        if target_mb:
+            # Random padding doesn't compress, so it is stored as-is
+            block = rng.bytes(1024 * 1024)
+            remaining = int(target_mb * 1024 * 1024)
+            pad_index = 0
+            while remaining > 0:
+                folder = f"{(datetime(2024, 1, 1) + timedelta(weeks=pad_index % n_folders)).strftime('%Y-%m-%d')}"
+                info = zipfile.ZipInfo(f"{folder}/Pages_{pad_index}.csv")
+                info.compress_type = zipfile.ZIP_STORED
+                size = min(remaining, 256 * 1024 * 1024)
+                with z.open(info, "w", force_zip64=True) as f:
+                    written = 0
+                    while written < size:
+                        piece = block[:min(len(block), size - written)]
+                        f.write(piece)
+                        written += len(piece)
+                remaining -= size
+                pad_index += 1
+
+    return path
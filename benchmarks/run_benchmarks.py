@@ -0,0 +1,422 @@
+"""
+Reproducible pipeline benchmarks against local API stand-ins.
+
+Usage (from the repo root):
+    python -m benchmarks.run_benchmarks --scale small --repeat 3
+    python -m benchmarks.run_benchmarks --scenarios weather_combine bigquery_chunked --latency 0.05
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/OLD.json benchmarks/results/NEW.json
+"""
+
+# Libraries ----
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+import requests
+
+from benchmarks import generators
+from benchmarks.fake_bigquery import FakeBigQueryClient
+from benchmarks.stub_server import StubServer
+from src.utilities.logging_setup import setup_logging
+from src.utilities.pipeline_runner import PipelineRunner
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+SCALES = {
+    "small": {
+        "weather_requests": 20,
+        "snapshot_files": 500,
+        "channel_videos": 500,
+        "transcript_videos": 50,
+        "transcript_segments": 200,
+        "zip_folders": 10,
+        "zip_mb": 20,
+        "bigquery_rows": 1_000_000,
+    },
+    "large": {
+        "weather_requests": 200,
+        "snapshot_files": 20_000,
+        "channel_videos": 5_000,
+        "transcript_videos": 500,
+        "transcript_segments": 1_000,
+        "zip_folders": 52,
+        "zip_mb": 2048,
+        "bigquery_rows": 20_000_000,
+    },
+}
+
+
+class Context:
+    """State shared by a scenario's setup and run steps."""
+
+    def __init__(self, server: StubServer, workdir: Path, params: Dict, args: argparse.Namespace):
+        self.server = server
+        self.workdir = workdir
+        self.params = params
+        self.args = args
+        self.state: Dict = {}
+
+
+@contextlib.contextmanager
+def _chdir(path: Path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+# Scenarios ----
+def setup_weather_current(ctx: Context) -> None:
+    from src.utilities import weather_api_functions
+    ctx.server.add_json("/data/2.5/weather", generators.load_payload("open_weather_current.json"))
+    weather_api_functions.OPEN_WEATHER_BASE_URL = ctx.server.base_url
+
+
+def run_weather_current(ctx: Context) -> int:
+    from src.utilities.weather_api_functions import get_current_weather_data
+    rows = 0
+    for _ in range(ctx.params["weather_requests"]):
+        df = get_current_weather_data()
+        rows += 0 if df is None else len(df)
+    return rows
+
+
+def setup_weather_combine(ctx: Context) -> None:
+    ctx.state["snapshots"] = generators.make_weather_snapshots(
+        ctx.workdir / "open_weather_data", ctx.params["snapshot_files"], seed=ctx.args.seed
+    )
+
+
+def run_weather_combine(ctx: Context) -> int:
+    from src.utilities.weather_api_functions import get_combine_weather_data
+    get_combine_weather_data(data_path=str(ctx.state["snapshots"]))
+    return ctx.params["snapshot_files"]
+
+
+def setup_youtube_video_ids(ctx: Context) -> None:
+    from src.utilities import functions
+    listing = generators.make_channel_listing(ctx.params["channel_videos"], seed=ctx.args.seed)
+    ctx.server.add_json(
+        "/youtube/v3/search",
+        lambda path, query: generators.page_listing(listing, (query.get("pageToken") or [None])[0])
+    )
+    ctx.server.add_json(
+        "/youtube/v3/channels",
+        {"items": [{"contentDetails": {"relatedPlaylists": {"uploads": "UUbenchmark"}}}]}
+    )
+    ctx.server.add_json(
+        "/youtube/v3/playlistItems",
+        lambda path, query: generators.page_playlist_items(listing, (query.get("pageToken") or [None])[0])
+    )
+    ctx.server.add_json(
+        "/youtube/v3/videos",
+        lambda path, query: generators.video_list_response(listing, query["id"][0].split(","))
+    )
+    functions.YOUTUBE_API_BASE_URL = f"{ctx.server.base_url}/youtube/v3"
+    (ctx.workdir / "data").mkdir(exist_ok=True)
+
+
+def run_youtube_video_ids(ctx: Context) -> int:
+    from src.utilities.functions import get_video_ids
+    with _chdir(ctx.workdir):
+        get_video_ids(lookback_days=366)
+    return ctx.params["channel_videos"]
+
+
+def run_youtube_video_ids_stream(ctx: Context) -> int:
+    from src.utilities.functions import get_video_ids
+    with _chdir(ctx.workdir):
+        get_video_ids(lookback_days=366, stream=True)
+    return ctx.params["channel_videos"]
+
+
+def run_youtube_video_ids_search(ctx: Context) -> int:
+    from src.utilities.functions import get_video_ids
+    with _chdir(ctx.workdir):
+        get_video_ids(lookback_days=366, listing="search")
+    return ctx.params["channel_videos"]
+
+
+def setup_youtube_transcripts(ctx: Context) -> None:
+    import polars as pl
+    from src.utilities import functions
+
+    segments = ctx.params["transcript_segments"]
+    ctx.server.add_json(
+        "/transcripts/",
+        lambda path, query: generators.make_transcript(path.rsplit("/", 1)[-1], segments),
+        prefix=True
+    )
+    base_url = ctx.server.base_url
+
+    def get_transcript(video_id, *args, **kwargs):
+        response = requests.get(f"{base_url}/transcripts/{video_id}")
+        response.raise_for_status()
+        return response.json()
+
+    # youtube_transcript_api has no base URL setting, so route it to the stub
+    ctx.state["original_get_transcript"] = functions.YouTubeTranscriptApi.get_transcript
+    functions.YouTubeTranscriptApi.get_transcript = staticmethod(get_transcript)
+
+    listing = generators.make_channel_listing(ctx.params["transcript_videos"], seed=ctx.args.seed)
+    data_dir = ctx.workdir / "data"
+    data_dir.mkdir(exist_ok=True)
+    # get_video_transcripts reads the most recent video_ids file
+    pl.DataFrame([
+        {"video_id": item["id"]["videoId"], "datetime": item["snippet"]["publishedAt"], "title": item["snippet"]["title"]}
+        for item in listing
+    ]).write_parquet(data_dir / "video_ids_2024-12-26_11.33.59.parquet")
+
+
+def run_youtube_transcripts(ctx: Context) -> int:
+    from src.utilities.functions import get_video_transcripts
+    with _chdir(ctx.workdir):
+        get_video_transcripts()
+    return ctx.params["transcript_videos"]
+
+
+def run_youtube_transcripts_stream(ctx: Context) -> int:
+    from src.utilities.functions import get_video_transcripts
+    with _chdir(ctx.workdir):
+        get_video_transcripts(stream=True)
+    return ctx.params["transcript_videos"]
+
+
+def teardown_youtube_transcripts(ctx: Context) -> None:
+    from src.utilities import functions
+    functions.YouTubeTranscriptApi.get_transcript = ctx.state["original_get_transcript"]
+
+
+def setup_web_analytics_zip(ctx: Context) -> None:
+    zip_path = generators.make_web_analytics_zip(
+        ctx.workdir / "web-analytics.zip",
+        n_folders=ctx.params["zip_folders"],
+        target_mb=ctx.params["zip_mb"],
+        seed=ctx.args.seed
+    )
+    ctx.server.add_file("/dataset/web-analytics.zip", zip_path)
+    ctx.state["zip_url"] = f"{ctx.server.base_url}/dataset/web-analytics.zip"
+
+
+def run_web_analytics_zip(ctx: Context) -> int:
+    from src.utilities import opt_web_analytics
+    opt_web_analytics.cache.clear()
+    df = opt_web_analytics.process_zip_and_combine_metrics(ctx.state["zip_url"], max_folders=ctx.params["zip_folders"])
+    return len(df)
+
+
+def run_web_analytics_zip_stream(ctx: Context) -> int:
+    from src.utilities import opt_web_analytics
+    result = opt_web_analytics.stream_zip_metrics(
+        ctx.state["zip_url"], str(ctx.workdir / "web_analytics.parquet"), max_folders=ctx.params["zip_folders"]
+    )
+    return result["rows"]
+
+
+def setup_bigquery_chunked(ctx: Context) -> None:
+    from src.utilities.bigquery_functions import BigQueryUploader
+    client = FakeBigQueryClient(job_latency=ctx.args.latency, error_rate=ctx.args.error_rate, seed=ctx.args.seed)
+    ctx.state["uploader"] = BigQueryUploader("benchmark-project", "benchmark_dataset", client=client)
+    ctx.state["frame"] = generators.make_weather_frame(ctx.params["bigquery_rows"], n_cities=100, seed=ctx.args.seed)
+
+
+def run_bigquery_chunked(ctx: Context) -> int:
+    ctx.state["uploader"].upload_dataframe_chunked(
+        ctx.state["frame"], "weather", chunk_size=100_000, retry_delay=0.01
+    )
+    return len(ctx.state["frame"])
+
+
+def setup_bigquery_files(ctx: Context) -> None:
+    from src.utilities.bigquery_functions import BigQueryUploader
+    client = FakeBigQueryClient(job_latency=ctx.args.latency, seed=ctx.args.seed)
+    ctx.state["uploader"] = BigQueryUploader("benchmark-project", "benchmark_dataset", client=client)
+    ctx.state["snapshots"] = generators.make_weather_snapshots(
+        ctx.workdir / "bq_weather", ctx.params["snapshot_files"], seed=ctx.args.seed
+    )
+
+
+def run_bigquery_files(ctx: Context) -> int:
+    ctx.state["uploader"].upload_file(ctx.state["snapshots"], "weather", file_type="csv")
+    return ctx.params["snapshot_files"]
+
+
+SCENARIOS: Dict[str, Dict[str, Callable]] = {
+    "weather_current": {"setup": setup_weather_current, "run": run_weather_current},
+    "weather_combine": {"setup": setup_weather_combine, "run": run_weather_combine},
+    "youtube_video_ids": {"setup": setup_youtube_video_ids, "run": run_youtube_video_ids},
+    "youtube_video_ids_search": {"setup": setup_youtube_video_ids, "run": run_youtube_video_ids_search},
+    "youtube_video_ids_stream": {"setup": setup_youtube_video_ids, "run": run_youtube_video_ids_stream},
+    "youtube_transcripts": {
+        "setup": setup_youtube_transcripts,
+        "run": run_youtube_transcripts,
+        "teardown": teardown_youtube_transcripts,
+    },
+    "youtube_transcripts_stream": {
+        "setup": setup_youtube_transcripts,
+        "run": run_youtube_transcripts_stream,
+        "teardown": teardown_youtube_transcripts,
+    },
+    "web_analytics_zip": {"setup": setup_web_analytics_zip, "run": run_web_analytics_zip},
+    "web_analytics_zip_stream": {"setup": setup_web_analytics_zip, "run": run_web_analytics_zip_stream},
+    "bigquery_chunked": {"setup": setup_bigquery_chunked, "run": run_bigquery_chunked},
+    "bigquery_files": {"setup": setup_bigquery_files, "run": run_bigquery_files},
+}
+
+
+# Function: Run Scenario ----
+def run_scenario(name: str, args: argparse.Namespace, params: Dict) -> Dict:
+    """
+    Set up a scenario against a fresh stub server and time `args.repeat` runs.
+
+    Returns:
+        dict: Timings and per-run stage metrics, or a skip/failure record
+    """
+    scenario = SCENARIOS[name]
+    runner = PipelineRunner(f"benchmark_{name}", track_memory=True, verbose=False)
+    result = {"scenario": name, "status": "ok", "runs": []}
+
+    with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as tmp, \
+            StubServer(args.latency, args.jitter, args.error_rate, args.seed) as server:
+        ctx = Context(server, Path(tmp), params, args)
+        try:
+            scenario["setup"](ctx)
+        except ImportError as e:
+            # e.g. functions.py needs sentence-transformers installed
+            return {"scenario": name, "status": "skipped", "error": str(e), "runs": []}
+
+        try:
+            for i in range(args.repeat):
+                output = io.StringIO()
+                redirect = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(output)
+                with redirect, runner.stage(f"{name}_{i}") as metrics:
+                    metrics.rows = scenario["run"](ctx)
+                result["runs"].append(metrics.to_dict())
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            if "teardown" in scenario:
+                scenario["teardown"](ctx)
+
+        result["stub_requests"] = server.request_count
+        result["stub_errors"] = server.error_count
+
+    walls = [run["wall_seconds"] for run in result["runs"]]
+    if walls:
+        result["wall_median"] = statistics.median(walls)
+        result["wall_min"] = min(walls)
+        result["cpu_median"] = statistics.median(run["cpu_seconds"] for run in result["runs"])
+        result["python_peak_mb_max"] = max(run["python_peak_mb"] or 0 for run in result["runs"])
+        result["rows"] = result["runs"][-1]["rows"]
+    return result
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+# Function: Compare Results ----
+def compare_results(old_path: str, new_path: str) -> pd.DataFrame:
+    """
+    Compare two result files scenario by scenario.
+
+    Returns:
+        pd.DataFrame: Median wall time of each run and new/old ratio
+    """
+    def load(path):
+        with open(path) as f:
+            data = json.load(f)
+        return {s["scenario"]: s for s in data["scenarios"] if s.get("wall_median") is not None}
+
+    old, new = load(old_path), load(new_path)
+    rows = []
+    for name in sorted(set(old) | set(new)):
+        old_wall = old.get(name, {}).get("wall_median")
+        new_wall = new.get(name, {}).get("wall_median")
+        rows.append({
+            "scenario": name,
+            "old_wall_median": old_wall,
+            "new_wall_median": new_wall,
+            "ratio": (new_wall / old_wall) if old_wall and new_wall else None,
+            "old_peak_mb": old.get(name, {}).get("python_peak_mb_max"),
+            "new_peak_mb": new.get(name, {}).get("python_peak_mb_max"),
+        })
+    return pd.DataFrame(rows)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the pipelines against local API stand-ins.")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-request/job latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected failure")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", default=str(RESULTS_DIR))
+    parser.add_argument("--verbose", action="store_true", help="Show the pipelines' own output")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        print(compare_results(*args.compare).to_string(index=False))
+        return
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Pipeline logs go next to the results, never into the repo's log.log
+    setup_logging(log_file=str(output_dir / "benchmark.log"), console=args.verbose)
+
+    params = SCALES[args.scale]
+    results = {
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "params": params,
+        "settings": {
+            "repeat": args.repeat,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+        },
+        "scenarios": [],
+    }
+
+    for name in args.scenarios:
+        print(f"Running {name}...")
+        result = run_scenario(name, args, params)
+        results["scenarios"].append(result)
+        if result["status"] == "ok":
+            print(f"---> median {result['wall_median']:.3f}s, min {result['wall_min']:.3f}s, "
+                  f"peak {result['python_peak_mb_max']:.1f} MB, {result['stub_requests']} stub requests")
+        else:
+            print(f"---> {result['status']}: {result.get('error')}")
+
+    output_file = output_dir / f"benchmark_{datetime.now().strftime('%Y-%m-%d_%H.%M.%S')}_{args.scale}.json"
+    with open(output_file, "w") as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"\nResults saved to {output_file}")
+
+
+if __name__ == "__main__":
+    main()
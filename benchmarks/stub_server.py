@@ -0,0 +1,158 @@
+# Libraries ----
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+
+class StubServer:
+    """
+    Local HTTP stand-in for the OpenWeather, YouTube and CKAN APIs.
+
+    Routes return recorded or generated payloads. Every request first waits
+    `latency` seconds (plus up to `jitter`), then fails with HTTP 500 with
+    probability `error_rate`, so the pipelines can be benchmarked under
+    realistic network conditions without touching the real services.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        """
+        Initialize the stub server.
+
+        Args:
+            latency (float): Base delay per request in seconds
+            jitter (float): Extra random delay per request, up to this many seconds
+            error_rate (float): Probability of answering with HTTP 500
+            seed (int): Seed for jitter and error injection
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.error_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Callable] = {}
+        self._prefix_routes: Dict[str, Callable] = {}
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubServer":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    # Routes ----
+    def add_json(self, path: str, payload: Union[dict, list, Callable], prefix: bool = False) -> None:
+        """
+        Serve JSON at `path`.
+
+        Args:
+            path (str): URL path, or path prefix when `prefix` is True
+            payload: A JSON-able object, or a callable `(path, query) -> object`
+        """
+        def handler(request_path, query):
+            body = payload(request_path, query) if callable(payload) else payload
+            return 200, "application/json", json.dumps(body).encode()
+        self._add(path, handler, prefix)
+
+    def add_file(self, path: str, file_path: Union[str, Path], content_type: str = "application/zip") -> None:
+        """Serve a file from disk at `path` (streamed, with content-length)."""
+        file_path = Path(file_path)
+
+        def handler(request_path, query):
+            return 200, content_type, file_path
+        self._add(path, handler, False)
+
+    def _add(self, path: str, handler: Callable, prefix: bool) -> None:
+        if prefix:
+            self._prefix_routes[path] = handler
+        else:
+            self._routes[path] = handler
+
+    def _resolve(self, path: str) -> Optional[Callable]:
+        if path in self._routes:
+            return self._routes[path]
+        for prefix, handler in self._prefix_routes.items():
+            if path.startswith(prefix):
+                return handler
+        return None
+
+    def _should_fail(self) -> tuple:
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+        return delay, failed
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                delay, failed = server._should_fail()
+                if delay:
+                    time.sleep(delay)
+
+                handler = server._resolve(parsed.path)
+                if handler is None:
+                    return self._send(404, "application/json", b'{"error": "not found"}')
+                if failed:
+                    return self._send(500, "application/json", b'{"error": "injected failure"}')
+
+                status, content_type, body = handler(parsed.path, parse_qs(parsed.query))
+                if isinstance(body, Path):
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(body.stat().st_size))
+                    self.end_headers()
+                    with open(body, "rb") as f:
+                        while chunk := f.read(1024 * 1024):
+                            self.wfile.write(chunk)
+                else:
+                    self._send(status, content_type, body)
+
+            def _send(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
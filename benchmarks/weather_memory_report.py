@@ -0,0 +1,52 @@
+"""
+Memory footprint of the weather frame with default vs compact dtypes.
+
+Usage (from the repo root):
+    python -m benchmarks.weather_memory_report --rows 5000000 --cities 1000
+"""
+
+# Libraries ----
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from benchmarks import generators
+from src.utilities.weather_schema import load_weather_frame, memory_report, save_weather_parquet
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Report weather frame memory with default vs compact dtypes.")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--cities", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--io", action="store_true", help="Also time CSV/Parquet round trips")
+    args = parser.parse_args(argv)
+
+    df = generators.make_weather_frame(args.rows, n_cities=args.cities, seed=args.seed)
+    print(f"Synthetic history: {len(df):,} rows, {args.cities:,} cities\n")
+    print(memory_report(df).to_string())
+
+    if args.io:
+        with tempfile.TemporaryDirectory(prefix="weather_memory_") as tmp:
+            csv_path = Path(tmp) / "weather.csv"
+            parquet_path = Path(tmp) / "weather.parquet"
+            df.to_csv(csv_path, index=False)
+
+            start = time.perf_counter()
+            typed = load_weather_frame(csv_path)
+            print(f"\nload_weather_frame(csv): {time.perf_counter() - start:.2f}s")
+
+            start = time.perf_counter()
+            save_weather_parquet(typed, parquet_path)
+            print(f"save_weather_parquet: {time.perf_counter() - start:.2f}s "
+                  f"({parquet_path.stat().st_size / 1024**2:.1f} MB vs {csv_path.stat().st_size / 1024**2:.1f} MB CSV)")
+
+            start = time.perf_counter()
+            load_weather_frame(parquet_path)
+            print(f"load_weather_frame(parquet): {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,33 @@
-from src.utilities.functions import get_video_ids, get_video_transcripts
 import time
-import datetime
+from datetime import date
+
+from src.utilities.functions import get_video_ids, get_video_transcripts
+from src.utilities.logging_setup import setup_logging
+from src.utilities.output_store import store_run_outputs
+from src.utilities.pipeline_runner import PipelineRunner
+from src.utilities.transcript_index import update_transcript_index
+
+setup_logging()
+runner = PipelineRunner(
+    "youtube",
+    metrics_path="metrics/pipeline_metrics.jsonl",
+    prometheus_path="metrics/youtube_pipeline.prom",
+    checkpoint_path="data/pipeline_checkpoints.json"
+)
+started_at = time.time()
+
+# Step 1: extract video IDs (once per day for the same channel and lookback)
+runner.run_stage("video_ids", get_video_ids, memo_key=date.today().isoformat())
+
+# Step 2: extract transcripts for videos (skipped if the video ID list is unchanged)
+runner.run_stage(
+    "video_transcripts", get_video_transcripts, segments=True, memo_inputs=["data/video_ids_*.parquet"]
+)
 
-print("Starting data pipeline at ", datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-print("----------------------------------------------")
+# Step 3: add new transcripts to the search index
+runner.run_stage("transcript_index", update_transcript_index)
 
-# Step 1: extract video IDs
-t0 = time.time()
-get_video_ids()
-t1 = time.time()
-print("Step 1: Done")
-print("---> Video IDs downloaded in", str(t1-t0), "seconds", "\n")
+# Step 4: deduplicate this run's outputs into the content-addressed store
+runner.run_stage("store_outputs", store_run_outputs, runner.run_id, "youtube", since=started_at, prune=True)
 
-# Step 2: extract transcripts for videos
-t0 = time.time()
-get_video_transcripts()
-t1 = time.time()
-print("Step 2: Done")
-print("---> Transcripts downloaded in", str(t1-t0), "seconds", "\n")
\ No newline at end of file
+runner.finish()
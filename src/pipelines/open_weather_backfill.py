@@ -0,0 +1,35 @@
+from src.utilities.weather_backfill import WeatherBackfill
+from src.utilities.weather_scheduler import load_locations
+from src.utilities.weather_api_functions import get_combine_weather_data
+from src.utilities.logging_setup import setup_logging
+from datetime import datetime
+import argparse
+
+parser = argparse.ArgumentParser(description = "Backfill historical Open Weather data")
+parser.add_argument("--start", required = True, help = "First day to backfill (YYYY-MM-DD, UTC)")
+parser.add_argument("--end", required = True, help = "Day after the last day to backfill (YYYY-MM-DD, UTC)")
+parser.add_argument("--locations", help = "JSON file of locations (default: Odenton, MD, US)")
+parser.add_argument("--workers", type = int, default = 4, help = "Work units fetched in parallel")
+parser.add_argument("--calls-per-minute", type = float, default = 60, help = "API rate limit across workers")
+parser.add_argument("--combine", action = "store_true", help = "Rebuild the combined CSV afterwards")
+args = parser.parse_args()
+
+setup_logging()
+
+if args.locations:
+    locations = load_locations(args.locations)
+else:
+    locations = [{"city": "Odenton", "state": "MD", "country": "US"}]
+
+backfill = WeatherBackfill(
+    locations,
+    start = datetime.strptime(args.start, "%Y-%m-%d"),
+    end = datetime.strptime(args.end, "%Y-%m-%d"),
+    max_workers = args.workers,
+    calls_per_minute = args.calls_per_minute
+)
+stats = backfill.run()
+print(f"\nBackfill done: {stats}")
+
+if args.combine and stats["rows"]:
+    get_combine_weather_data(lock=True)
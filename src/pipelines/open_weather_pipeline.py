@@ -1,27 +1,88 @@
 from src.utilities.weather_api_functions import get_current_weather_data, get_save_weather_data, get_combine_weather_data
-import time
-import datetime
-
-print("Starting Open Weather data pipeline at ", datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-print("----------------------------------------------")
-
-# Step 1: Extract Current Weather Data from Open Weather API ----
-t0 = time.time()
-weather_df = get_current_weather_data(verbose = False)
-t1 = time.time()
-print("\nStep 1: Done")
-print("---> Weather data extracted in", str(t1-t0), "seconds", "\n")
-
-# Step 2: Save Weather Data to Data File ----
-t0 = time.time()
-get_save_weather_data(data = weather_df)
-t1 = time.time()
-print("\nStep 2: Done")
-print("---> Weather data save in", str(t1-t0), "seconds", "\n")
-
-# Step 3: Combine Weather Data ----
-t0 = time.time()
-get_combine_weather_data()
-t1 = time.time()
-print("\nStep 3: Done")
-print("---> Weather combined and saved in", str(t1-t0), "seconds", "\n")
\ No newline at end of file
+from src.utilities.weather_rollups import update_weather_rollups
+from src.utilities.pipeline_runner import PipelineRunner
+from src.utilities.location_index import LocationIndex
+from src.utilities.logging_setup import setup_logging
+import argparse
+
+
+def run_once():
+    runner = PipelineRunner(
+        "open_weather", metrics_path="metrics/pipeline_metrics.jsonl", prometheus_path="metrics/open_weather_pipeline.prom"
+    )
+
+    # Step 1: Extract Current Weather Data from Open Weather API ----
+    # Request by city ID once the local index knows it, instead of a free-text q= lookup
+    city, state, country = "Odenton", "MD", "US"
+    index = LocationIndex()
+    entry = index.lookup(city, state, country)
+    weather_df = runner.run_stage(
+        "extract_weather", get_current_weather_data,
+        country = country, state = state, city = city, verbose = False,
+        city_id = entry["city_id"] if entry is not None else None
+    )
+    if entry is None and weather_df is not None:
+        index.add_from_response(city, state, country, weather_df)
+        index.save()
+
+    # Step 2: Save Weather Data to Data File ----
+    runner.run_stage("save_weather", get_save_weather_data, data = weather_df)
+
+    # Step 3: Combine Weather Data ----
+    runner.run_stage("combine_weather", get_combine_weather_data, lock=True)
+
+    # Step 4: Update Daily/Monthly Rollups ----
+    runner.run_stage("rollup_weather", update_weather_rollups)
+
+    runner.finish()
+
+
+def run_daemon(args):
+    from src.utilities.weather_scheduler import WeatherPollingDaemon, load_locations
+    from src.utilities.location_index import resolve_locations
+
+    if args.locations:
+        locations = load_locations(args.locations)
+    else:
+        locations = [{"city": "Odenton", "state": "MD", "country": "US"}]
+
+    # Poll by city ID wherever the local index knows it
+    index = LocationIndex()
+    if args.city_list:
+        index.add_from_city_list(args.city_list)
+    index.add_from_snapshots()
+    if index.dirty:
+        index.save()
+    locations = resolve_locations(locations, index)
+
+    daemon = WeatherPollingDaemon(
+        locations,
+        interval = args.interval,
+        jitter = args.jitter,
+        max_concurrency = args.max_concurrency,
+        batch_size = args.batch_size,
+        flush_interval = args.flush_interval,
+        combine_on_flush = args.combine,
+        location_index = index
+    )
+    daemon.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Open Weather data pipeline")
+    parser.add_argument("--daemon", action = "store_true", help = "Poll continuously instead of running once")
+    parser.add_argument("--locations", help = "JSON file of locations to poll (daemon mode)")
+    parser.add_argument("--interval", type = float, default = 3600, help = "Default seconds between polls per location")
+    parser.add_argument("--jitter", type = float, default = 0.1, help = "Random +/- fraction applied to each interval")
+    parser.add_argument("--max-concurrency", type = int, default = 8, help = "Maximum requests in flight")
+    parser.add_argument("--batch-size", type = int, default = 100, help = "Rows buffered before writing a snapshot")
+    parser.add_argument("--flush-interval", type = float, default = 300, help = "Maximum seconds between snapshot writes")
+    parser.add_argument("--city-list", help = "OpenWeather bulk city.list.json(.gz) to seed the location index")
+    parser.add_argument("--combine", action = "store_true", help = "Rebuild the combined CSV after each write")
+    args = parser.parse_args()
+
+    setup_logging()
+    if args.daemon:
+        run_daemon(args)
+    else:
+        run_once()
@@ -0,0 +1,107 @@
+from datetime import date, datetime
+import argparse
+import os
+
+from src.utilities.logging_setup import setup_logging
+from src.utilities.orchestrator import Orchestrator, Upstream
+from src.utilities.weather_api_functions import get_current_weather_data, get_save_weather_data, get_combine_weather_data
+from src.utilities.weather_rollups import update_weather_rollups
+from src.utilities.opt_web_analytics import get_resource_metadata, process_zip_and_combine_metrics, stream_zip_metrics
+from src.utilities.open_data_toronto_functions import get_shelter_occupancy
+
+
+def get_output_path(prefix, data_path = "data/"):
+    """data/<prefix>_<timestamp>.parquet"""
+    os.makedirs(data_path, exist_ok = True)
+    current_timestamp = datetime.now().strftime("%Y-%m-%d_%H.%M.%S")
+    return os.path.join(data_path, f"{prefix}_{current_timestamp}.parquet")
+
+
+def save_frame(df, prefix, data_path = "data/"):
+    """Write a non-empty DataFrame to data/<prefix>_<timestamp>.parquet and return the path."""
+    if df is None or df.empty:
+        return None
+    file_name = get_output_path(prefix, data_path)
+    # Explicit row groups so the output store can deduplicate them across runs
+    df.to_parquet(file_name, index = False, row_group_size = 10_000)
+    return file_name
+
+
+def build(args):
+    orchestrator = Orchestrator(
+        "all_sources",
+        max_workers = args.workers,
+        metrics_path = "metrics/pipeline_metrics.jsonl",
+        prometheus_path = "metrics/all_sources_pipeline.prom",
+        report_path = args.report,
+        checkpoint_path = "data/pipeline_checkpoints.json"
+    )
+
+    # Sources: concurrency caps and request rates per upstream system ----
+    orchestrator.add_source("open_weather", max_concurrency = 2, calls_per_minute = 60)
+    orchestrator.add_source("youtube", max_concurrency = 1, calls_per_minute = 120)
+    orchestrator.add_source("toronto_web_analytics", max_concurrency = 1, calls_per_minute = 30)
+    orchestrator.add_source("toronto_shelter", max_concurrency = 1, calls_per_minute = 30)
+
+    # Open Weather: extract -> save -> combine -> rollups ----
+    orchestrator.add_task("extract_weather", "open_weather", get_current_weather_data, verbose = False, pass_session = True)
+    orchestrator.add_task("save_weather", "open_weather", get_save_weather_data, data = Upstream("extract_weather"))
+    orchestrator.add_task("combine_weather", "open_weather", get_combine_weather_data, lock = True, depends_on = ("save_weather",))
+    orchestrator.add_task("rollup_weather", "open_weather", update_weather_rollups, depends_on = ("combine_weather",))
+
+    # YouTube: video IDs -> transcripts -> search index ----
+    if not args.skip_youtube:
+        # Imported here: the transcript stack (sentence-transformers etc.) is heavy and optional
+        from src.utilities.functions import get_video_ids, get_video_transcripts
+        from src.utilities.transcript_index import update_transcript_index
+
+        orchestrator.add_task(
+            "video_ids", "youtube", get_video_ids,
+            stream = args.stream, memo_key = date.today().isoformat(), pass_session = True
+        )
+        orchestrator.add_task(
+            "video_transcripts", "youtube", get_video_transcripts,
+            segments = True, stream = args.stream, memo_inputs = ["data/video_ids_*.parquet"], depends_on = ("video_ids",)
+        )
+        orchestrator.add_task("transcript_index", "youtube", update_transcript_index, depends_on = ("video_transcripts",))
+
+    # Toronto web analytics: metadata -> zip download -> save ----
+    orchestrator.add_task("web_analytics_metadata", "toronto_web_analytics", get_resource_metadata, pass_session = True)
+    zip_url = Upstream("web_analytics_metadata", select = lambda metadata: metadata[0]["result"]["url"])
+    if args.stream:
+        orchestrator.add_task(
+            "web_analytics_metrics", "toronto_web_analytics", stream_zip_metrics,
+            zip_url, get_output_path("web_analytics_key_metrics"), max_folders = args.max_folders, pass_session = True
+        )
+    else:
+        orchestrator.add_task(
+            "web_analytics_metrics", "toronto_web_analytics", process_zip_and_combine_metrics,
+            zip_url, max_folders = args.max_folders, pass_session = True
+        )
+        orchestrator.add_task(
+            "save_web_analytics", "toronto_web_analytics", save_frame,
+            Upstream("web_analytics_metrics"), "web_analytics_key_metrics"
+        )
+
+    # Toronto shelter occupancy: datastore dump -> save ----
+    orchestrator.add_task("shelter_occupancy", "toronto_shelter", get_shelter_occupancy, pass_session = True)
+    orchestrator.add_task(
+        "save_shelter_occupancy", "toronto_shelter", save_frame,
+        Upstream("shelter_occupancy"), "shelter_occupancy"
+    )
+
+    return orchestrator
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Run every source's pipeline concurrently")
+    parser.add_argument("--workers", type = int, default = 8, help = "Worker threads shared by all sources")
+    parser.add_argument("--max-folders", type = int, default = 5, help = "Web analytics zip folders to combine")
+    parser.add_argument("--stream", action = "store_true", help = "Write YouTube and web analytics outputs batch by batch")
+    parser.add_argument("--skip-youtube", action = "store_true", help = "Leave out the YouTube pipeline")
+    parser.add_argument("--report", default = "metrics/run_report.json", help = "JSON file for the consolidated run report")
+    args = parser.parse_args()
+
+    setup_logging()
+    report = build(args).run()
+    raise SystemExit(0 if report["succeeded"] else 1)
@@ -1,14 +1,152 @@
 from google.api_core import retry
+from google.cloud import bigquery
 from google.cloud.exceptions import NotFound
 from google.api_core.exceptions import RetryError, NotFound
 import pandas as pd
 import logging
 from typing import Union, List, Dict, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+import atexit
+import threading
+import time
 import json
 import os
+import uuid
 from pathlib import Path
+import fnmatch
+import glob
+import tempfile
 import pyarrow
+import pyarrow.compute
+import pyarrow.csv
+import pyarrow.dataset
+import pyarrow.parquet
+
+from src.utilities.logging_setup import get_logger, setup_logging
+
+_INTEGER_TYPES = {"INTEGER", "INT64"}
+_FLOAT_TYPES = {"FLOAT", "FLOAT64", "NUMERIC", "BIGNUMERIC"}
+_BOOLEAN_TYPES = {"BOOLEAN", "BOOL"}
+_TIME_TYPES = {"TIMESTAMP", "DATETIME", "DATE"}
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+# Staging tables are deleted when a load finishes; this only matters if the process dies first
+STAGING_TABLE_EXPIRATION = timedelta(hours=1)
+
+# Arrow types CSV columns are parsed into for each BigQuery type
+_ARROW_TYPES = {
+    "STRING": pyarrow.string(),
+    "INTEGER": pyarrow.int64(),
+    "INT64": pyarrow.int64(),
+    "FLOAT": pyarrow.float64(),
+    "FLOAT64": pyarrow.float64(),
+    "NUMERIC": pyarrow.decimal128(38, 9),
+    "BOOLEAN": pyarrow.bool_(),
+    "BOOL": pyarrow.bool_(),
+    "DATE": pyarrow.date32(),
+    "TIMESTAMP": pyarrow.timestamp("us", tz="UTC"),
+    "DATETIME": pyarrow.timestamp("us"),
+}
+
+_SCHEMA_REPORT_COLUMNS = [
+    "field", "bq_type", "mode", "dtype", "compatible", "coerced",
+    "null_count", "invalid_count", "out_of_range", "issue",
+]
+
+
+def _check_series_type(series: pd.Series, bq_type: str) -> tuple:
+    """
+    Check a column against a BigQuery type.
+
+    Returns:
+        tuple: (compatible, converted, overflow) where `converted` is the
+        column cast to a matching dtype (unconvertible values become null), or
+        None when the column already matches or cannot be converted at all,
+        and `overflow` counts values nulled for lying outside INT64.
+    """
+    dtype = series.dtype
+    types = pd.api.types
+
+    if bq_type == "STRING":
+        if types.is_string_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+            return True, None, 0
+        return False, series.astype("string"), 0
+
+    if bq_type in _INTEGER_TYPES:
+        if types.is_integer_dtype(dtype):
+            return True, None, 0
+        if types.is_bool_dtype(dtype) or types.is_datetime64_any_dtype(dtype):
+            return False, None, 0
+        numeric = pd.to_numeric(series, errors="coerce")
+        # Fractional values can't become integers without losing data, and
+        # values outside INT64 can't be cast at all (2**63 as a float is just out)
+        fractional = numeric.notna() & (numeric % 1 != 0)
+        overflow = (numeric < _INT64_MIN) | (numeric >= _INT64_MAX + 1)
+        return False, numeric.mask(fractional | overflow).astype("Int64"), int(overflow.sum())
+
+    if bq_type in _FLOAT_TYPES:
+        if types.is_numeric_dtype(dtype) and not types.is_bool_dtype(dtype):
+            return True, None, 0
+        if types.is_datetime64_any_dtype(dtype):
+            return False, None, 0
+        return False, pd.to_numeric(series, errors="coerce").astype("float64"), 0
+
+    if bq_type in _BOOLEAN_TYPES:
+        if types.is_bool_dtype(dtype):
+            return True, None, 0
+        lookup = {"true": True, "false": False, "1": True, "0": False}
+        return False, series.astype("string").str.lower().map(lookup).astype("boolean"), 0
+
+    if bq_type in _TIME_TYPES:
+        if types.is_datetime64_any_dtype(dtype):
+            return True, None, 0
+        return False, pd.to_datetime(series, errors="coerce"), 0
+
+    # RECORD, BYTES, GEOGRAPHY, JSON, ... are left to BigQuery
+    return True, None, 0
+
+
+def _build_merge_query(
+    table_ref: str,
+    staging_ref: str,
+    key_columns: List[str],
+    columns: List[str],
+    partition_field: Optional[str] = None,
+    partition_range: Optional[tuple] = None,
+    partition_type: Optional[str] = None
+) -> str:
+    """
+    Build a MERGE that inserts new keys and updates only changed rows.
+
+    Key columns must not be NULL (`=` never matches NULL); the partition
+    filter is added only when the partition column's type is known.
+    """
+    on_clause = " AND ".join(f"T.`{col}` = S.`{col}`" for col in key_columns)
+    if partition_field and partition_range is not None and partition_type in ("TIMESTAMP", "DATETIME", "DATE"):
+        low, high = (pd.Timestamp(value) for value in partition_range)
+        if partition_type == "DATE":
+            low, high = low.date().isoformat(), high.date().isoformat()
+        else:
+            low, high = low.isoformat(), high.isoformat()
+        on_clause += (
+            f" AND T.`{partition_field}` BETWEEN {partition_type}('{low}') AND {partition_type}('{high}')"
+        )
+
+    value_columns = [col for col in columns if col not in key_columns]
+    column_list = ", ".join(f"`{col}`" for col in columns)
+    source_list = ", ".join(f"S.`{col}`" for col in columns)
+
+    query = f"MERGE `{table_ref}` T\nUSING `{staging_ref}` S\nON {on_clause}\n"
+    if value_columns:
+        changed = " OR ".join(f"T.`{col}` IS DISTINCT FROM S.`{col}`" for col in value_columns)
+        assignments = ", ".join(f"`{col}` = S.`{col}`" for col in value_columns)
+        query += f"WHEN MATCHED AND ({changed}) THEN\n  UPDATE SET {assignments}\n"
+    query += f"WHEN NOT MATCHED THEN\n  INSERT ({column_list}) VALUES ({source_list})"
+    return query
+
 
 class BigQueryUploader:
     """A class to handle BigQuery upload operations with proper error handling and logging."""
@@ -18,7 +156,8 @@ class BigQueryUploader:
         project_id: str,
         dataset_id: str,
         credentials_path: Optional[str] = None,
-        location: str = "US"
+        location: str = "US",
+        client: Optional[bigquery.Client] = None
     ):
         """
         Initialize BigQuery uploader.
@@ -28,6 +167,7 @@ class BigQueryUploader:
             dataset_id: BigQuery dataset ID
             credentials_path: Path to service account credentials JSON file
             location: Dataset location (default: "US")
+            client: Optional pre-built client (e.g. a local fake for testing)
         """
         # Set up logging
         self.logger = self._setup_logger()
@@ -37,40 +177,27 @@ class BigQueryUploader:
             os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
 
         # Initialize client
-        try:
-            self.client = bigquery.Client(project=project_id)
-            self.logger.info(f"Successfully initialized BigQuery client for project: {project_id}")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize BigQuery client: {str(e)}")
-            raise
+        if client is not None:
+            self.client = client
+        else:
+            try:
+                self.client = bigquery.Client(project=project_id)
+                self.logger.info(f"Successfully initialized BigQuery client for project: {project_id}")
+            except Exception as e:
+                self.logger.error(f"Failed to initialize BigQuery client: {str(e)}")
+                raise
 
         self.project_id = project_id
         self.dataset_id = dataset_id
         self.location = location
 
-    def _setup_logger(self) -> logging.Logger:
-        """Set up logging configuration."""
-        logger = logging.getLogger("BigQueryUploader")
-        logger.setLevel(logging.INFO)
+        # Dataset existence is checked once per uploader instance
+        self._dataset_ready = False
+        self._dataset_lock = threading.Lock()
 
-        # Create handlers
-        c_handler = logging.StreamHandler()
-        f_handler = logging.FileHandler("bigquery_uploader.log")
-        c_handler.setLevel(logging.INFO)
-        f_handler.setLevel(logging.INFO)
-
-        # Create formatters and add to handlers
-        format_str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        c_format = logging.Formatter(format_str)
-        f_format = logging.Formatter(format_str)
-        c_handler.setFormatter(c_format)
-        f_handler.setFormatter(f_format)
-
-        # Add handlers to the logger
-        logger.addHandler(c_handler)
-        logger.addHandler(f_handler)
-
-        return logger
+    def _setup_logger(self) -> logging.Logger:
+        """Get the shared logger; handlers are installed once per process."""
+        return get_logger("BigQueryUploader")
 
     @retry.Retry()
     def create_dataset_if_not_exists(self) -> None:
@@ -85,36 +212,169 @@ class BigQueryUploader:
             self.client.create_dataset(dataset)
             self.logger.info(f"Created dataset {dataset_ref}")
 
+    def ensure_dataset(self) -> None:
+        """Create the dataset on first use and cache the result for this instance."""
+        if self._dataset_ready:
+            return
+        with self._dataset_lock:
+            if not self._dataset_ready:
+                self.create_dataset_if_not_exists()
+                self._dataset_ready = True
+
+    def schema_report(
+        self,
+        df: pd.DataFrame,
+        schema: List[bigquery.SchemaField],
+        coerce: bool = False,
+        value_ranges: Optional[Dict[str, tuple]] = None,
+        allow_extra_columns: bool = True
+    ) -> pd.DataFrame:
+        """
+        Check a whole DataFrame against a BigQuery schema and report per column.
+
+        Null counts for every column are computed in a single pass; each field
+        is then checked for dtype compatibility, nulls in REQUIRED fields,
+        values outside `value_ranges` (or outside INT64 for integer fields)
+        and unparseable TIMESTAMP/DATETIME/DATE values. With `coerce=True`,
+        columns that convert cleanly are replaced in `df` in place; columns
+        that already match are left untouched, so no data is copied for them.
+
+        Args:
+            df: Pandas DataFrame to validate
+            schema: List of BigQuery SchemaField objects
+            coerce: Convert fixable columns in place (default: False)
+            value_ranges: Optional {column: (min, max)} bounds, either side may be None
+            allow_extra_columns: Don't flag columns missing from the schema (default: True)
+
+        Returns:
+            pd.DataFrame: One row per column with field, bq_type, mode, dtype,
+            compatible, coerced, null_count, invalid_count, out_of_range and issue
+        """
+        value_ranges = value_ranges or {}
+        null_counts = df.isna().sum()
+        records = []
+
+        for field in schema:
+            bq_type = field.field_type.upper()
+            mode = (field.mode or "NULLABLE").upper()
+            record = {
+                "field": field.name,
+                "bq_type": bq_type,
+                "mode": mode,
+                "dtype": None,
+                "compatible": False,
+                "coerced": False,
+                "null_count": 0,
+                "invalid_count": 0,
+                "out_of_range": 0,
+                "issue": None,
+            }
+
+            if field.name not in df.columns:
+                record["issue"] = "missing column"
+                records.append(record)
+                continue
+
+            series = df[field.name]
+            record["dtype"] = str(series.dtype)
+            record["null_count"] = int(null_counts[field.name])
+
+            compatible, converted, overflow = _check_series_type(series, bq_type)
+            invalid_count = 0
+            if converted is not None:
+                # Values that were present but became null could not be
+                # converted, apart from the ones reported as out of range
+                invalid_count = int(converted.isna().sum()) - record["null_count"] - overflow
+            record["compatible"] = compatible
+            record["invalid_count"] = invalid_count
+
+            numeric = converted if converted is not None else series
+            bounds = value_ranges.get(field.name)
+            if bounds is None and bq_type in _INTEGER_TYPES:
+                bounds = (_INT64_MIN, _INT64_MAX)
+            if bounds is not None and pd.api.types.is_numeric_dtype(numeric.dtype) \
+                    and not pd.api.types.is_bool_dtype(numeric.dtype):
+                low, high = bounds
+                outside = pd.Series(False, index=numeric.index)
+                if low is not None:
+                    outside |= numeric < low
+                if high is not None:
+                    outside |= numeric > high
+                record["out_of_range"] = int(outside.sum())
+            record["out_of_range"] += overflow
+
+            issues = []
+            if not compatible:
+                if converted is None:
+                    issues.append(f"dtype {series.dtype} is not compatible with {bq_type}")
+                elif invalid_count > 0:
+                    issues.append(f"{invalid_count} value(s) cannot be converted to {bq_type}")
+                elif coerce and not overflow:
+                    df[field.name] = converted
+                    record["coerced"] = True
+                    record["compatible"] = True
+                else:
+                    issues.append(f"dtype {series.dtype} needs conversion to {bq_type}")
+            if mode == "REQUIRED" and record["null_count"] > 0:
+                issues.append(f"{record['null_count']} null(s) in REQUIRED field")
+            if record["out_of_range"] > 0:
+                issues.append(f"{record['out_of_range']} value(s) out of range")
+            record["issue"] = "; ".join(issues) or None
+            records.append(record)
+
+        schema_names = {field.name for field in schema}
+        for column in df.columns:
+            if column not in schema_names:
+                records.append({
+                    "field": column,
+                    "bq_type": None,
+                    "mode": None,
+                    "dtype": str(df[column].dtype),
+                    "compatible": allow_extra_columns,
+                    "coerced": False,
+                    "null_count": int(null_counts[column]),
+                    "invalid_count": 0,
+                    "out_of_range": 0,
+                    "issue": None if allow_extra_columns else "column not in schema",
+                })
+
+        return pd.DataFrame.from_records(records, columns=_SCHEMA_REPORT_COLUMNS)
+
     def validate_schema(
         self,
         df: pd.DataFrame,
-        schema: List[bigquery.SchemaField]
+        schema: List[bigquery.SchemaField],
+        coerce: bool = False,
+        value_ranges: Optional[Dict[str, tuple]] = None,
+        allow_extra_columns: bool = True
     ) -> bool:
         """
         Validate DataFrame schema against BigQuery schema.
 
+        See `schema_report` for the checks performed.
+
         Args:
             df: Pandas DataFrame to validate
             schema: List of BigQuery SchemaField objects
+            coerce: Convert fixable columns in place (default: False)
+            value_ranges: Optional {column: (min, max)} bounds
+            allow_extra_columns: Don't fail on columns missing from the schema (default: True)
 
         Returns:
             bool: True if valid, raises ValueError if invalid
         """
         try:
-            for field in schema:
-                if field.name not in df.columns:
-                    raise ValueError(f"Missing column {field.name} in DataFrame")
-
-                # Basic type checking
-                bq_type = field.field_type.lower()
-                df_type = df[field.name].dtype
-
-                # Add type validation rules as needed
-                if bq_type == "string" and not pd.api.types.is_string_dtype(df_type):
-                    raise ValueError(f"Column {field.name} should be string type")
-                elif bq_type == "integer" and not pd.api.types.is_integer_dtype(df_type):
-                    raise ValueError(f"Column {field.name} should be integer type")
-                # Add more type validations as needed
+            report = self.schema_report(
+                df,
+                schema,
+                coerce=coerce,
+                value_ranges=value_ranges,
+                allow_extra_columns=allow_extra_columns
+            )
+            problems = report[report["issue"].notna()]
+            if not problems.empty:
+                details = ", ".join(f"{row.field}: {row.issue}" for row in problems.itertuples())
+                raise ValueError(f"{len(problems)} column(s) failed validation - {details}")
 
             return True
         except Exception as e:
@@ -144,23 +404,18 @@ class BigQueryUploader:
 
         try:
             # Ensure dataset exists
-            self.create_dataset_if_not_exists()
+            self.ensure_dataset()
 
             # Validate schema if provided
             if schema:
                 self.validate_schema(df, schema)
 
             # Configure job
-            job_config = bigquery.LoadJobConfig()
-            if schema:
-                job_config.schema = schema
-            job_config.write_disposition = write_disposition
-
-            # Set up partitioning if specified
-            if partition_field:
-                job_config.time_partitioning = bigquery.TimePartitioning(
-                    field=partition_field
-                )
+            job_config = self._build_load_job_config(
+                schema,
+                write_disposition,
+                partition_field
+            )
 
             # Upload data
             start_time = datetime.now()
@@ -182,6 +437,201 @@ class BigQueryUploader:
             self.logger.error(f"Failed to upload data to {table_ref}: {str(e)}")
             raise
 
+    def upload_dataframe_chunked(
+        self,
+        df: pd.DataFrame,
+        table_id: str,
+        schema: Optional[List[bigquery.SchemaField]] = None,
+        write_disposition: str = "WRITE_APPEND",
+        partition_field: Optional[str] = None,
+        chunk_size: int = 100_000,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        retry_delay: float = 1.0
+    ) -> Dict[str, float]:
+        """
+        Upload a large DataFrame as several concurrent load jobs.
+
+        The frame is converted to Arrow once and sliced into record batches of
+        at most `chunk_size` rows. Each batch is serialized to Parquet and sent
+        as its own load job, so a failure only re-sends the chunks that failed.
+        With WRITE_TRUNCATE the chunks are loaded into a short-lived staging
+        table that then replaces the target in one copy job, so a failed
+        upload leaves the target as it was instead of partially written.
+
+        Args:
+            df: Pandas DataFrame to upload
+            table_id: Target table ID
+            schema: Optional BigQuery table schema
+            write_disposition: Write disposition (default: WRITE_APPEND)
+            partition_field: Optional field for table partitioning
+            chunk_size: Maximum rows per load job (default: 100,000)
+            max_workers: Number of load jobs in flight (default: 4)
+            max_retries: Retry rounds for failed chunks (default: 3)
+            retry_delay: Base delay in seconds between retry rounds, doubled each round
+
+        Returns:
+            dict: Upload stats (rows, chunks, retried_chunks, seconds, rows_per_second)
+        """
+        table_ref = f"{self.project_id}.{self.dataset_id}.{table_id}"
+
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+
+        try:
+            self.ensure_dataset()
+
+            if schema:
+                self.validate_schema(df, schema)
+
+            start_time = datetime.now()
+            table = pyarrow.Table.from_pandas(df, preserve_index=False)
+            batches = table.to_batches(max_chunksize=chunk_size)
+            retried_chunks = 0
+
+            pending = list(range(len(batches)))
+            staging_ref = None
+            load_ref = table_ref
+            if write_disposition == "WRITE_TRUNCATE" and pending:
+                staging_ref = f"{table_ref}__staging_{uuid.uuid4().hex[:12]}"
+                load_ref = staging_ref
+
+            try:
+                # The first chunk alone carries a truncate, the rest always append
+                if staging_ref is not None:
+                    first_config = self._build_load_job_config(schema, write_disposition, partition_field)
+                    failed, retries = self._load_chunks_with_retry(
+                        batches, [0], load_ref, first_config, 1, max_retries, retry_delay
+                    )
+                    retried_chunks += retries
+                    if failed:
+                        raise RuntimeError(f"Chunk 0 failed after {max_retries} retries")
+                    self._expire_staging_table(staging_ref)
+                    pending = pending[1:]
+                    write_disposition = "WRITE_APPEND"
+
+                job_config = self._build_load_job_config(schema, write_disposition, partition_field)
+                failed, retries = self._load_chunks_with_retry(
+                    batches, pending, load_ref, job_config, max_workers, max_retries, retry_delay
+                )
+                retried_chunks += retries
+                if failed:
+                    raise RuntimeError(
+                        f"{len(failed)} of {len(batches)} chunks failed after {max_retries} retries: {sorted(failed)}"
+                    )
+
+                if staging_ref is not None:
+                    copy_config = bigquery.CopyJobConfig(write_disposition="WRITE_TRUNCATE")
+                    self.client.copy_table(staging_ref, table_ref, job_config=copy_config).result()
+            finally:
+                if staging_ref is not None:
+                    self.client.delete_table(staging_ref, not_found_ok=True)
+
+            duration = (datetime.now() - start_time).total_seconds()
+            stats = {
+                "rows": len(df),
+                "chunks": len(batches),
+                "retried_chunks": retried_chunks,
+                "seconds": duration,
+                "rows_per_second": len(df) / duration if duration > 0 else float("inf"),
+            }
+            self.logger.info(
+                f"Successfully uploaded {len(df)} rows to {table_ref} "
+                f"in {len(batches)} chunks ({retried_chunks} retried) in {duration:.2f} seconds"
+            )
+            return stats
+
+        except Exception as e:
+            self.logger.error(f"Failed to upload data to {table_ref}: {str(e)}")
+            raise
+
+    def _expire_staging_table(self, staging_ref: str) -> None:
+        """Set a short expiration so a staging table left by a crashed run removes itself."""
+        table = self.client.get_table(staging_ref)
+        table.expires = datetime.now(timezone.utc) + STAGING_TABLE_EXPIRATION
+        self.client.update_table(table, ["expires"])
+
+    def _build_load_job_config(
+        self,
+        schema: Optional[List[bigquery.SchemaField]],
+        write_disposition: str,
+        partition_field: Optional[str]
+    ) -> bigquery.LoadJobConfig:
+        """Build a load job config shared by the upload methods."""
+        job_config = bigquery.LoadJobConfig()
+        if schema:
+            job_config.schema = schema
+        job_config.write_disposition = write_disposition
+
+        # Set up partitioning if specified
+        if partition_field:
+            job_config.time_partitioning = bigquery.TimePartitioning(
+                field=partition_field
+            )
+        return job_config
+
+    def _load_chunk(
+        self,
+        batch: pyarrow.RecordBatch,
+        table_ref: str,
+        job_config: bigquery.LoadJobConfig
+    ) -> None:
+        """Serialize one record batch to Parquet and run it as a load job."""
+        buffer = BytesIO()
+        pyarrow.parquet.write_table(pyarrow.Table.from_batches([batch]), buffer)
+        buffer.seek(0)
+
+        chunk_config = bigquery.LoadJobConfig.from_api_repr(job_config.to_api_repr())
+        chunk_config.source_format = bigquery.SourceFormat.PARQUET
+        job = self.client.load_table_from_file(buffer, table_ref, job_config=chunk_config)
+        job.result()
+
+    def _load_chunks_with_retry(
+        self,
+        batches: List[pyarrow.RecordBatch],
+        chunk_ids: List[int],
+        table_ref: str,
+        job_config: bigquery.LoadJobConfig,
+        max_workers: int,
+        max_retries: int,
+        retry_delay: float
+    ) -> tuple:
+        """
+        Load the given chunks concurrently, re-submitting only the ones that fail.
+
+        Returns:
+            tuple: (set of chunk ids still failing, number of chunk retries made)
+        """
+        pending = list(chunk_ids)
+        retries = 0
+
+        for attempt in range(max_retries + 1):
+            if not pending:
+                break
+            if attempt > 0:
+                retries += len(pending)
+                time.sleep(retry_delay * (2 ** (attempt - 1)))
+                self.logger.warning(
+                    f"Retrying {len(pending)} failed chunks for {table_ref} (attempt {attempt}/{max_retries})"
+                )
+
+            failed = []
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._load_chunk, batches[i], table_ref, job_config): i
+                    for i in pending
+                }
+                for future in as_completed(futures):
+                    chunk_id = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.logger.warning(f"Chunk {chunk_id} to {table_ref} failed: {str(e)}")
+                        failed.append(chunk_id)
+            pending = failed
+
+        return set(pending), retries
+
     def upload_file(
         self,
         file_path: Union[str, Path],
@@ -189,45 +639,647 @@ class BigQueryUploader:
         schema: Optional[List[bigquery.SchemaField]] = None,
         write_disposition: str = "WRITE_APPEND",
         partition_field: Optional[str] = None,
-        file_type: str = "csv"
+        file_type: str = "csv",
+        exclude: Optional[str] = "*_combined.csv"
     ) -> None:
         """
-        Upload file to BigQuery table.
+        Upload file(s) to BigQuery table in a single load job.
+
+        Parquet files are streamed to BigQuery as-is and CSV files are read
+        with pyarrow and sent as Parquet, so neither goes through pandas.
+        With a `schema`, CSV columns are parsed as the schema's types (so a
+        STRING column of digits stays a string) and every input is checked
+        against the schema before the load job starts.
+        `file_path` may be a single file, a directory (all files matching
+        `file_type` inside it), a glob such as "data/open_weather_data/*.csv",
+        or a gs:// URI (wildcards allowed), which is loaded server-side.
 
         Args:
-            file_path: Path to input file
+            file_path: Path, directory, glob or gs:// URI of input file(s)
             table_id: Target table ID
             schema: Optional BigQuery table schema
             write_disposition: Write disposition (default: WRITE_APPEND)
             partition_field: Optional field for table partitioning
             file_type: File type (default: "csv")
+            exclude: File name glob to skip (default: "*_combined.csv", so a
+                combined file is not loaded twice alongside its snapshots)
         """
+        table_ref = f"{self.project_id}.{self.dataset_id}.{table_id}"
+        file_type = file_type.lower()
+
         try:
-            # Read file into DataFrame based on type
-            if file_type.lower() == "csv":
-                df = pd.read_csv(file_path)
-            elif file_type.lower() == "parquet":
-                df = pd.read_parquet(file_path)
-            elif file_type.lower() == "json":
+            if file_type not in ("csv", "parquet", "json"):
+                raise ValueError(f"Unsupported file type: {file_type}")
+
+            # JSON still goes through pandas
+            if file_type == "json":
                 df = pd.read_json(file_path)
+                self.upload_dataframe(
+                    df,
+                    table_id,
+                    schema,
+                    write_disposition,
+                    partition_field
+                )
+                return
+
+            self.ensure_dataset()
+            job_config = self._build_load_job_config(schema, write_disposition, partition_field)
+            start_time = datetime.now()
+
+            # Cloud Storage sources are loaded server-side in one job
+            if str(file_path).startswith("gs://"):
+                if file_type == "csv":
+                    job_config.source_format = bigquery.SourceFormat.CSV
+                    job_config.skip_leading_rows = 1
+                    job_config.autodetect = schema is None
+                else:
+                    job_config.source_format = bigquery.SourceFormat.PARQUET
+                job = self.client.load_table_from_uri(str(file_path), table_ref, job_config=job_config)
+                job.result()
+                self.logger.info(
+                    f"Successfully loaded {file_path} to {table_ref} "
+                    f"in {(datetime.now() - start_time).total_seconds():.2f} seconds"
+                )
+                return
+
+            files = self._resolve_source_files(file_path, file_type, exclude)
+            job_config.source_format = bigquery.SourceFormat.PARQUET
+
+            if file_type == "parquet" and len(files) == 1:
+                # Single Parquet file: send the bytes untouched
+                if schema:
+                    self._check_arrow_columns(pyarrow.parquet.read_schema(files[0]), schema)
+                with open(files[0], "rb") as source:
+                    job = self.client.load_table_from_file(source, table_ref, job_config=job_config)
+                    job.result()
             else:
-                raise ValueError(f"Unsupported file type: {file_type}")
+                with self._combine_to_parquet(files, file_type, schema) as source:
+                    job = self.client.load_table_from_file(source, table_ref, job_config=job_config)
+                    job.result()
 
-            # Upload DataFrame
-            self.upload_dataframe(
-                df,
-                table_id,
-                schema,
-                write_disposition,
-                partition_field
+            duration = (datetime.now() - start_time).total_seconds()
+            self.logger.info(
+                f"Successfully loaded {len(files)} {file_type} file(s) to {table_ref} "
+                f"in {duration:.2f} seconds"
             )
 
         except Exception as e:
             self.logger.error(f"Failed to upload file {file_path}: {str(e)}")
             raise
 
+    def _resolve_source_files(
+        self,
+        file_path: Union[str, Path],
+        file_type: str,
+        exclude: Optional[str] = None
+    ) -> List[Path]:
+        """Expand a file, directory or glob into a sorted list of input files (`exclude` applies to expansions only)."""
+        path = Path(file_path)
+        if path.is_dir():
+            files = sorted(path.glob(f"*.{file_type}"))
+        elif any(char in str(file_path) for char in "*?["):
+            files = sorted(Path(p) for p in glob.glob(str(file_path)))
+        else:
+            # A file named explicitly is loaded even if it matches `exclude`
+            files = [path]
+            exclude = None
+
+        if exclude:
+            files = [f for f in files if not fnmatch.fnmatch(f.name, exclude)]
+
+        if not files:
+            raise FileNotFoundError(f"No {file_type} files found at {file_path}")
+        missing = [str(f) for f in files if not f.is_file()]
+        if missing:
+            raise FileNotFoundError(f"File(s) not found: {missing}")
+        return files
+
+    def _check_arrow_columns(
+        self,
+        arrow_schema: pyarrow.Schema,
+        schema: List[bigquery.SchemaField]
+    ) -> None:
+        """Fail early if any schema field is missing from the Arrow data or has an incompatible type."""
+        types = pyarrow.types
+        checks = {
+            "STRING": lambda t: types.is_string(t) or types.is_large_string(t) or types.is_dictionary(t),
+            "INTEGER": types.is_integer,
+            "INT64": types.is_integer,
+            "FLOAT": lambda t: types.is_floating(t) or types.is_integer(t),
+            "FLOAT64": lambda t: types.is_floating(t) or types.is_integer(t),
+            "NUMERIC": lambda t: types.is_decimal(t) or types.is_integer(t) or types.is_floating(t),
+            "BOOLEAN": types.is_boolean,
+            "BOOL": types.is_boolean,
+            "DATE": lambda t: types.is_date(t) or types.is_timestamp(t),
+            "TIMESTAMP": types.is_timestamp,
+            "DATETIME": types.is_timestamp,
+        }
+        missing = [field.name for field in schema if field.name not in arrow_schema.names]
+        if missing:
+            raise ValueError(f"Missing column(s) {missing} in source files")
+        mismatched = [
+            f"{field.name}: {arrow_schema.field(field.name).type} is not compatible with {field.field_type}"
+            for field in schema
+            if field.field_type.upper() in checks
+            and not checks[field.field_type.upper()](arrow_schema.field(field.name).type)
+        ]
+        if mismatched:
+            raise ValueError(f"Source files don't match the schema - {', '.join(mismatched)}")
+
+    def _read_csv_as_schema(
+        self,
+        file_path: Path,
+        schema: Optional[List[bigquery.SchemaField]] = None
+    ) -> pyarrow.Table:
+        """Read a CSV with pyarrow, parsing the schema's columns as their BigQuery types."""
+        if not schema:
+            return pyarrow.csv.read_csv(file_path)
+
+        targets = {
+            field.name: _ARROW_TYPES[field.field_type.upper()]
+            for field in schema
+            if field.field_type.upper() in _ARROW_TYPES
+        }
+        # Timestamps are inferred and converted below: forcing the type would
+        # reject either the naive or the zone-offset spelling
+        column_types = {name: t for name, t in targets.items() if not pyarrow.types.is_timestamp(t)}
+        convert_options = pyarrow.csv.ConvertOptions(column_types=column_types)
+        try:
+            table = pyarrow.csv.read_csv(file_path, convert_options=convert_options)
+        except pyarrow.ArrowInvalid as e:
+            raise ValueError(f"{file_path} doesn't match the schema: {e}") from e
+
+        self._check_arrow_columns(table.schema, schema)
+        for name, target in targets.items():
+            column = table.column(name)
+            if not pyarrow.types.is_timestamp(target) or column.type == target:
+                continue
+            if target.tz is not None and column.type.tz is None:
+                # Naive timestamps in a TIMESTAMP column are UTC, as BigQuery reads them
+                column = pyarrow.compute.assume_timezone(column, "UTC")
+            elif target.tz is None and column.type.tz is not None:
+                raise ValueError(f"{file_path}: {name} has time zone offsets but is a DATETIME column")
+            table = table.set_column(table.schema.get_field_index(name), name, column.cast(target))
+        return table
+
+    def _combine_to_parquet(
+        self,
+        files: List[Path],
+        file_type: str,
+        schema: Optional[List[bigquery.SchemaField]] = None
+    ) -> tempfile.SpooledTemporaryFile:
+        """
+        Write several source files into one Parquet stream for a single load job.
+
+        Parquet inputs are copied batch by batch; CSV inputs are parsed with
+        pyarrow as the schema's types when one is given, and otherwise
+        promoted to a common schema (e.g. a column that is integer in one
+        file and float in another).
+
+        Returns:
+            SpooledTemporaryFile: Parquet data positioned at the start
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024)
+
+        if file_type == "parquet":
+            dataset = pyarrow.dataset.dataset([str(f) for f in files], format="parquet")
+            if schema:
+                self._check_arrow_columns(dataset.schema, schema)
+            with pyarrow.parquet.ParquetWriter(spool, dataset.schema) as writer:
+                for batch in dataset.to_batches():
+                    writer.write_batch(batch)
+        else:
+            # Every file is parsed and checked before anything is sent
+            tables = [self._read_csv_as_schema(f, schema) for f in files]
+            table = pyarrow.concat_tables(tables, promote_options="permissive")
+            pyarrow.parquet.write_table(table, spool)
+
+        spool.seek(0)
+        return spool
+
+    def upsert_dataframe(
+        self,
+        df: pd.DataFrame,
+        table_id: str,
+        key_columns: List[str],
+        schema: Optional[List[bigquery.SchemaField]] = None,
+        partition_field: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Idempotently merge a DataFrame into a table keyed on `key_columns`.
+
+        Rows with a NULL key are rejected, since they could never match and
+        would be inserted again on every run. The batch is deduplicated
+        locally on the key columns (the last row per key wins), loaded into
+        a staging table (deleted afterwards, and set to expire in case the
+        process dies first) and MERGEd into the target: new keys are
+        inserted and existing keys are updated only when a value changed, so
+        re-running a pipeline over the same data is a no-op. When
+        `partition_field` is given, the MERGE is restricted to the batch's
+        partition range (typed as in the target table's schema) so only the
+        affected partitions are scanned.
+
+        Args:
+            df: Pandas DataFrame to merge
+            table_id: Target table ID
+            key_columns: Columns identifying a row, e.g. ["city_id", "request_datetime"]
+            schema: Optional BigQuery table schema
+            partition_field: Optional field for table partitioning
+
+        Returns:
+            dict: Row counts (input_rows, duplicate_rows, staged_rows, inserted_rows, updated_rows)
+        """
+        table_ref = f"{self.project_id}.{self.dataset_id}.{table_id}"
+
+        try:
+            missing = [col for col in key_columns if col not in df.columns]
+            if not key_columns or missing:
+                raise ValueError(f"Key column(s) missing from DataFrame: {missing or key_columns}")
+
+            null_keys = df[key_columns].isna().any(axis=1)
+            if null_keys.any():
+                raise ValueError(f"{int(null_keys.sum())} row(s) have a NULL in key column(s) {key_columns}")
+
+            self.ensure_dataset()
+            if schema:
+                self.validate_schema(df, schema)
+
+            batch = df.drop_duplicates(key_columns, keep="last")
+            stats = {
+                "input_rows": len(df),
+                "duplicate_rows": len(df) - len(batch),
+                "staged_rows": len(batch),
+                "inserted_rows": 0,
+                "updated_rows": 0,
+            }
+            if batch.empty:
+                return stats
+
+            try:
+                table = self.client.get_table(table_ref)
+            except NotFound:
+                # Nothing to merge against: the deduplicated batch is the table
+                self.upload_dataframe(batch, table_id, schema, "WRITE_APPEND", partition_field)
+                stats["inserted_rows"] = len(batch)
+                return stats
+
+            staging_ref = f"{table_ref}__staging_{uuid.uuid4().hex[:12]}"
+            try:
+                job_config = self._build_load_job_config(schema, "WRITE_TRUNCATE", None)
+                self.client.load_table_from_dataframe(batch, staging_ref, job_config=job_config).result()
+                self._expire_staging_table(staging_ref)
+
+                partition_range = None
+                partition_type = None
+                if partition_field:
+                    partition_range = (batch[partition_field].min(), batch[partition_field].max())
+                    # The table's own schema decides how the bounds are typed
+                    for field in list(getattr(table, "schema", None) or []) + list(schema or []):
+                        if field.name == partition_field:
+                            partition_type = field.field_type.upper()
+                            break
+                query = _build_merge_query(
+                    table_ref,
+                    staging_ref,
+                    key_columns,
+                    list(batch.columns),
+                    partition_field,
+                    partition_range,
+                    partition_type
+                )
+                job = self.client.query(query)
+                job.result()
+            finally:
+                self.client.delete_table(staging_ref, not_found_ok=True)
+
+            dml_stats = getattr(job, "dml_stats", None)
+            if dml_stats is not None:
+                stats["inserted_rows"] = dml_stats.inserted_row_count
+                stats["updated_rows"] = dml_stats.updated_row_count
+
+            self.logger.info(
+                f"Merged {stats['staged_rows']} rows into {table_ref} "
+                f"({stats['duplicate_rows']} local duplicates dropped, "
+                f"{stats['inserted_rows']} inserted, {stats['updated_rows']} updated)"
+            )
+            return stats
+
+        except Exception as e:
+            self.logger.error(f"Failed to merge data into {table_ref}: {str(e)}")
+            raise
+
+    def upload_changefeed(
+        self,
+        table_id: str,
+        feed: Union[str, "WeatherChangeFeed"] = "data/open_weather_data/changefeed/",
+        consumer: Optional[str] = None,
+        key_columns: Optional[List[str]] = None,
+        schema: Optional[List[bigquery.SchemaField]] = None,
+        partition_field: Optional[str] = None,
+        max_rows: int = 500_000
+    ) -> Dict[str, int]:
+        """
+        Upload the rows appended to a weather change feed since this consumer's last commit.
+
+        Rows are read from the consumer's committed offset in pages of
+        `max_rows`; after each page is loaded the new offset is committed,
+        so each run only moves the delta. A crash between a load and its
+        commit re-sends that page on the next run: pass `key_columns`
+        (e.g. ["city_id", "request_datetime"]) to MERGE through
+        `upsert_dataframe` so the retry is a no-op, otherwise pages are
+        appended.
+
+        Args:
+            table_id: Target table ID
+            feed: WeatherChangeFeed or its directory
+            consumer: Name the offset is committed under (default: "bigquery:<table ref>")
+            key_columns: Optional key columns to upsert on instead of appending
+            schema: Optional BigQuery table schema
+            partition_field: Optional field for table partitioning
+            max_rows: Rows per load (default: 500,000)
+
+        Returns:
+            dict: Offsets (from_offset, to_offset) and rows uploaded
+        """
+        from src.utilities.weather_changefeed import OFFSET_COLUMN, WeatherChangeFeed
+
+        if not isinstance(feed, WeatherChangeFeed):
+            feed = WeatherChangeFeed(feed)
+        table_ref = f"{self.project_id}.{self.dataset_id}.{table_id}"
+        consumer = consumer or f"bigquery:{table_ref}"
+        offset = feed.committed(consumer)
+        stats = {"from_offset": offset, "to_offset": offset, "rows": 0}
+
+        while offset < feed.next_offset:
+            df, next_offset = feed.read_since(offset, max_rows=max_rows)
+            if df.empty:
+                break
+            df = df.drop(columns=[OFFSET_COLUMN])
+            if key_columns:
+                self.upsert_dataframe(df, table_id, key_columns, schema, partition_field)
+            else:
+                self.upload_dataframe(df, table_id, schema, "WRITE_APPEND", partition_field)
+            feed.commit(consumer, next_offset)
+            offset = next_offset
+            stats["rows"] += len(df)
+
+        stats["to_offset"] = offset
+        self.logger.info(
+            f"Uploaded change feed offsets {stats['from_offset']}-{stats['to_offset']} "
+            f"({stats['rows']} rows) to {table_ref}"
+        )
+        return stats
+
+    def stream_rows(
+        self,
+        table_id: str,
+        max_rows: int = 500,
+        max_bytes: int = 5 * 1024 * 1024,
+        max_latency: float = 1.0,
+        max_retries: int = 5
+    ) -> "BigQueryRowStream":
+        """
+        Open a buffered streaming-insert writer for low-latency row uploads.
+
+        Rows are sent with the streaming insert API instead of load jobs, so
+        small batches (e.g. one weather snapshot per city) land in under a
+        second without using load-job quota. The table must already exist.
+
+        Args:
+            table_id: Target table ID
+            max_rows: Flush once this many rows are buffered (default: 500)
+            max_bytes: Flush once the buffered JSON reaches this size (default: 5 MB)
+            max_latency: Flush rows older than this many seconds (default: 1.0)
+            max_retries: Retries for failed rows before the stream raises (default: 5)
+
+        Returns:
+            BigQueryRowStream: Writer to `add` rows to; use as a context manager
+            or call `close()` to flush
+        """
+        self.ensure_dataset()
+        table_ref = f"{self.project_id}.{self.dataset_id}.{table_id}"
+        return BigQueryRowStream(
+            self.client,
+            table_ref,
+            logger=self.logger,
+            max_rows=max_rows,
+            max_bytes=max_bytes,
+            max_latency=max_latency,
+            max_retries=max_retries
+        )
+
+
+class BigQueryRowStream:
+    """
+    Buffer rows in memory and stream them to a BigQuery table.
+
+    A flush happens when the buffer reaches `max_rows` rows or `max_bytes` of
+    JSON, when its oldest row is `max_latency` seconds old (checked by a
+    background thread), and on `close()`. Open streams are also closed at
+    interpreter exit so buffered rows are not lost on shutdown.
+
+    Rows are never dropped: rows a streaming insert rejects (picked out by
+    the error indexes) or whose request failed are retried with exponential
+    backoff. If they still fail after `max_retries`, they go back to the
+    front of the buffer and the error is raised from that flush and from
+    every later `add`, until a `flush()` or `close()` succeeds.
+    """
+
+    def __init__(
+        self,
+        client: bigquery.Client,
+        table_ref: str,
+        logger: Optional[logging.Logger] = None,
+        max_rows: int = 500,
+        max_bytes: int = 5 * 1024 * 1024,
+        max_latency: float = 1.0,
+        max_retries: int = 5,
+        retry_delay: float = 1.0
+    ):
+        """
+        Initialize the row stream.
+
+        Args:
+            client: BigQuery client (or a local stand-in with `insert_rows_json`)
+            table_ref: Fully qualified table ID
+            logger: Optional logger (default: "BigQueryUploader")
+            max_rows: Row count flush threshold
+            max_bytes: Buffered JSON size flush threshold
+            max_latency: Maximum seconds a row waits in the buffer
+            max_retries: Retries for failed rows before the stream raises
+            retry_delay: Seconds before the first retry, doubled after each one
+        """
+        self.client = client
+        self.table_ref = table_ref
+        self.logger = logger or logging.getLogger("BigQueryUploader")
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_latency = max_latency
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self.rows_sent = 0
+        self.rows_retried = 0
+        self.flushes = 0
+        self._error: Optional[Exception] = None
+        self._buffer: List[Dict] = []
+        self._buffer_bytes = 0
+        self._oldest = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+        self._timer = threading.Thread(target=self._run_timer, daemon=True)
+        self._timer.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "BigQueryRowStream":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def add(self, rows: Union[pd.DataFrame, Dict, List[Dict]]) -> None:
+        """
+        Buffer rows, flushing immediately if a size threshold is reached.
+
+        Args:
+            rows: A DataFrame, a single row dict or a list of row dicts
+        """
+        if self._closed:
+            raise RuntimeError(f"Row stream to {self.table_ref} is closed")
+        if self._error is not None:
+            raise self._error
+
+        if isinstance(rows, pd.DataFrame):
+            # to_json handles timestamps and NaN -> null in one pass
+            rows = json.loads(rows.to_json(orient="records", date_format="iso"))
+        elif isinstance(rows, dict):
+            rows = [rows]
+
+        with self._lock:
+            for row in rows:
+                self._buffer.append(row)
+                self._buffer_bytes += len(json.dumps(row, default=str))
+            if self._oldest is None and self._buffer:
+                self._oldest = time.monotonic()
+            full = len(self._buffer) >= self.max_rows or self._buffer_bytes >= self.max_bytes
+
+        if full:
+            self.flush()
+        else:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Send all buffered rows, retrying failed rows.
+
+        Returns:
+            int: Number of rows sent
+
+        Raises:
+            RuntimeError: Rows still failed after `max_retries`; they stay buffered
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows = self._buffer
+                self._buffer = []
+                self._buffer_bytes = 0
+                self._oldest = None
+            if not rows:
+                self._error = None
+                return 0
+
+            sent = 0
+            for start in range(0, len(rows), self.max_rows):
+                batch = rows[start:start + self.max_rows]
+                failed = self._insert_with_retry(batch)
+                sent += len(batch) - len(failed)
+                if failed:
+                    # Put the failed rows and everything not yet sent back in front, in order
+                    self._requeue(failed + rows[start + self.max_rows:])
+                    self.rows_sent += sent
+                    self._error = RuntimeError(
+                        f"Failed to stream {len(failed)} row(s) to {self.table_ref} "
+                        f"after {self.max_retries} retries; rows kept in the buffer"
+                    )
+                    raise self._error
+
+            self._error = None
+            self.rows_sent += sent
+            self.flushes += 1
+            self.logger.info(f"Streamed {sent} rows to {self.table_ref}")
+            return sent
+
+    def _insert_with_retry(self, batch: List[Dict]) -> List[Dict]:
+        """Insert a batch, retrying only the rows that failed. Returns rows that never succeeded."""
+        pending = batch
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(delay)
+                delay *= 2
+                self.rows_retried += len(pending)
+            try:
+                errors = self.client.insert_rows_json(self.table_ref, pending)
+            except Exception as e:
+                self.logger.error(f"Streaming insert to {self.table_ref} failed (attempt {attempt + 1}): {str(e)}")
+                continue
+            if not errors:
+                return []
+            self.logger.error(
+                f"Streaming insert to {self.table_ref} rejected {len(errors)} row(s) (attempt {attempt + 1}): {errors}"
+            )
+            failed_indexes = sorted({error["index"] for error in errors if error.get("index", -1) in range(len(pending))})
+            # Errors without row indexes mean the whole request failed
+            pending = [pending[i] for i in failed_indexes] if failed_indexes else pending
+        return pending
+
+    def _requeue(self, rows: List[Dict]) -> None:
+        with self._lock:
+            self._buffer = rows + self._buffer
+            self._buffer_bytes = sum(len(json.dumps(row, default=str)) for row in self._buffer)
+            self._oldest = time.monotonic()
+
+    def close(self) -> None:
+        """Flush remaining rows and stop the background timer (raises if rows still can't be sent)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._timer.join()
+        atexit.unregister(self.close)
+        self.flush()
+
+    def _run_timer(self) -> None:
+        """Flush the buffer once its oldest row has waited `max_latency` seconds."""
+        while not self._closed:
+            with self._lock:
+                oldest = self._oldest
+            if oldest is None or self._error is not None:
+                # After exhausted retries, leave the next attempt to an explicit flush/close
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            remaining = self.max_latency - (time.monotonic() - oldest)
+            if remaining > 0:
+                self._wakeup.wait(remaining)
+                self._wakeup.clear()
+                continue
+
+            try:
+                self.flush()
+            except Exception as e:
+                # Rows stay buffered and the next add/close raises the error
+                self.logger.error(f"Background flush to {self.table_ref} failed: {str(e)}")
+
 # Example usage
 if __name__ == "__main__":
+    setup_logging()
+
     # Example schema
     schema = [
         bigquery.SchemaField("name", "STRING", mode="REQUIRED"),
@@ -258,10 +1310,46 @@ if __name__ == "__main__":
         partition_field="timestamp"
     )
 
+    # Example chunked upload of a large DataFrame
+    uploader.upload_dataframe_chunked(
+        df=df,
+        table_id="your_table",
+        schema=schema,
+        chunk_size=100_000,
+        max_workers=4
+    )
+
     # Example file upload
     uploader.upload_file(
         file_path="data.csv",
         table_id="your_table",
         schema=schema,
         partition_field="timestamp"
+    )
+
+    # Example idempotent upsert keyed on name + timestamp
+    uploader.upsert_dataframe(
+        df=df,
+        table_id="your_table",
+        key_columns=["name", "timestamp"],
+        schema=schema,
+        partition_field="timestamp"
+    )
+
+    # Example incremental upload of rows added to the weather change feed
+    uploader.upload_changefeed(
+        table_id="open_weather_data",
+        key_columns=["city_id", "request_datetime"]
+    )
+
+    # Example low-latency streaming of small batches
+    with uploader.stream_rows("your_table", max_rows=500, max_latency=1.0) as stream:
+        stream.add(df)
+
+    # Example directory upload: every snapshot CSV in one load job
+    uploader.upload_file(
+        file_path="data/open_weather_data/",
+        table_id="open_weather_data",
+        file_type="csv",
+        exclude="*combined.csv"
     )
\ No newline at end of file
@@ -0,0 +1,166 @@
+# Libraries ----
+import glob
+import hashlib
+import inspect
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+
+# Function: Fingerprints ----
+def file_fingerprint(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's content."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def resolve_input(pattern: Union[str, Path]) -> Optional[str]:
+    """A path, or the most recently modified match of a glob pattern (None if nothing matches)."""
+    pattern = str(pattern)
+    if not glob.has_magic(pattern):
+        return pattern if os.path.exists(pattern) else None
+    matches = glob.glob(pattern)
+    return max(matches, key=os.path.getmtime) if matches else None
+
+
+def stage_fingerprint(
+    func: Callable,
+    args: tuple = (),
+    kwargs: Optional[Dict] = None,
+    key: Any = None,
+    inputs: Iterable[Union[str, Path]] = ()
+) -> str:
+    """
+    Fingerprint a stage call: the function, its bound arguments (defaults
+    included), an extra key (e.g. the run date) and the content of its input files.
+
+    Args:
+        func (callable): Stage function
+        args (tuple): Positional arguments
+        kwargs (dict): Keyword arguments
+        key: Extra JSON-serializable value
+        inputs (list): Input files or glob patterns (resolved to the newest match)
+
+    Returns:
+        str: Hex digest
+    """
+    try:
+        bound = inspect.signature(func).bind(*args, **(kwargs or {}))
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+    except (TypeError, ValueError):
+        arguments = {"args": args, "kwargs": kwargs or {}}
+    # A shared HTTP session changes how a stage connects, not what it produces
+    arguments.pop("session", None)
+    arguments.get("kwargs", {}).pop("session", None)
+
+    input_hashes = {}
+    for pattern in inputs:
+        path = resolve_input(pattern)
+        input_hashes[str(pattern)] = file_fingerprint(path) if path else None
+
+    payload = {
+        "func": f"{func.__module__}.{getattr(func, '__qualname__', repr(func))}",
+        "arguments": arguments,
+        "key": key,
+        "inputs": input_hashes,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+class StageCheckpoints:
+    """Completed stages and the fingerprint they completed with, persisted as JSON."""
+
+    def __init__(self, path: Union[str, Path] = "data/pipeline_checkpoints.json"):
+        self.path = Path(path)
+        self.stages: Dict[str, Dict] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.stages = json.load(f)
+
+    def is_complete(self, pipeline: str, stage: str, fingerprint: str) -> bool:
+        record = self.stages.get(f"{pipeline}/{stage}")
+        return record is not None and record["fingerprint"] == fingerprint
+
+    def mark_complete(self, pipeline: str, stage: str, fingerprint: str, run_id: str) -> None:
+        self.stages[f"{pipeline}/{stage}"] = {
+            "fingerprint": fingerprint,
+            "run_id": run_id,
+            "completed_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.stages, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class ItemJournal:
+    """
+    Append-only record of finished items inside a long stage loop.
+
+    The first line holds the fingerprint of the stage's input; a journal
+    written for a different input is discarded, so resuming only ever
+    reuses results for the same work. Each item is flushed and fsynced as
+    it completes, so a crash loses at most the item in progress.
+    """
+
+    def __init__(self, path: Union[str, Path], fingerprint: str):
+        """
+        Open the journal, keeping earlier results if the fingerprint matches.
+
+        Args:
+            path (str): JSON lines file
+            fingerprint (str): Fingerprint of the stage input
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.done: Dict[str, Any] = {}
+
+        if self.path.exists():
+            with open(self.path) as f:
+                lines = [line for line in f if line.strip()]
+            try:
+                header = json.loads(lines[0]) if lines else {}
+            except json.JSONDecodeError:
+                header = {}
+            if header.get("fingerprint") == fingerprint:
+                for line in lines[1:]:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # torn last line from a crash
+                    self.done[entry["item"]] = entry["result"]
+
+        # Rewrite with only intact entries so appends never follow a torn line
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps({"fingerprint": fingerprint}) + "\n")
+            for item, result in self.done.items():
+                f.write(json.dumps({"item": item, "result": result}) + "\n")
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a")
+
+    def _write(self, entry: Dict) -> None:
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record(self, item: str, result: Any) -> None:
+        """Commit one finished item."""
+        self.done[item] = result
+        self._write({"item": item, "result": result})
+
+    def finish(self) -> None:
+        """Close and delete the journal once the stage's output is written."""
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self._file.close()
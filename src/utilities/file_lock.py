@@ -0,0 +1,140 @@
+# Libraries ----
+import contextlib
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+# Age after which an exclusive-create lock file is assumed abandoned
+STALE_LOCK_SECONDS = 3600
+
+# Lock files held by the current thread, so nested acquisition doesn't deadlock
+_held = threading.local()
+
+
+# Function: File Lock ----
+@contextlib.contextmanager
+def file_lock(lock_path: Union[str, Path], timeout: float = 300):
+    """
+    Exclusive lock on a lock file.
+
+    Uses flock on `lock_path` (msvcrt.locking on Windows), so it covers
+    threads and processes on the same host and is released if the holder
+    dies. Where neither exists it falls back to creating the lock file
+    exclusively, breaking locks whose owner process is gone or that are
+    older than STALE_LOCK_SECONDS. A thread already holding the lock may
+    enter it again.
+
+    Args:
+        lock_path (str): Lock file (its directory must exist)
+        timeout (float): Seconds to wait for the lock before raising TimeoutError
+    """
+    lock_path = Path(lock_path)
+    key = str(lock_path.resolve())
+    held = getattr(_held, "paths", None)
+    if held is None:
+        held = _held.paths = set()
+    if key in held:
+        yield
+        return
+    held.add(key)
+    try:
+        with _acquire(lock_path, timeout):
+            yield
+    finally:
+        held.discard(key)
+
+
+@contextlib.contextmanager
+def _acquire(lock_path: Path, timeout: float):
+    deadline = time.monotonic() + timeout
+
+    if fcntl is not None:
+        with open(lock_path, "a") as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Timed out waiting for {lock_path}")
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        return
+
+    if msvcrt is not None:
+        # Byte-range lock, released by Windows if the process dies
+        with open(lock_path, "a+") as lock_file:
+            while True:
+                try:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Timed out waiting for {lock_path}")
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+
+    # Neither: create the lock file exclusively, recording the owner so a
+    # lock left behind by a crashed process can be broken
+    host = socket.gethostname()
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, json.dumps({"host": host, "pid": os.getpid(), "time": time.time()}).encode())
+            break
+        except FileExistsError:
+            if _is_stale(lock_path, host):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(lock_path)
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for {lock_path}")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lock_path)
+
+
+def _is_stale(lock_path: Path, host: str) -> bool:
+    """A lock file is stale if its owner on this host is gone or it is older than STALE_LOCK_SECONDS."""
+    try:
+        age = time.time() - lock_path.stat().st_mtime
+        with open(lock_path) as f:
+            owner = json.loads(f.read() or "{}")
+    except FileNotFoundError:
+        return False
+    except ValueError:
+        owner = {}
+    if owner.get("host") == host and owner.get("pid"):
+        try:
+            os.kill(owner["pid"], 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            pass
+    return age > STALE_LOCK_SECONDS
@@ -1,11 +1,13 @@
 import requests
 import json
 import polars as pl
+import pyarrow as pa
 from youtube_transcript_api import YouTubeTranscriptApi
 from googleapiclient.discovery import build
-from sentence_transformers import SentenceTransformer
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import os
+import glob
+import hashlib
 from dotenv import load_dotenv
 # import yaml
 # from pprint import pprint
@@ -13,10 +15,19 @@ from dotenv import load_dotenv
 # import pandas as pd
 import numpy as np
 
+from src.utilities.checkpoints import ItemJournal
+from src.utilities.streaming import ParquetBatchWriter, run_stream
+
 
 # Youtube API Key
 # load_dotenv(dotenv_path = ".env")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+YOUTUBE_API_BASE_URL = os.getenv("YOUTUBE_API_BASE_URL", "https://www.googleapis.com/youtube/v3")
+
+# Rows per parquet row group. The output store deduplicates row groups, so
+# a run whose rows repeat an earlier run's only stores the changed groups.
+VIDEO_IDS_ROW_GROUP_SIZE = 500
+TRANSCRIPTS_ROW_GROUP_SIZE = 50
 
 
 
@@ -44,12 +55,12 @@ def get_video_records(response: requests.models.Response, lookback_days = 30) ->
             continue  # Skip if publishedAt is missing
 
         try:
-            video_date = datetime.datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ")
+            video_date = datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ")
         except ValueError:
             continue  # Skip if date parsing fails
 
         # Check if video is within the last 30 days
-        if video_date >= datetime.datetime.now() - datetime.timedelta(days = lookback_days):
+        if video_date >= datetime.now() - timedelta(days = lookback_days):
             # Only proceed for YouTube videos
             if raw_item.get('id', {}).get('kind') == "youtube#video":
                 video_record = {
@@ -68,25 +79,226 @@ def get_video_records(response: requests.models.Response, lookback_days = 30) ->
 # raw_item["snippet"]["publishedAt"]
 
 
+# Get Uploads Playlist ID ----
+def get_uploads_playlist_id(
+    channel_id: str,
+    cache_path: str = "data/youtube_uploads_playlists.json",
+    session: requests.Session = None
+) -> str:
+    """
+    Function to look up (once) the uploads playlist of a YouTube channel.
+
+    The playlist ID never changes for a channel, so it is cached in
+    `cache_path` and later runs skip the `channels` call.
+
+    Args:
+        channel_id (str): YouTube channel ID.
+        cache_path (str): JSON file mapping channel IDs to uploads playlist IDs.
+        session (requests.Session): Optional session to reuse connections.
+
+    Returns:
+        str: Uploads playlist ID.
+    """
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            cache = json.load(f)
+    if channel_id in cache:
+        return cache[channel_id]
+
+    params = {"key": YOUTUBE_API_KEY, "id": channel_id, "part": "contentDetails"}
+    response = (session or requests).get(f"{YOUTUBE_API_BASE_URL}/channels", params = params)
+    response.raise_for_status()
+    items = response.json().get("items", [])
+    if not items:
+        raise ValueError(f"Channel {channel_id} not found.")
+    playlist_id = items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+    cache[channel_id] = playlist_id
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok = True)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f, indent = 2)
+    os.replace(tmp_path, cache_path)
+    return playlist_id
+
+
+# Get Playlist Video IDs ----
+def iter_playlist_video_id_pages(playlist_id: str, lookback_days = 15, session: requests.Session = None):
+    """
+    Generator paging through a playlist (1 quota unit per 50 items), yielding each page's video IDs.
+
+    Uploads playlists list the newest videos first, so paging stops at the
+    first page that reaches past the lookback window.
+
+    Args:
+        playlist_id (str): Playlist ID.
+        lookback_days (int): Only keep videos published in the last N days.
+        session (requests.Session): Optional session to reuse connections.
+
+    Yields:
+        list: Video IDs of one page.
+    """
+    url = f"{YOUTUBE_API_BASE_URL}/playlistItems"
+    cutoff = datetime.now(timezone.utc) - timedelta(days = lookback_days)
+    page_token = None
+
+    while True:
+        params = {
+            "key": YOUTUBE_API_KEY,
+            "playlistId": playlist_id,
+            "part": "contentDetails",
+            "maxResults": 50,
+            "pageToken": page_token,
+        }
+        response = (session or requests).get(url, params = params)
+        response.raise_for_status()
+        response_data = response.json()
+
+        video_id_list = []
+        reached_cutoff = False
+        for item in response_data.get("items", []):
+            details = item.get("contentDetails", {})
+            published_at = details.get("videoPublishedAt")
+            if not published_at:
+                continue  # Private or deleted videos have no publish date
+            if datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo = timezone.utc) >= cutoff:
+                video_id_list.append(details["videoId"])
+            else:
+                reached_cutoff = True
+
+        if video_id_list:
+            yield video_id_list
+
+        page_token = response_data.get("nextPageToken")
+        if reached_cutoff or not page_token:
+            return
+
+
+def get_playlist_video_ids(playlist_id: str, lookback_days = 15, session: requests.Session = None) -> list:
+    """
+    Function to list a playlist's video IDs within the lookback window.
+
+    Args:
+        playlist_id (str): Playlist ID.
+        lookback_days (int): Only keep videos published in the last N days.
+        session (requests.Session): Optional session to reuse connections.
+
+    Returns:
+        list: Video IDs.
+    """
+    return [
+        video_id
+        for page in iter_playlist_video_id_pages(playlist_id, lookback_days = lookback_days, session = session)
+        for video_id in page
+    ]
+
+
+# Get Video Details ----
+def get_video_details(video_ids: list, session: requests.Session = None) -> list:
+    """
+    Function to fetch metadata for videos, 50 IDs per `videos` call (1 quota unit each).
+
+    Args:
+        video_ids (list): Video IDs.
+        session (requests.Session): Optional session to reuse connections.
+
+    Returns:
+        list: Video records with video_id, datetime, title, duration and counts.
+    """
+    url = f"{YOUTUBE_API_BASE_URL}/videos"
+    video_record_list = []
+
+    for i in range(0, len(video_ids), 50):
+        params = {
+            "key": YOUTUBE_API_KEY,
+            "id": ",".join(video_ids[i:i + 50]),
+            "part": "snippet,contentDetails,statistics",
+        }
+        response = (session or requests).get(url, params = params)
+        response.raise_for_status()
+
+        for item in response.json().get("items", []):
+            snippet = item.get("snippet", {})
+            statistics = item.get("statistics", {})
+            video_record_list.append({
+                "video_id": item.get("id"),
+                "datetime": snippet.get("publishedAt"),
+                "title": snippet.get("title"),
+                "duration": item.get("contentDetails", {}).get("duration"),
+                "view_count": int(statistics["viewCount"]) if "viewCount" in statistics else None,
+                "like_count": int(statistics["likeCount"]) if "likeCount" in statistics else None,
+                "comment_count": int(statistics["commentCount"]) if "commentCount" in statistics else None,
+            })
+
+    return video_record_list
+
+
 # Get video IDs ----
-def get_video_ids(channel_id: str = "UCBTy8j2cPy6zw68godcE7MQ", lookback_days = 15) -> list:
+def get_video_ids(
+    channel_id: str = "UCBTy8j2cPy6zw68godcE7MQ",
+    lookback_days = 15,
+    listing: str = "uploads",
+    session: requests.Session = None,
+    stream: bool = False
+) -> list:
     """
     Function to extract video IDs from a YouTube channel.
 
     Args:
         channel_id (str): YouTube channel ID.
+        lookback_days (int): Only keep videos published in the last N days.
+        listing (str): "uploads" pages the channel's uploads playlist and
+            enriches IDs with `videos` (1 quota unit per 50 videos each);
+            "search" uses the `search` endpoint (100 units per page).
+        session (requests.Session): Optional session to reuse connections
+            (uploads listing; a new one is opened otherwise).
+        stream (bool): Write each page as it arrives instead of collecting
+            the whole listing first (see stream_video_ids()).
 
     Returns:
         list: List of video IDs.
     """
 
-    url = "https://www.googleapis.com/youtube/v3/search"
-    page_token = None
-    channel_id = channel_id
-    YOUR_API_KEY = YOUTUBE_API_KEY
+    if stream:
+        return stream_video_ids(channel_id, lookback_days = lookback_days, listing = listing, session = session)
 
+    if listing == "uploads":
+        owns_session = session is None
+        session = session or requests.Session()
+        try:
+            playlist_id = get_uploads_playlist_id(channel_id, session = session)
+            video_ids = get_playlist_video_ids(playlist_id, lookback_days = lookback_days, session = session)
+            video_record_list = get_video_details(video_ids, session = session)
+        finally:
+            if owns_session:
+                session.close()
+    elif listing == "search":
+        video_record_list = get_search_video_records(channel_id, lookback_days = lookback_days)
+    else:
+        raise ValueError(f"Unknown listing mode: {listing}")
 
-    video_record_list = []
+    # return video_record_list
+    # return pl.DataFrame(video_record_list)
+    current_timestamp = datetime.now().strftime("%Y-%m-%d_%H.%M.%S")
+    file_name = f"data/video_ids_{current_timestamp}.parquet"
+    pl.DataFrame(video_record_list).write_parquet(file_name, row_group_size = VIDEO_IDS_ROW_GROUP_SIZE)
+
+
+def iter_search_video_record_pages(channel_id: str, lookback_days = 15):
+    """
+    Generator listing a channel's videos through the `search` endpoint, one page of records at a time.
+
+    Args:
+        channel_id (str): YouTube channel ID.
+        lookback_days (int): Only keep videos published in the last N days.
+
+    Yields:
+        list: Video records of one page.
+    """
+
+    url = f"{YOUTUBE_API_BASE_URL}/search"
+    page_token = None
 
     while page_token != 0:
         params = {
@@ -100,8 +312,8 @@ def get_video_ids(channel_id: str = "UCBTy8j2cPy6zw68godcE7MQ", lookback_days =
 
         response = requests.get(url, params = params)
 
-        # Append video data to video_data list
-        video_record_list += get_video_records(response, lookback_days = lookback_days)
+        # Yield this page's video data
+        yield get_video_records(response, lookback_days = lookback_days)
 
         try:
             # Grab next page token
@@ -110,11 +322,94 @@ def get_video_ids(channel_id: str = "UCBTy8j2cPy6zw68godcE7MQ", lookback_days =
             # if no next page token, set page_token to 0
             page_token = 0
 
-    # return video_record_list
-    # return pl.DataFrame(video_record_list)
-    current_timestamp = datetime.now().strftime("%Y-%m-%d_%H.%M.%S")
-    file_name = f"data/video_ids_{current_timestamp}.parquet"
-    pl.DataFrame(video_record_list).write_parquet(file_name)
+
+def get_search_video_records(channel_id: str, lookback_days = 15) -> list:
+    """
+    Function to list a channel's videos through the `search` endpoint.
+
+    Args:
+        channel_id (str): YouTube channel ID.
+        lookback_days (int): Only keep videos published in the last N days.
+
+    Returns:
+        list: Video records.
+    """
+    return [
+        video_record
+        for page in iter_search_video_record_pages(channel_id, lookback_days = lookback_days)
+        for video_record in page
+    ]
+
+
+# Video Record Schemas ----
+SEARCH_VIDEO_RECORD_SCHEMA = pa.schema([
+    ("video_id", pa.string()),
+    ("datetime", pa.string()),
+    ("title", pa.string()),
+])
+
+VIDEO_RECORD_SCHEMA = pa.schema(list(SEARCH_VIDEO_RECORD_SCHEMA) + [
+    ("duration", pa.string()),
+    ("view_count", pa.int64()),
+    ("like_count", pa.int64()),
+    ("comment_count", pa.int64()),
+])
+
+
+# Stream Video IDs ----
+def stream_video_ids(
+    channel_id: str = "UCBTy8j2cPy6zw68godcE7MQ",
+    lookback_days = 15,
+    listing: str = "uploads",
+    session: requests.Session = None,
+    maxsize: int = 4
+) -> str:
+    """
+    Function to write a channel's video records page by page.
+
+    Listing pages are produced on one thread, enriched with `videos` on a
+    second and written as they arrive on the calling thread, connected by
+    bounded queues, so memory holds a few pages rather than the whole
+    channel and writing overlaps with the API calls.
+
+    Args:
+        channel_id (str): YouTube channel ID.
+        lookback_days (int): Only keep videos published in the last N days.
+        listing (str): "uploads" or "search", as in get_video_ids().
+        session (requests.Session): Optional session to reuse connections.
+        maxsize (int): Pages buffered between stages.
+
+    Returns:
+        str: Path of the written video_ids parquet file.
+    """
+    owns_session = session is None
+    session = session or requests.Session()
+    try:
+        if listing == "uploads":
+            playlist_id = get_uploads_playlist_id(channel_id, session = session)
+            pages = iter_playlist_video_id_pages(playlist_id, lookback_days = lookback_days, session = session)
+
+            def fetch_details(video_ids):
+                return get_video_details(video_ids, session = session)
+
+            stages = [fetch_details]
+            schema = VIDEO_RECORD_SCHEMA
+        elif listing == "search":
+            pages = iter_search_video_record_pages(channel_id, lookback_days = lookback_days)
+            stages = []
+            schema = SEARCH_VIDEO_RECORD_SCHEMA
+        else:
+            raise ValueError(f"Unknown listing mode: {listing}")
+
+        current_timestamp = datetime.now().strftime("%Y-%m-%d_%H.%M.%S")
+        file_name = f"data/video_ids_{current_timestamp}.parquet"
+        with ParquetBatchWriter(file_name, schema = schema, row_group_size = VIDEO_IDS_ROW_GROUP_SIZE) as writer:
+            run_stream(pages, stages, writer.write, maxsize = maxsize)
+    finally:
+        if owns_session:
+            session.close()
+
+    return file_name
 
 
 
@@ -152,32 +447,66 @@ def read_most_recent_file(data_file = "video_ids"):
     # Read the most recent file using Polars
     data = pl.read_parquet(latest_file)
 
+    return data
+
 
 
 # Get Video Transcripts ----
-def get_video_transcripts() -> dict:
+def get_video_transcripts(
+    segments: bool = False,
+    journal_path: str = "data/video_transcripts.journal.jsonl",
+    stream: bool = False,
+    batch_size: int = 50
+) -> dict:
+    """
+    Function to fetch transcripts for the most recent video IDs.
+
+    Each fetched transcript is committed to a journal keyed on the video ID
+    list and the `segments` option, so a run that fails part way resumes
+    from the last finished video instead of refetching everything.
+
+    Args:
+        segments (bool): Also write timestamped segments (video_id, start,
+            duration, text) to a video_transcript_segments parquet file,
+            see read_transcript_segments().
+        journal_path (str): Journal of transcripts fetched for the current input.
+        stream (bool): Fetch and write `batch_size` videos at a time through
+            bounded queues instead of collecting every transcript first.
+        batch_size (int): Videos per batch in stream mode.
+    """
 
     # Load Data
     # data = pl.read_parquet("data/video_ids.parquet")
     data = read_most_recent_file(data_file = "video_ids")
-    data = pl.read_parquet('data/video_ids_2024-12-26_11.33.59.parquet')
+
+    # Resume from transcripts fetched for this exact list of videos and the
+    # same output options (a journal written without segments has none to reuse)
+    input_fingerprint = hashlib.sha256(
+        json.dumps({"video_ids": data["video_id"].to_list(), "segments": segments}).encode()
+    ).hexdigest()
+    journal = ItemJournal(journal_path, input_fingerprint)
+
+    if stream:
+        return stream_video_transcripts(data, journal, segments = segments, batch_size = batch_size)
 
     # Initialize list to store transcripts
     transcript_text_list = []
+    segment_list = []
 
     # Iterate over video IDs
     for video_id in data["video_id"]:
-        try:
-            # Fetch transcript for the video
-            transcript = YouTubeTranscriptApi.get_transcript(video_id)
-            # Combine all transcript text
-            transcript_text = " ".join([entry['text'] for entry in transcript])
-        except Exception as e:
-            # Handle errors (e.g., no transcript available)
-            transcript_text = "No transcript available"
+        if video_id in journal.done:
+            transcript_text = journal.done[video_id]["transcript"]
+            segment_list += journal.done[video_id]["segments"]
+            transcript_text_list.append(transcript_text)
+            continue
+
+        transcript_text, video_segments = get_video_transcript(video_id, segments = segments)
 
         # Append the transcript text
         transcript_text_list.append(transcript_text)
+        segment_list += video_segments
+        journal.record(video_id, {"transcript": transcript_text, "segments": video_segments})
 
     # Add transcript column to the DataFrame
     data = data.with_columns(pl.Series(name = "transcript", values = transcript_text_list))
@@ -186,7 +515,188 @@ def get_video_transcripts() -> dict:
     # return data
     current_timestamp = datetime.now().strftime("%Y-%m-%d_%H.%M.%S")
     file_name = f"data/video_transcripts{current_timestamp}.parquet"
-    data.write_parquet(file_name)
+    data.write_parquet(file_name, row_group_size = TRANSCRIPTS_ROW_GROUP_SIZE)
+
+    if segments:
+        write_transcript_segments(segment_list, f"data/video_transcript_segments{current_timestamp}.parquet")
+
+    journal.finish()
+
+
+def get_video_transcript(video_id: str, segments: bool = False) -> tuple:
+    """
+    Function to fetch one video's transcript text (and optionally its segments).
+
+    Returns:
+        tuple: (transcript text, list of segment rows)
+    """
+    video_segments = []
+    try:
+        # Fetch transcript for the video
+        transcript = YouTubeTranscriptApi.get_transcript(video_id)
+        # Combine all transcript text
+        transcript_text = " ".join([entry['text'] for entry in transcript])
+        if segments:
+            video_segments = get_transcript_segments(video_id, transcript)
+    except Exception as e:
+        # Handle errors (e.g., no transcript available)
+        transcript_text = "No transcript available"
+    return transcript_text, video_segments
+
+
+def stream_video_transcripts(data: pl.DataFrame, journal: ItemJournal, segments: bool = False, batch_size: int = 50, maxsize: int = 4) -> str:
+    """
+    Function to fetch transcripts in batches and write each batch as it completes.
+
+    Batches of video rows are fetched on one thread and appended to the
+    output files on the calling thread, connected by a bounded queue, so
+    memory holds a few batches of transcripts instead of the whole channel.
+    The segments file is sorted by video_id and start across the whole file
+    (external merge of sorted runs), like write_transcript_segments().
+
+    Args:
+        data (pl.DataFrame): Video records with a video_id column.
+        journal (ItemJournal): Journal of transcripts already fetched for this input.
+        segments (bool): Also write the segments file.
+        batch_size (int): Videos per batch.
+        maxsize (int): Batches buffered between fetching and writing.
+
+    Returns:
+        str: Path of the written video_transcripts parquet file.
+    """
+
+    def fetch_batch(batch):
+        rows, batch_segments = [], []
+        for row in batch.iter_rows(named = True):
+            video_id = row["video_id"]
+            result = journal.done.get(video_id)
+            if result is None:
+                transcript_text, video_segments = get_video_transcript(video_id, segments = segments)
+                result = {"transcript": transcript_text, "segments": video_segments}
+                journal.record(video_id, result)
+            # The journal file keeps the result; don't also keep it in memory
+            journal.done.pop(video_id, None)
+            rows.append(dict(row, transcript = result["transcript"]))
+            batch_segments += result["segments"]
+        return rows, batch_segments
+
+    current_timestamp = datetime.now().strftime("%Y-%m-%d_%H.%M.%S")
+    file_name = f"data/video_transcripts{current_timestamp}.parquet"
+    schema = data.to_arrow().schema.append(pa.field("transcript", pa.string()))
+    transcript_writer = ParquetBatchWriter(file_name, schema = schema, row_group_size = TRANSCRIPTS_ROW_GROUP_SIZE)
+    segment_writer = ParquetBatchWriter(
+        f"data/video_transcript_segments{current_timestamp}.parquet",
+        schema = TRANSCRIPT_SEGMENT_ARROW_SCHEMA,
+        row_group_size = 20_000,
+        sort_by = ["video_id", "start"]
+    ) if segments else None
+
+    def write_batch(result):
+        rows, batch_segments = result
+        transcript_writer.write(rows)
+        if segment_writer is not None:
+            segment_writer.write(batch_segments)
+
+    try:
+        run_stream(data.iter_slices(batch_size), [fetch_batch], write_batch, maxsize = maxsize)
+    except BaseException:
+        transcript_writer.abort()
+        if segment_writer is not None:
+            segment_writer.abort()
+        journal.close()
+        raise
+
+    transcript_writer.close()
+    if segment_writer is not None:
+        segment_writer.close()
+    journal.finish()
+    return file_name
+
+
+# Transcript Segments ----
+TRANSCRIPT_SEGMENT_SCHEMA = {
+    "video_id": pl.Utf8,
+    "start": pl.Float64,
+    "duration": pl.Float64,
+    "text": pl.Utf8,
+}
+
+TRANSCRIPT_SEGMENT_ARROW_SCHEMA = pa.schema([
+    ("video_id", pa.string()),
+    ("start", pa.float64()),
+    ("duration", pa.float64()),
+    ("text", pa.string()),
+])
+
+
+def get_transcript_segments(video_id: str, transcript: list) -> list:
+    """
+    Function to turn a fetched transcript into (video_id, start, duration, text) rows.
+    """
+    return [
+        {
+            "video_id": video_id,
+            "start": float(entry["start"]),
+            "duration": float(entry.get("duration", 0.0)),
+            "text": entry["text"],
+        }
+        for entry in transcript
+    ]
+
+
+def write_transcript_segments(segment_list: list, file_name: str, row_group_size: int = 20_000) -> None:
+    """
+    Function to write transcript segments as a long table sorted by video_id and start.
+
+    Sorting keeps each video's segments contiguous, so the video_id
+    min/max statistics of each row group let readers skip every row group
+    that can't contain the videos they ask for.
+
+    Args:
+        segment_list (list): Segment rows from get_transcript_segments().
+        file_name (str): Output parquet file.
+        row_group_size (int): Rows per parquet row group.
+    """
+    df = pl.DataFrame(segment_list, schema = TRANSCRIPT_SEGMENT_SCHEMA).sort(["video_id", "start"])
+    df.write_parquet(file_name, row_group_size = row_group_size, statistics = True)
+
+
+def read_transcript_segments(
+    file_path: str = None,
+    video_ids: list = None,
+    start: float = None,
+    end: float = None
+) -> pl.DataFrame:
+    """
+    Function to read transcript segments for some videos and/or a time window.
+
+    Filters are pushed down to the parquet scan, so only row groups whose
+    statistics can match are read.
+
+    Args:
+        file_path (str): Segments parquet file (default: most recent in data/).
+        video_ids (list): Only these videos.
+        start (float): Only segments still running at this second.
+        end (float): Only segments starting before this second.
+
+    Returns:
+        pl.DataFrame: Matching segments ordered by video_id and start.
+    """
+    if file_path is None:
+        files = glob.glob("data/video_transcript_segments*.parquet")
+        if not files:
+            raise FileNotFoundError("No video_transcript_segments parquet files found in the data folder.")
+        file_path = max(files, key = os.path.getmtime)
+
+    query = pl.scan_parquet(file_path)
+    if video_ids is not None:
+        query = query.filter(pl.col("video_id").is_in(list(video_ids)))
+    if end is not None:
+        query = query.filter(pl.col("start") < end)
+    if start is not None:
+        query = query.filter(pl.col("start") + pl.col("duration") > start)
+    return query.collect()
+
 
 # video_transcript_df = get_video_transcripts(video_id_df)
 
@@ -0,0 +1,228 @@
+# Libraries ----
+import bisect
+import gzip
+import json
+import os
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+KEY_SEPARATOR = "\x1f"
+INDEX_COLUMNS = ["city", "state", "country", "city_id", "latitude", "longitude", "source"]
+KEY_COLUMNS = ["key_city", "key_state", "key_country"]
+
+
+def normalize_name(value: Optional[str]) -> str:
+    """Casefold, strip accents and collapse whitespace for index keys."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.casefold().split())
+
+
+class LocationIndex:
+    """
+    Local (city, state, country) -> city_id / coordinates index.
+
+    Lets weather requests go by city ID instead of asking OpenWeather to
+    geocode a free-text `q=` on every call. Exact lookups are a dict hit;
+    prefix lookups bisect a sorted key list. Entries come from OpenWeather's
+    bulk city list, from snapshots already stored, or are learned from
+    responses, and the index is persisted as a CSV.
+    """
+
+    def __init__(self, path: Union[str, Path] = "data/location_index.csv"):
+        """
+        Initialize the index, loading it from `path` if it exists.
+
+        Args:
+            path (str): CSV file the index is persisted to
+        """
+        self.path = Path(path)
+        self._entries: Dict[tuple, Dict] = {}
+        self._by_city_country: Dict[tuple, List[tuple]] = {}
+        self._sorted_keys: List[str] = []
+        self._sorted_dirty = False
+        self.dirty = False
+        if self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Building ----
+    def add(
+        self,
+        city: str,
+        state: Optional[str],
+        country: str,
+        city_id: int,
+        latitude: float,
+        longitude: float,
+        source: str = "manual",
+        overwrite: bool = True
+    ) -> None:
+        """Add or replace one location."""
+        key = (normalize_name(city), normalize_name(state), normalize_name(country))
+        if key in self._entries and not overwrite:
+            return
+        if key not in self._entries:
+            self._by_city_country.setdefault((key[0], key[2]), []).append(key)
+            self._sorted_dirty = True
+        self._entries[key] = {
+            "city": city,
+            "state": state or "",
+            "country": country,
+            "city_id": int(city_id),
+            "latitude": float(latitude),
+            "longitude": float(longitude),
+            "source": source,
+        }
+        self.dirty = True
+
+    def add_from_city_list(self, file_path: Union[str, Path]) -> int:
+        """
+        Load OpenWeather's bulk city list (city.list.json or city.list.json.gz).
+
+        Returns:
+            int: Number of entries read
+        """
+        opener = gzip.open if str(file_path).endswith(".gz") else open
+        with opener(file_path, "rt", encoding="utf-8") as f:
+            cities = json.load(f)
+        for city in cities:
+            self.add(
+                city["name"],
+                city.get("state"),
+                city["country"],
+                city["id"],
+                city["coord"]["lat"],
+                city["coord"]["lon"],
+                source="city_list",
+                overwrite=False
+            )
+        return len(cities)
+
+    def add_from_snapshots(self, data_path: str = "data/open_weather_data/") -> int:
+        """
+        Learn locations from stored snapshots (city_name, city_id, country, coordinates).
+
+        Snapshots carry no state, so these entries are found through the
+        (city, country) fallback of `lookup`.
+
+        Returns:
+            int: Number of distinct locations found
+        """
+        frames = []
+        for file in Path(data_path).glob("*.csv"):
+            try:
+                frames.append(pd.read_csv(
+                    file, usecols=["city_name", "city_id", "city_country", "latitude", "longitude"]
+                ))
+            except (ValueError, pd.errors.EmptyDataError):
+                continue
+        if not frames:
+            return 0
+        locations = pd.concat(frames, ignore_index=True).drop_duplicates("city_id", keep="last")
+        for row in locations.itertuples(index=False):
+            self.add(row.city_name, None, row.city_country, row.city_id, row.latitude, row.longitude,
+                     source="snapshots", overwrite=False)
+        return len(locations)
+
+    def add_from_response(self, city: str, state: Optional[str], country: str, weather_df: pd.DataFrame) -> None:
+        """Record the ID and coordinates returned for a free-text request."""
+        row = weather_df.iloc[0]
+        self.add(city, state, country, row["city_id"], row["latitude"], row["longitude"], source="response")
+
+    # Lookups ----
+    def lookup(self, city: str, state: Optional[str], country: str) -> Optional[Dict]:
+        """
+        Exact lookup, falling back to (city, country) when the state is unknown.
+
+        The fallback only matches when the query has no state or the
+        candidate has none, so "Portland, ME" never resolves to Portland, OR.
+
+        Returns:
+            dict: The entry, or None if not indexed (or ambiguous)
+        """
+        key = (normalize_name(city), normalize_name(state), normalize_name(country))
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        candidates = self._by_city_country.get((key[0], key[2]), [])
+        if not key[1] and len(candidates) == 1:
+            return self._entries[candidates[0]]
+        # Entries learned from snapshots have no state; never substitute another state's city
+        stateless = [k for k in candidates if k[1] == ""]
+        if len(stateless) == 1:
+            return self._entries[stateless[0]]
+        return None
+
+    def search_prefix(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """
+        Locations whose normalized city name starts with `prefix`.
+
+        Returns:
+            list: Up to `limit` entries in name order
+        """
+        if self._sorted_dirty:
+            self._sorted_keys = sorted(KEY_SEPARATOR.join(key) for key in self._entries)
+            self._sorted_dirty = False
+
+        prefix = normalize_name(prefix)
+        results = []
+        position = bisect.bisect_left(self._sorted_keys, prefix)
+        while position < len(self._sorted_keys) and len(results) < limit:
+            joined = self._sorted_keys[position]
+            if not joined.startswith(prefix):
+                break
+            results.append(self._entries[tuple(joined.split(KEY_SEPARATOR))])
+            position += 1
+        return results
+
+    # Persistence ----
+    def load(self) -> None:
+        """Load the index CSV; stored normalized keys avoid re-normalizing every name."""
+        df = pd.read_csv(
+            self.path,
+            dtype={column: str for column in ["city", "state", "country", "source"] + KEY_COLUMNS},
+            keep_default_na=False
+        )
+        keys = zip(df["key_city"], df["key_state"], df["key_country"])
+        for key, entry in zip(keys, df[INDEX_COLUMNS].to_dict("records")):
+            if key not in self._entries:
+                self._by_city_country.setdefault((key[0], key[2]), []).append(key)
+            self._entries[key] = entry
+        self._sorted_dirty = True
+        self.dirty = False
+
+    def save(self) -> None:
+        """Write the index to its CSV (atomically)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        df = pd.DataFrame(list(self._entries.values()), columns=INDEX_COLUMNS)
+        df[KEY_COLUMNS] = pd.DataFrame(list(self._entries.keys()), columns=KEY_COLUMNS)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+# Function: Resolve Locations ----
+def resolve_locations(locations: List[Dict], index: LocationIndex) -> List[Dict]:
+    """
+    Attach city_id/latitude/longitude from the index to location dicts.
+
+    Locations that are not indexed are returned unchanged and keep using
+    free-text requests until a response teaches the index their ID.
+    """
+    resolved = []
+    for location in locations:
+        entry = index.lookup(location["city"], location.get("state"), location["country"])
+        if entry is not None and "city_id" not in location:
+            location = dict(location, city_id=entry["city_id"], latitude=entry["latitude"], longitude=entry["longitude"])
+        resolved.append(location)
+    return resolved
@@ -0,0 +1,165 @@
+# Libraries ----
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_setup_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        suppressed = getattr(record, "suppressed", None)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drop repeats of the same warning/error beyond `burst` per `window` seconds.
+
+    Records are keyed on logger and call site rather than message text, since
+    most messages here are f-strings with the error folded in. The first
+    record let through after a quiet period reports how many were dropped.
+    """
+
+    def __init__(self, window: float = 60.0, burst: int = 5, min_level: int = logging.WARNING):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.min_level = min_level
+        self._state: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.min_level:
+            return True
+
+        key = (record.name, record.levelno, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            # [window start, records allowed in window, records suppressed]
+            state = self._state.setdefault(key, [now, 0, 0])
+            if now - state[0] >= self.window:
+                state[0], state[1] = now, 0
+            if state[1] >= self.burst:
+                state[2] += 1
+                return False
+            state[1] += 1
+            suppressed, state[2] = state[2], 0
+
+        if suppressed:
+            record.suppressed = suppressed
+            record.msg = f"{record.msg} (suppressed {suppressed} similar messages)"
+        return True
+
+
+# Function: Setup Logging ----
+def setup_logging(
+    log_file: Optional[str] = "log.log",
+    level: int = logging.INFO,
+    json_format: Optional[bool] = None,
+    console: bool = True,
+    rate_limit_window: float = 60.0,
+    rate_limit_burst: int = 5
+) -> logging.handlers.QueueListener:
+    """
+    Install the project's log handlers on the root logger, once per process.
+
+    Only entry points (the pipeline scripts, the benchmark runner) call
+    this; library code just uses `get_logger`, so importing or calling it
+    from another application never adds handlers or changes the root level.
+
+    Loggers only put records on an in-memory queue through a QueueHandler;
+    a QueueListener thread does the console and file writes, so logging
+    never blocks fetch or upload threads. Repeated warnings and errors from
+    the same call site are rate limited. Later calls return the running
+    listener without adding handlers.
+
+    Args:
+        log_file (str): File to append logs to (None for console only)
+        level (int): Root log level (default: INFO)
+        json_format (bool): Write JSON lines instead of text (default: PIPELINE_LOG_FORMAT env var == "json")
+        console (bool): Also log to stderr (default: True)
+        rate_limit_window (float): Seconds per rate limit window
+        rate_limit_burst (int): Repeats of one warning/error allowed per window
+
+    Returns:
+        QueueListener: The running listener
+    """
+    global _listener, _queue_handler
+
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+
+        if json_format is None:
+            json_format = os.getenv("PIPELINE_LOG_FORMAT", "").lower() == "json"
+        formatter = JsonFormatter() if json_format else logging.Formatter(LOG_FORMAT)
+
+        handlers = []
+        if console:
+            handlers.append(logging.StreamHandler())
+        if log_file:
+            handlers.append(logging.FileHandler(log_file))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        _queue_handler.addFilter(RateLimitFilter(rate_limit_window, rate_limit_burst))
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(_queue_handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and remove the handlers installed by setup_logging."""
+    global _listener, _queue_handler
+
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener = None
+        _queue_handler = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a named logger; records reach whatever handlers the application installed."""
+    return logging.getLogger(name)
@@ -4,38 +4,63 @@ import numpy as np
 import requests
 import json
 import os
+from io import StringIO
 from datetime import datetime
 
+# CKAN portal (override to point at a local stand-in) ----
+CKAN_BASE_URL = os.getenv("CKAN_BASE_URL", "https://ckan0.cf.opendata.inter.prod-toronto.ca")
 
 
-  # Retrieve Metadata
-base_url = "https://ckan0.cf.opendata.inter.prod-toronto.ca"
-url = base_url + "/api/3/action/package_show"
-params = {"id": "daily-shelter-overnight-service-occupancy-capacity"}
+# Function: Get Shelter Occupancy ----
+def get_shelter_occupancy(
+    name="daily-shelter-overnight-service-occupancy-capacity-2024",
+    package_id="daily-shelter-overnight-service-occupancy-capacity",
+    session=None
+):
+    """
+    Download a datastore resource of the daily shelter occupancy package as a DataFrame.
 
+    Args:
+        name (str): Resource name within the package
+        package_id (str): CKAN package ID
+        session (requests.Session): Optional session to reuse pooled connections
 
-try:
-    package_response = requests.get(url, params = params)
-    package_response.raise_for_status()  # Raises an HTTPError if the response status code is 4XX/5XX
-    package = package_response.json()
-except requests.RequestException as e:
-    print(f"Request failed: {e}")
-    return df
+    Returns:
+        pd.DataFrame: Resource records (empty if the request or parse fails)
+    """
+    df = pd.DataFrame()
+
+    # Retrieve Metadata
+    base_url = CKAN_BASE_URL
+    url = base_url + "/api/3/action/package_show"
+    params = {"id": package_id}
+
+    try:
+        package_response = (session or requests).get(url, params = params)
+        package_response.raise_for_status()  # Raises an HTTPError if the response status code is 4XX/5XX
+        package = package_response.json()
+    except requests.RequestException as e:
+        print(f"Request failed: {e}")
+        return df
+
+    # To get resource data:
+    for resource in package["result"]["resources"]:
 
- # To get resource data:
-for resource in package["result"]["resources"]:
-
-    # for datastore_active resources:
-    if resource["datastore_active"] and resource["name"] == name:
-
-        # To get all records in CSV format:
-        url = base_url + "/datastore/dump/" + resource["id"]
-        try:
-            df = pd.read_csv(url)
-            break  # Exit loop after finding the correct resource
-        except pd.errors.ParserError as e:
-            print(f"Failed to parse CSV: {e}")
-            return df
-        except Exception as e:
-            print(f"Unexpected error: {e}")
-            return df
\ No newline at end of file
+        # for datastore_active resources:
+        if resource["datastore_active"] and resource["name"] == name:
+
+            # To get all records in CSV format:
+            url = base_url + "/datastore/dump/" + resource["id"]
+            try:
+                response = (session or requests).get(url)
+                response.raise_for_status()
+                df = pd.read_csv(StringIO(response.text))
+                break  # Exit loop after finding the correct resource
+            except pd.errors.ParserError as e:
+                print(f"Failed to parse CSV: {e}")
+                return df
+            except Exception as e:
+                print(f"Unexpected error: {e}")
+                return df
+
+    return df
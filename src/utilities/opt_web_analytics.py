@@ -15,17 +15,26 @@ import pickle
 from pathlib import Path
 import time
 import os
+import tempfile
 from datetime import datetime
 
+from src.utilities.streaming import ParquetBatchWriter, run_stream
+
+
+# CKAN portal (override to point at a local stand-in) ----
+CKAN_BASE_URL = os.getenv("CKAN_BASE_URL", "https://ckan0.cf.opendata.inter.prod-toronto.ca")
 
 # Function: Get Resource Metadata ----
-def get_resource_metadata():
+def get_resource_metadata(session=None):
     """
     Retrieves metadata specifically for 'web-analytics-weekly-report' resource
     with detailed status reporting
+
+    Args:
+        session (requests.Session): Optional session to reuse pooled connections
     """
     # Initialize variables
-    base_url = "https://ckan0.cf.opendata.inter.prod-toronto.ca"
+    base_url = CKAN_BASE_URL
     url = base_url + "/api/3/action/package_show"
     params = {"id": "web-analytics"}
 
@@ -34,7 +43,7 @@ def get_resource_metadata():
     # Step 1: Initial API Request
     try:
         print("\n1. Making initial API request...")
-        package = requests.get(url, params=params)
+        package = (session or requests).get(url, params=params)
         package.raise_for_status()
         print("✓ API request successful")
     except requests.RequestException as e:
@@ -67,7 +76,7 @@ def get_resource_metadata():
 
             try:
                 metadata_url = f"{base_url}/api/3/action/resource_show?id={resource['id']}"
-                metadata_response = requests.get(metadata_url)
+                metadata_response = (session or requests).get(metadata_url)
                 metadata_response.raise_for_status()
 
                 metadata = metadata_response.json()
@@ -105,20 +114,18 @@ def get_resource_metadata():
 #         print("\nMetadata retrieved successfully!")
 
 
-
-zip_url = get_resource_metadata()[0]["result"]["url"]
-
 # ! ----
 # Cache dictionary to store zip content and timestamps
 cache = {}
 
-def process_zip_and_combine_metrics(zip_url, max_folders=5):
+def process_zip_and_combine_metrics(zip_url, max_folders=5, session=None):
     """
     Downloads zip, caches it for 1 hour, lists folders, finds and combines Key Metrics.csv files
 
     Args:
         zip_url (str): URL of the zip file
         max_folders (int): Maximum number of folders to process (default 5)
+        session (requests.Session): Optional session to reuse pooled connections
 
     Returns:
         pd.DataFrame: Combined DataFrame of all Key Metrics.csv files
@@ -144,7 +151,7 @@ def process_zip_and_combine_metrics(zip_url, max_folders=5):
     if content is None:
         print("\n2. Downloading zip file...")
         try:
-            response = requests.get(zip_url, stream=True)
+            response = (session or requests).get(zip_url, stream=True)
             response.raise_for_status()
 
             total_size = int(response.headers.get('content-length', 0))
@@ -176,26 +183,8 @@ def process_zip_and_combine_metrics(zip_url, max_folders=5):
 
             # Step 4: Find and combine Key Metrics files
             print("\n4. Processing Key Metrics files...")
-            combined_df = pd.DataFrame()
-
-            for folder in folders:
-                metrics_file = next(
-                    (f for f in z.filelist
-                     if os.path.dirname(f.filename) == folder and os.path.basename(f.filename) == "Key Metrics.csv"),
-                    None
-                )
-                if metrics_file:
-                    print(f"\u2713 Found Key Metrics.csv in {folder}")
-                    try:
-                        with z.open(metrics_file.filename) as f:
-                            df = pd.read_csv(f)
-                            df['source_folder'] = folder
-                            combined_df = pd.concat([combined_df, df], ignore_index=True, sort=False)
-                            print(f"  Added {len(df)} rows from {folder}")
-                    except Exception as e:
-                        print(f"  \u2717 Error reading file from {folder}: {e}")
-                else:
-                    print(f"- No Key Metrics.csv found in {folder}")
+            frames = list(iter_key_metrics(z, folders))
+            combined_df = pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
 
             # Step 5: Return combined results
             if not combined_df.empty:
@@ -212,5 +201,88 @@ def process_zip_and_combine_metrics(zip_url, max_folders=5):
 
 
 
+# Function: Iterate Key Metrics ----
+def iter_key_metrics(z, folders):
+    """
+    Generator yielding the Key Metrics.csv of each folder in an open zip as a DataFrame.
+
+    Args:
+        z (zipfile.ZipFile): Open zip archive
+        folders (list): Folder names to read
+
+    Yields:
+        pd.DataFrame: One folder's Key Metrics rows with a source_folder column
+    """
+    metrics_files = {
+        os.path.dirname(f.filename): f for f in z.filelist if os.path.basename(f.filename) == "Key Metrics.csv"
+    }
+    for folder in folders:
+        metrics_file = metrics_files.get(folder)
+        if metrics_file:
+            print(f"\u2713 Found Key Metrics.csv in {folder}")
+            try:
+                with z.open(metrics_file.filename) as f:
+                    df = pd.read_csv(f)
+                df['source_folder'] = folder
+                print(f"  Added {len(df)} rows from {folder}")
+                yield df
+            except Exception as e:
+                print(f"  \u2717 Error reading file from {folder}: {e}")
+        else:
+            print(f"- No Key Metrics.csv found in {folder}")
+
+
+# Function: Stream Key Metrics ----
+def stream_zip_metrics(zip_url, file_name, max_folders=5, session=None, maxsize=2):
+    """
+    Downloads the zip to a temporary file and writes each folder's Key Metrics.csv
+    to a Parquet file as it is read, instead of combining everything in memory
+
+    The zip's directory is at its end, so the download itself can't overlap
+    with reading; memory stays at one download chunk plus a few folders.
+
+    Args:
+        zip_url (str): URL of the zip file
+        file_name (str): Output Parquet file
+        max_folders (int): Maximum number of folders to process (default 5)
+        session (requests.Session): Optional session to reuse pooled connections
+        maxsize (int): Folders buffered between reading and writing
+
+    Returns:
+        dict: Output path, rows written and stream counters
+    """
+    response = (session or requests).get(zip_url, stream=True)
+    response.raise_for_status()
+
+    with tempfile.TemporaryFile() as content:
+        for chunk in response.iter_content(chunk_size=1024 * 1024):
+            content.write(chunk)
+        content.seek(0)
+
+        with zipfile.ZipFile(content, "r") as z:
+            folders = sorted(
+                {os.path.dirname(f.filename) for f in z.filelist if os.path.dirname(f.filename)}
+            )[:max_folders]
+
+            # Folders can differ in columns; write every frame with the union of headers
+            columns = []
+            for f in z.filelist:
+                if os.path.dirname(f.filename) in folders and os.path.basename(f.filename) == "Key Metrics.csv":
+                    with z.open(f.filename) as header:
+                        columns += [c for c in pd.read_csv(header, nrows=0).columns if c not in columns]
+            columns.append("source_folder")
+
+            def align(df):
+                # Nullable integers, so a folder with gaps or a missing column keeps the file's int type
+                ints = df.select_dtypes("integer").columns
+                return df.astype({column: "Int64" for column in ints}).reindex(columns=columns)
+
+            with ParquetBatchWriter(file_name, row_group_size=100_000) as writer:
+                stats = run_stream(iter_key_metrics(z, folders), [align], writer.write, maxsize=maxsize)
+
+    return {"path": file_name, "rows": writer.rows, **stats}
+
 
-df = process_zip_and_combine_metrics(zip_url, max_folders=5)
+if __name__ == "__main__":
+    zip_url = get_resource_metadata()[0]["result"]["url"]
+    df = process_zip_and_combine_metrics(zip_url, max_folders=5)
@@ -0,0 +1,383 @@
+# Libraries ----
+import json
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utilities.pipeline_runner import PipelineRunner, write_prometheus
+from src.utilities.weather_backfill import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class Upstream:
+    """
+    Placeholder for another task's result in a task's arguments.
+
+    Using one also makes the task depend on the named task.
+    """
+
+    def __init__(self, task: str, select: Optional[Callable[[Any], Any]] = None):
+        """
+        Args:
+            task (str): Name of the task whose result is passed in
+            select (callable): Optional function applied to the result first
+        """
+        self.task = task
+        self.select = select
+
+
+class RateLimitedSession(requests.Session):
+    """Session that waits on a source's rate limiter before every request."""
+
+    def __init__(self, limiter: Optional[RateLimiter] = None):
+        super().__init__()
+        self.limiter = limiter
+
+    def send(self, request, **kwargs):
+        if self.limiter is not None:
+            self.limiter.wait()
+        return super().send(request, **kwargs)
+
+
+class Source:
+    """An upstream system: its concurrency slots, rate limit and HTTP session."""
+
+    def __init__(self, name: str, adapter: HTTPAdapter, max_concurrency: int = 1, calls_per_minute: Optional[float] = None):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.calls_per_minute = calls_per_minute
+        self.session = RateLimitedSession(RateLimiter(calls_per_minute) if calls_per_minute else None)
+        # One adapter (and so one connection pool per host) shared by every source
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.runner: Optional[PipelineRunner] = None
+        self.running = 0
+
+
+class Task:
+    """One stage of a source, with the tasks it waits for."""
+
+    def __init__(
+        self,
+        name: str,
+        source: str,
+        func: Callable,
+        args: Tuple = (),
+        kwargs: Optional[Dict] = None,
+        depends_on: Tuple[str, ...] = (),
+        pass_session: bool = False
+    ):
+        self.name = name
+        self.source = source
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.pass_session = pass_session
+        upstream = [a.task for a in list(args) + list(self.kwargs.values()) if isinstance(a, Upstream)]
+        self.depends_on = tuple(dict.fromkeys(list(depends_on) + upstream))
+        self.status = "pending"
+        self.error = None
+        self.result = None
+        self.started = None
+        self.finished = None
+
+
+class Orchestrator:
+    """
+    Run the stages of several pipelines concurrently on one worker pool.
+
+    Tasks declare the tasks they depend on (explicitly or by taking an
+    `Upstream` result) and start as soon as those have finished, so
+    independent sources overlap and total wall time approaches the slowest
+    dependency chain instead of the sum of all stages. Each source has a
+    cap on tasks in flight and an optional request rate limit; all sources
+    share one pooled HTTP adapter. Every task runs as a `PipelineRunner`
+    stage of its source's runner, and `run` returns a consolidated report.
+    """
+
+    def __init__(
+        self,
+        name: str = "all_sources",
+        max_workers: int = 8,
+        pool_maxsize: int = 16,
+        metrics_path: Optional[str] = None,
+        prometheus_path: Optional[str] = None,
+        report_path: Optional[str] = None,
+        checkpoint_path: Optional[str] = None,
+        verbose: bool = True
+    ):
+        """
+        Initialize the orchestrator.
+
+        Args:
+            name (str): Run name used in the report
+            max_workers (int): Worker threads shared by all sources
+            pool_maxsize (int): Connections kept per host in the shared HTTP pool
+            metrics_path (str): Optional JSON lines file for stage records
+            prometheus_path (str): Optional Prometheus textfile with every source's stages
+            report_path (str): Optional JSON file for the run report
+            checkpoint_path (str): Stage checkpoint file passed to each source's runner
+            verbose (bool): Print stage and report lines (default: True)
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.metrics_path = metrics_path
+        self.prometheus_path = prometheus_path
+        self.report_path = report_path
+        self.checkpoint_path = checkpoint_path
+        self.verbose = verbose
+        self.adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.sources: Dict[str, Source] = {}
+        self.tasks: Dict[str, Task] = {}
+
+    def add_source(self, name: str, max_concurrency: int = 1, calls_per_minute: Optional[float] = None) -> Source:
+        """
+        Register a source.
+
+        Args:
+            name (str): Source name (also the pipeline name of its stage records)
+            max_concurrency (int): Tasks of this source allowed to run at once
+            calls_per_minute (float): Optional request rate limit over the source's session
+
+        Returns:
+            Source: The registered source
+        """
+        source = Source(name, self.adapter, max_concurrency=max_concurrency, calls_per_minute=calls_per_minute)
+        self.sources[name] = source
+        return source
+
+    def add_task(
+        self,
+        name: str,
+        source: str,
+        func: Callable,
+        *args,
+        depends_on: Tuple[str, ...] = (),
+        pass_session: bool = False,
+        **kwargs
+    ) -> Task:
+        """
+        Register a task.
+
+        Arguments that are `Upstream` placeholders are replaced by that
+        task's result. Other keyword arguments (including `memo_key` and
+        `memo_inputs`) go to `PipelineRunner.run_stage`. A memoized task
+        returns None when it is skipped, so other tasks may only wait for
+        it (`depends_on`), not take its result.
+
+        Args:
+            name (str): Task name, unique across sources
+            source (str): Name of a registered source
+            func (callable): Stage function
+            depends_on (tuple): Names of tasks that must succeed first
+            pass_session (bool): Call `func` with `session=` the source's rate-limited session
+
+        Returns:
+            Task: The registered task
+        """
+        if source not in self.sources:
+            raise ValueError(f"Unknown source: {source}")
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        task = Task(name, source, func, args, kwargs, depends_on=depends_on, pass_session=pass_session)
+        self.tasks[name] = task
+        return task
+
+    def _check_graph(self) -> None:
+        """Reject unknown dependencies, results taken from memoized tasks and cycles."""
+        for task in self.tasks.values():
+            for dependency in task.depends_on:
+                if dependency not in self.tasks:
+                    raise ValueError(f"Task {task.name} depends on unknown task {dependency}")
+
+        # A skipped memoized stage returns None, so nothing may consume its result
+        memoized = {
+            name for name, task in self.tasks.items()
+            if task.kwargs.get("memo_key") is not None or task.kwargs.get("memo_inputs")
+        }
+        for task in self.tasks.values():
+            for value in list(task.args) + list(task.kwargs.values()):
+                if isinstance(value, Upstream) and value.task in memoized:
+                    raise ValueError(
+                        f"Task {task.name} takes the result of memoized task {value.task}, "
+                        f"which is None when that task is skipped; use depends_on instead"
+                    )
+
+        state: Dict[str, int] = {}
+
+        def visit(name: str, path: List[str]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = 1
+            for dependency in self.tasks[name].depends_on:
+                visit(dependency, path + [name])
+            state[name] = 2
+
+        for name in self.tasks:
+            visit(name, [])
+
+    def _resolve(self, value: Any) -> Any:
+        if isinstance(value, Upstream):
+            result = self.tasks[value.task].result
+            return value.select(result) if value.select is not None else result
+        return value
+
+    def _run_task(self, task: Task) -> Any:
+        source = self.sources[task.source]
+        args = [self._resolve(a) for a in task.args]
+        kwargs = {key: self._resolve(value) for key, value in task.kwargs.items()}
+        if task.pass_session:
+            kwargs["session"] = source.session
+        task.started = time.perf_counter()
+        try:
+            return source.runner.run_stage(task.name, task.func, *args, **kwargs)
+        finally:
+            task.finished = time.perf_counter()
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every task, respecting dependencies and per-source limits.
+
+        A failed task marks the tasks depending on it (directly or not) as
+        "upstream_failed"; unrelated tasks keep running.
+
+        Returns:
+            dict: Consolidated run report
+        """
+        self._check_graph()
+        for source in self.sources.values():
+            # Memory tracing is process-wide, so per-stage peaks are meaningless when stages overlap
+            source.runner = PipelineRunner(
+                source.name,
+                metrics_path=self.metrics_path,
+                track_memory=False,
+                verbose=self.verbose,
+                checkpoint_path=self.checkpoint_path
+            )
+
+        started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        run_start = time.perf_counter()
+        pending = dict(self.tasks)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="orchestrator") as executor:
+            while pending or running:
+                # Settle tasks whose dependencies failed
+                changed = True
+                while changed:
+                    changed = False
+                    for name, task in list(pending.items()):
+                        if any(self.tasks[d].status in ("failed", "upstream_failed") for d in task.depends_on):
+                            task.status = "upstream_failed"
+                            del pending[name]
+                            changed = True
+
+                # Submit ready tasks while their source has free slots
+                for name, task in list(pending.items()):
+                    source = self.sources[task.source]
+                    if source.running >= source.max_concurrency:
+                        continue
+                    if all(self.tasks[d].status == "ok" for d in task.depends_on):
+                        del pending[name]
+                        task.status = "running"
+                        source.running += 1
+                        running[executor.submit(self._run_task, task)] = task
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    self.sources[task.source].running -= 1
+                    try:
+                        task.result = future.result()
+                        task.status = "ok"
+                    except Exception as e:
+                        task.status = "failed"
+                        task.error = f"{type(e).__name__}: {e}"
+                        logger.error("Task %s/%s failed: %s", task.source, task.name, task.error)
+
+        wall_seconds = time.perf_counter() - run_start
+        for source in self.sources.values():
+            source.session.close()
+
+        report = self._report(started_at, run_start, wall_seconds)
+        if self.prometheus_path:
+            write_prometheus(report["stages"], self.prometheus_path)
+        if self.report_path:
+            path = Path(self.report_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2, default=str))
+        if self.verbose:
+            self._print_report(report)
+        return report
+
+    # Report ----
+    def _report(self, started_at: str, run_start: float, wall_seconds: float) -> Dict[str, Any]:
+        stages = [record for source in self.sources.values() for record in source.runner.finish()]
+        by_stage = {record["stage"]: record for record in stages}
+
+        tasks = []
+        for task in self.tasks.values():
+            record = by_stage.get(task.name, {})
+            tasks.append({
+                "task": task.name,
+                "source": task.source,
+                "status": "skipped" if record.get("status") == "skipped" else task.status,
+                "depends_on": list(task.depends_on),
+                "start_offset_seconds": round(task.started - run_start, 6) if task.started else None,
+                "wall_seconds": round(task.finished - task.started, 6) if task.started else None,
+                "error": task.error,
+            })
+
+        sources = {}
+        for source in self.sources.values():
+            source_stages = [record for record in stages if record["pipeline"] == source.name]
+            sources[source.name] = {
+                "tasks": len(source_stages),
+                "failed": sum(record["status"] == "failed" for record in source_stages),
+                "stage_seconds": round(sum(record["wall_seconds"] for record in source_stages), 6),
+                "http_requests": sum(record["http_requests"] for record in source_stages),
+                "http_errors": sum(record["http_errors"] for record in source_stages),
+                "http_bytes": sum(record["http_bytes"] for record in source_stages),
+                "max_concurrency": source.max_concurrency,
+                "calls_per_minute": source.calls_per_minute,
+            }
+
+        stage_seconds = sum(record["wall_seconds"] for record in stages)
+        return {
+            "name": self.name,
+            "started_at": started_at,
+            "wall_seconds": round(wall_seconds, 6),
+            "stage_seconds": round(stage_seconds, 6),
+            "overlap": round(stage_seconds / wall_seconds, 3) if wall_seconds else None,
+            "succeeded": all(task.status == "ok" for task in self.tasks.values()),
+            "sources": sources,
+            "tasks": tasks,
+            "stages": stages,
+        }
+
+    def _print_report(self, report: Dict[str, Any]) -> None:
+        print("\n=== Run Report ===")
+        for name, source in report["sources"].items():
+            print(
+                f"{name}: {source['tasks']} stages, {source['failed']} failed, "
+                f"{source['stage_seconds']:.2f} seconds, {source['http_requests']} HTTP requests"
+            )
+        for task in report["tasks"]:
+            if task["status"] not in ("ok", "skipped"):
+                print(f"  {task['source']}/{task['task']}: {task['status']} {task['error'] or ''}")
+        print(
+            f"Finished in {report['wall_seconds']:.2f} seconds "
+            f"({report['stage_seconds']:.2f} seconds of stages, {report['overlap']}x overlap)"
+        )
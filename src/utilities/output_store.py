@@ -0,0 +1,352 @@
+# Libraries ----
+import hashlib
+import json
+import os
+import re
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utilities.file_lock import file_lock
+
+# Text files are cut where a line's CRC hits the mask, so chunk boundaries
+# depend on content and appending rows leaves earlier chunks unchanged
+CHUNK_BOUNDARY_MASK = 0xFF
+MAX_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Stage outputs each pipeline writes to data/. Weather snapshots are not
+# stored: they are the input of the combine, rollup and change feed stages,
+# which read every snapshot, and they are already versioned in git.
+PIPELINE_OUTPUT_PATTERNS = {
+    "youtube": ("video_ids_*.parquet", "video_transcripts*.parquet", "video_transcript_segments*.parquet"),
+    "toronto_web_analytics": ("web_analytics_key_metrics_*.parquet",),
+    "toronto_shelter": ("shelter_occupancy_*.parquet",),
+}
+
+TIMESTAMP_PATTERN = re.compile(r"_?\d{4}-\d{2}-\d{2}_\d{2}\.\d{2}\.\d{2}.*$")
+
+
+# Function: Logical Output Name ----
+def get_output_name(path: Union[str, Path]) -> str:
+    """
+    Name an output by its file name without the run timestamp,
+    e.g. "video_transcripts2025-01-02_10.00.00.parquet" -> "video_transcripts.parquet".
+    """
+    path = Path(path)
+    return TIMESTAMP_PATTERN.sub("", path.stem) + path.suffix
+
+
+class OutputStore:
+    """
+    Content-addressed store for pipeline stage outputs.
+
+    Files are split into chunks (Parquet row groups, or content-defined
+    line chunks for text files) stored once under their SHA-256 in
+    `objects/`. A file manifest lists its chunks and each run keeps only a
+    small pointer file mapping output names to file hashes, so a run whose
+    outputs match an earlier one adds almost nothing. `gc` drops run
+    pointers outside the retention policy and deletes chunks no remaining
+    run references. `commit_run` and `gc` hold a lock on the store root,
+    so a collection never deletes chunks a concurrent commit still needs.
+    """
+
+    def __init__(self, root: Union[str, Path] = "data/store/"):
+        """
+        Initialize the store.
+
+        Args:
+            root (str): Store directory (objects/, files/ and runs/ are created inside)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.files_dir = self.root / "files"
+        self.runs_dir = self.root / "runs"
+        for directory in (self.objects_dir, self.files_dir, self.runs_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+        self.lock_path = self.root / ".store.lock"
+
+    # Objects ----
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _put_object(self, data: bytes, stats: Dict[str, int]) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if path.exists():
+            stats["chunks_reused"] += 1
+        else:
+            self._write_atomic(path, zlib.compress(data, 3))
+            stats["chunks_written"] += 1
+            stats["bytes_written"] += len(data)
+        return digest
+
+    def _get_object(self, digest: str) -> bytes:
+        with open(self._object_path(digest), "rb") as f:
+            return zlib.decompress(f.read())
+
+    # Chunking ----
+    @staticmethod
+    def _text_chunks(path: Path) -> Iterable[bytes]:
+        chunk = []
+        size = 0
+        with open(path, "rb") as f:
+            for line in f:
+                chunk.append(line)
+                size += len(line)
+                if (zlib.crc32(line) & CHUNK_BOUNDARY_MASK) == 0 or size >= MAX_CHUNK_BYTES:
+                    yield b"".join(chunk)
+                    chunk, size = [], 0
+        if chunk:
+            yield b"".join(chunk)
+
+    @staticmethod
+    def _parquet_chunks(path: Path) -> Iterable[bytes]:
+        parquet_file = pq.ParquetFile(path)
+        for i in range(parquet_file.num_row_groups):
+            sink = pa.BufferOutputStream()
+            pq.write_table(parquet_file.read_row_group(i), sink)
+            yield sink.getvalue().to_pybytes()
+
+    # Files ----
+    def put(self, path: Union[str, Path], stats: Optional[Dict[str, int]] = None) -> str:
+        """
+        Store a file (if its content is new) and return its content hash.
+
+        Args:
+            path (str): File to store
+            stats (dict): Optional counters updated in place
+
+        Returns:
+            str: SHA-256 of the file
+        """
+        path = Path(path)
+        stats = stats if stats is not None else {"chunks_written": 0, "chunks_reused": 0, "bytes_written": 0}
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(block)
+        file_hash = sha.hexdigest()
+
+        manifest_path = self.files_dir / f"{file_hash}.json"
+        if manifest_path.exists():
+            return file_hash
+
+        kind = "parquet" if path.suffix == ".parquet" else "text"
+        chunks = self._parquet_chunks(path) if kind == "parquet" else self._text_chunks(path)
+        manifest = {
+            "kind": kind,
+            "size": path.stat().st_size,
+            "chunks": [self._put_object(chunk, stats) for chunk in chunks],
+        }
+        self._write_atomic(manifest_path, json.dumps(manifest).encode())
+        return file_hash
+
+    def restore(self, file_hash: str, destination: Union[str, Path]) -> Path:
+        """
+        Rebuild a stored file. Text files come back byte-identical; Parquet
+        files come back with the same rows and row groups.
+
+        Args:
+            file_hash (str): Hash returned by `put` (or found in a run pointer)
+            destination (str): Output path
+
+        Returns:
+            Path: The written file
+        """
+        destination = Path(destination)
+        with open(self.files_dir / f"{file_hash}.json") as f:
+            manifest = json.load(f)
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if manifest["kind"] == "parquet":
+            tables = [pq.read_table(pa.BufferReader(self._get_object(digest))) for digest in manifest["chunks"]]
+            writer = None
+            for table in tables:
+                writer = writer or pq.ParquetWriter(destination, table.schema)
+                writer.write_table(table)
+            if writer is not None:
+                writer.close()
+        else:
+            with open(destination, "wb") as f:
+                for digest in manifest["chunks"]:
+                    f.write(self._get_object(digest))
+        return destination
+
+    # Runs ----
+    def commit_run(self, run_id: str, paths: List[Union[str, Path]], pipeline: str = "") -> Dict:
+        """
+        Store a run's output files and write its pointer file.
+
+        Args:
+            run_id (str): Run identifier (e.g. PipelineRunner.run_id)
+            paths (list): Output files of the run
+            pipeline (str): Pipeline name recorded with the run
+
+        Returns:
+            dict: The run pointer plus chunk counters
+        """
+        stats = {"chunks_written": 0, "chunks_reused": 0, "bytes_written": 0}
+        outputs = {}
+        # Chunks reused by `put` are only safe from `gc` once the run pointer exists
+        with file_lock(self.lock_path):
+            for path in paths:
+                outputs[get_output_name(path)] = {"file": self.put(path, stats), "path": str(path)}
+
+            run = {
+                "run_id": run_id,
+                "pipeline": pipeline,
+                "created_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "outputs": outputs,
+            }
+            self._write_atomic(self.runs_dir / f"{run_id}.json", json.dumps(run, indent=2).encode())
+        return dict(run, **stats)
+
+    def list_runs(self) -> List[Dict]:
+        """All run pointers, oldest first."""
+        runs = []
+        for path in self.runs_dir.glob("*.json"):
+            with open(path) as f:
+                runs.append(json.load(f))
+        return sorted(runs, key=lambda run: (run["created_at"], run["run_id"]))
+
+    def restore_run(self, run_id: str, destination_dir: Union[str, Path]) -> List[Path]:
+        """Restore every output of a run into `destination_dir` under its original file name."""
+        with open(self.runs_dir / f"{run_id}.json") as f:
+            run = json.load(f)
+        return [
+            self.restore(output["file"], Path(destination_dir) / Path(output["path"]).name)
+            for output in run["outputs"].values()
+        ]
+
+    # Garbage Collection ----
+    def gc(self, keep_last: int = 30, keep_days: Optional[float] = None) -> Dict[str, int]:
+        """
+        Apply the retention policy and delete unreferenced data.
+
+        A run is kept if it is one of the `keep_last` newest runs of its
+        pipeline or, when `keep_days` is set, younger than that. File
+        manifests and chunks not reachable from a kept run are deleted.
+
+        Args:
+            keep_last (int): Newest runs to keep per pipeline
+            keep_days (float): Also keep runs created within this many days
+
+        Returns:
+            dict: Counts of deleted runs, files and chunks
+        """
+        with file_lock(self.lock_path):
+            runs = self.list_runs()
+            cutoff = (
+                (datetime.now() - timedelta(days=keep_days)).strftime('%Y-%m-%d %H:%M:%S')
+                if keep_days is not None else None
+            )
+            by_pipeline: Dict[str, List[Dict]] = {}
+            for run in runs:
+                by_pipeline.setdefault(run.get("pipeline", ""), []).append(run)
+
+            kept, deleted_runs = [], 0
+            for pipeline_runs in by_pipeline.values():
+                newest = {run["run_id"] for run in pipeline_runs[-keep_last:]} if keep_last > 0 else set()
+                for run in pipeline_runs:
+                    if run["run_id"] in newest or (cutoff is not None and run["created_at"] >= cutoff):
+                        kept.append(run)
+                    else:
+                        (self.runs_dir / f"{run['run_id']}.json").unlink(missing_ok=True)
+                        deleted_runs += 1
+
+            # Mark
+            live_files = {output["file"] for run in kept for output in run["outputs"].values()}
+            live_chunks = set()
+            for file_hash in live_files:
+                with open(self.files_dir / f"{file_hash}.json") as f:
+                    live_chunks.update(json.load(f)["chunks"])
+
+            # Sweep
+            deleted_files = deleted_chunks = 0
+            for path in self.files_dir.glob("*.json"):
+                if path.stem not in live_files:
+                    path.unlink()
+                    deleted_files += 1
+            for path in self.objects_dir.glob("*/*"):
+                if path.name.startswith("."):
+                    continue
+                if path.parent.name + path.name not in live_chunks:
+                    path.unlink()
+                    deleted_chunks += 1
+
+        return {"runs": deleted_runs, "files": deleted_files, "chunks": deleted_chunks}
+
+
+# Function: Store Run Outputs ----
+def store_run_outputs(
+    run_id: str,
+    pipeline: str,
+    data_path: str = "data/",
+    patterns: Optional[Iterable[str]] = None,
+    since: Optional[float] = None,
+    store_path: str = "data/store/",
+    keep_last: int = 30,
+    prune: bool = True
+) -> Dict:
+    """
+    Store the files a run wrote to `data_path`, then apply retention.
+
+    Only the pipeline's own stage outputs are matched (see
+    PIPELINE_OUTPUT_PATTERNS), so other pipelines' files in a shared
+    `data_path` are never stored under, or pruned by, this run. With
+    `prune` (the default), older copies of each output that are already in
+    the store are deleted, so the store holds the history and `data_path`
+    only the newest file per output name, for code that reads "the most
+    recent file". Older outputs come back with `OutputStore.restore_run`.
+
+    Args:
+        run_id (str): Run identifier
+        pipeline (str): Pipeline name
+        data_path (str): Directory the stages write to
+        patterns (list): File globs of stage outputs (default: the pipeline's entry in PIPELINE_OUTPUT_PATTERNS)
+        since (float): Only files modified at or after this epoch time (default: all)
+        store_path (str): Store directory
+        keep_last (int): Runs kept per pipeline by `gc`
+        prune (bool): Delete superseded local copies already in the store (default: True)
+
+    Returns:
+        dict: Run pointer with chunk counters and gc counts
+    """
+    if patterns is None:
+        if pipeline not in PIPELINE_OUTPUT_PATTERNS:
+            raise ValueError(f"No output patterns known for pipeline {pipeline!r}; pass `patterns`")
+        patterns = PIPELINE_OUTPUT_PATTERNS[pipeline]
+
+    store = OutputStore(store_path)
+    files = sorted(
+        {f for pattern in patterns for f in Path(data_path).glob(pattern) if f.is_file()},
+        key=lambda f: f.stat().st_mtime
+    )
+    new_files = [f for f in files if since is None or f.stat().st_mtime >= since]
+    result = store.commit_run(run_id, new_files, pipeline=pipeline)
+
+    if prune:
+        stored = {
+            Path(output["path"]).resolve()
+            for run in store.list_runs() for output in run["outputs"].values()
+        }
+        newest = {}
+        for f in files:
+            newest[get_output_name(f)] = f
+        for f in files:
+            if f != newest[get_output_name(f)] and f.resolve() in stored:
+                f.unlink()
+
+    result["gc"] = store.gc(keep_last=keep_last)
+    return result
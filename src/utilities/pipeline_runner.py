@@ -0,0 +1,417 @@
+# Libraries ----
+import contextvars
+import cProfile
+import json
+import os
+import socket
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from src.utilities.checkpoints import StageCheckpoints, stage_fingerprint
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Stage that HTTP calls are currently attributed to ----
+# A stage is recorded in a context variable, so concurrent stages (e.g. under
+# the orchestrator) each count their own requests, as do worker threads that
+# run in a copy of the stage's context (see streaming.run_stream). A request
+# from a thread without a stage in its context is attributed only when
+# exactly one stage is running; under concurrency its owner is ambiguous and
+# it is not counted.
+_current_stage: contextvars.ContextVar = contextvars.ContextVar("pipeline_stage", default=None)
+_running_stages: List["StageMetrics"] = []
+_active_lock = threading.Lock()
+_original_send = None
+
+
+def _stage_for_request() -> Optional["StageMetrics"]:
+    stage = _current_stage.get()
+    if stage is None:
+        with _active_lock:
+            stage = _running_stages[0] if len(_running_stages) == 1 else None
+    return stage
+
+
+def _instrumented_send(self, request, **kwargs):
+    """Wrapper around requests.Session.send that records latency and bytes."""
+    start = time.perf_counter()
+    error = None
+    response = None
+    try:
+        response = _original_send(self, request, **kwargs)
+        return response
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        latency = time.perf_counter() - start
+        stage = _stage_for_request()
+        if stage is not None:
+            size = 0
+            if response is not None:
+                size = int(response.headers.get("content-length", 0) or 0)
+                if not size and not kwargs.get("stream"):
+                    size = len(response.content or b"")
+            stage.record_http(latency, size, error is not None or (response is not None and response.status_code >= 400))
+
+
+def _install_http_hook() -> None:
+    """Patch requests once so every Session (and requests.get) is measured."""
+    global _original_send
+    with _active_lock:
+        if _original_send is None:
+            _original_send = requests.Session.send
+            requests.Session.send = _instrumented_send
+
+
+class StageMetrics:
+    """Metrics collected for one pipeline stage."""
+
+    def __init__(self, pipeline: str, name: str):
+        self.pipeline = pipeline
+        self.name = name
+        self.status = "running"
+        self.error = None
+        self.started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.python_peak_mb = None
+        self.rss_peak_mb = None
+        self.rows = None
+        self.http_requests = 0
+        self.http_errors = 0
+        self.http_bytes = 0
+        self.http_latencies: List[float] = []
+        self.profile_path = None
+        self._lock = threading.Lock()
+
+    def record_http(self, latency: float, size: int, failed: bool) -> None:
+        with self._lock:
+            self.http_requests += 1
+            self.http_bytes += size
+            self.http_latencies.append(latency)
+            if failed:
+                self.http_errors += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.http_latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(round(p * (len(latencies) - 1))))]
+
+        return {
+            "pipeline": self.pipeline,
+            "stage": self.name,
+            "status": self.status,
+            "error": self.error,
+            "started_at": self.started_at,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "python_peak_mb": self.python_peak_mb,
+            "rss_peak_mb": self.rss_peak_mb,
+            "rows": self.rows,
+            "http_requests": self.http_requests,
+            "http_errors": self.http_errors,
+            "http_bytes": self.http_bytes,
+            "http_latency_total": round(sum(latencies), 6),
+            "http_latency_p50": percentile(0.5),
+            "http_latency_p95": percentile(0.95),
+            "http_latency_max": latencies[-1] if latencies else None,
+            "profile_path": self.profile_path,
+        }
+
+
+class PipelineRunner:
+    """
+    Run pipeline steps as named stages and record what each one cost.
+
+    For every stage the runner records wall and CPU time, process RSS peak
+    (plus the tracemalloc peak with `track_memory`), rows produced and the
+    count, bytes and latency of HTTP requests made through `requests`.
+    Results are optionally appended as JSON lines to `metrics_path` and
+    written as a Prometheus textfile; keep both under the ignored
+    `metrics/` directory so scheduled runs don't commit them. Setting `profile` (or the PIPELINE_PROFILE environment
+    variable) to "cprofile" or "pyinstrument" writes a profile per stage.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        metrics_path: Optional[str] = None,
+        prometheus_path: Optional[str] = None,
+        profile: Optional[str] = None,
+        profile_dir: str = "profiles",
+        track_memory: bool = False,
+        verbose: bool = True,
+        checkpoint_path: Optional[str] = None
+    ):
+        """
+        Initialize the pipeline runner.
+
+        Args:
+            name (str): Pipeline name used in every record
+            metrics_path (str): Optional JSON lines file to append stage records to (e.g. under metrics/)
+            prometheus_path (str): Optional Prometheus textfile collector output path
+            profile (str): "cprofile" or "pyinstrument" to profile each stage (default: PIPELINE_PROFILE env var)
+            profile_dir (str): Directory for profile output
+            track_memory (bool): Trace Python allocations with tracemalloc (default: False; adds overhead)
+            verbose (bool): Print a line per finished stage (default: True)
+            checkpoint_path (str): JSON file of completed stage fingerprints; enables
+                skipping memoized stages in `run_stage` (None to disable)
+        """
+        self.name = name
+        self.metrics_path = metrics_path
+        self.prometheus_path = prometheus_path
+        self.profile = profile or os.getenv("PIPELINE_PROFILE") or None
+        self.profile_dir = Path(profile_dir)
+        self.track_memory = track_memory
+        self.verbose = verbose
+        self.run_id = f"{datetime.now().strftime('%Y-%m-%d_%H.%M.%S')}_{socket.gethostname()}_{os.getpid()}"
+        self.stages: List[StageMetrics] = []
+        self.checkpoints = StageCheckpoints(checkpoint_path) if checkpoint_path else None
+
+        if self.profile not in (None, "cprofile", "pyinstrument"):
+            raise ValueError(f"Unsupported profiler: {self.profile}")
+
+        _install_http_hook()
+
+        if self.verbose:
+            print(f"Starting {self.name} pipeline at ", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            print("----------------------------------------------")
+
+    @contextmanager
+    def stage(self, name: str, profile: Optional[bool] = None):
+        """
+        Measure the code inside a `with` block as one stage.
+
+        Set `.rows` on the yielded StageMetrics to record rows produced.
+
+        Args:
+            name (str): Stage name
+            profile (bool): Override whether this stage is profiled
+        """
+        metrics = StageMetrics(self.name, name)
+        self.stages.append(metrics)
+
+        started_tracing = False
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+
+        profiler = self._start_profiler() if (profile if profile is not None else self.profile) else None
+
+        token = _current_stage.set(metrics)
+        with _active_lock:
+            _running_stages.append(metrics)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield metrics
+            metrics.status = "ok"
+        except Exception as e:
+            metrics.status = "failed"
+            metrics.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            metrics.wall_seconds = time.perf_counter() - wall_start
+            metrics.cpu_seconds = time.process_time() - cpu_start
+
+            _current_stage.reset(token)
+            with _active_lock:
+                _running_stages.remove(metrics)
+
+            if profiler is not None:
+                metrics.profile_path = self._stop_profiler(profiler, name)
+
+            if self.track_memory:
+                metrics.python_peak_mb = round(tracemalloc.get_traced_memory()[1] / 1024 ** 2, 3)
+                if started_tracing:
+                    tracemalloc.stop()
+            metrics.rss_peak_mb = _rss_peak_mb()
+
+            self._write_record(metrics)
+            if self.verbose:
+                self._print_stage(metrics)
+
+    def run_stage(
+        self,
+        name: str,
+        func: Callable,
+        *args,
+        memo_key: Any = None,
+        memo_inputs: Optional[List[str]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run `func(*args, **kwargs)` as a stage and return its result.
+
+        Rows are recorded automatically when the result has a length
+        (e.g. a DataFrame or list).
+
+        With a checkpoint file configured and `memo_key` or `memo_inputs`
+        given, the stage is fingerprinted on its function, arguments,
+        `memo_key` and the content of `memo_inputs`; if the last successful
+        run had the same fingerprint the stage is skipped and None is returned.
+
+        Args:
+            name (str): Stage name
+            func (callable): Stage function
+            memo_key: Extra JSON-serializable fingerprint part (e.g. the date)
+            memo_inputs (list): Input files or glob patterns (newest match) the stage reads
+        """
+        fingerprint = None
+        if self.checkpoints is not None and (memo_key is not None or memo_inputs):
+            fingerprint = stage_fingerprint(func, args, kwargs, key=memo_key, inputs=memo_inputs or ())
+            if self.checkpoints.is_complete(self.name, name, fingerprint):
+                self._skip_stage(name)
+                return None
+
+        with self.stage(name) as metrics:
+            result = func(*args, **kwargs)
+            if result is not None and hasattr(result, "__len__"):
+                metrics.rows = len(result)
+
+        if fingerprint is not None:
+            self.checkpoints.mark_complete(self.name, name, fingerprint, self.run_id)
+        return result
+
+    def _skip_stage(self, name: str) -> None:
+        metrics = StageMetrics(self.name, name)
+        metrics.status = "skipped"
+        self.stages.append(metrics)
+        self._write_record(metrics)
+        if self.verbose:
+            self._print_stage(metrics)
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """
+        Write the Prometheus textfile (if configured) and return all stage records.
+
+        Returns:
+            list: One dict per stage
+        """
+        records = [stage.to_dict() for stage in self.stages]
+        if self.prometheus_path:
+            self._write_prometheus(records)
+        if self.verbose:
+            total = sum(record["wall_seconds"] for record in records)
+            print(f"{self.name} pipeline finished {len(records)} stages in {total:.2f} seconds")
+        return records
+
+    # Output ----
+    def _write_record(self, metrics: StageMetrics) -> None:
+        if not self.metrics_path:
+            return
+        record = metrics.to_dict()
+        record["run_id"] = self.run_id
+        path = Path(self.metrics_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def _write_prometheus(self, records: List[Dict[str, Any]]) -> None:
+        write_prometheus(records, self.prometheus_path)
+
+    def _print_stage(self, metrics: StageMetrics) -> None:
+        step = len(self.stages)
+        if metrics.status == "skipped":
+            print(f"\nStep {step}: {metrics.name} Skipped (inputs unchanged since last run)\n")
+            return
+        status = "Done" if metrics.status == "ok" else "Failed"
+        print(f"\nStep {step}: {metrics.name} {status}")
+        details = f"---> {metrics.wall_seconds:.2f} seconds ({metrics.cpu_seconds:.2f} CPU)"
+        if metrics.rows is not None:
+            details += f", {metrics.rows} rows"
+        if metrics.http_requests:
+            details += f", {metrics.http_requests} HTTP requests ({metrics.http_bytes} bytes)"
+        if metrics.python_peak_mb is not None:
+            details += f", peak {metrics.python_peak_mb:.1f} MB"
+        print(details, "\n")
+
+    # Profiling ----
+    def _start_profiler(self):
+        if self.profile == "pyinstrument":
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return profiler
+
+    def _stop_profiler(self, profiler, stage_name: str) -> str:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        base = f"{self.name}_{stage_name}_{self.run_id}"
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            path = self.profile_dir / f"{base}.prof"
+            profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            path = self.profile_dir / f"{base}.html"
+            path.write_text(profiler.output_html())
+        return str(path)
+
+
+# Function: Prometheus Textfile ----
+def write_prometheus(records: List[Dict[str, Any]], path: str) -> None:
+    """Write stage records as gauges in the node_exporter textfile format (atomically)."""
+    metric_fields = {
+        "wall_seconds": "Stage wall clock time in seconds",
+        "cpu_seconds": "Stage CPU time in seconds",
+        "python_peak_mb": "Peak traced Python memory during the stage in MB",
+        "rss_peak_mb": "Process peak resident set size after the stage in MB",
+        "rows": "Rows produced by the stage",
+        "http_requests": "HTTP requests made during the stage",
+        "http_errors": "Failed HTTP requests during the stage",
+        "http_bytes": "HTTP response bytes received during the stage",
+        "http_latency_total": "Total HTTP latency during the stage in seconds",
+    }
+    lines = []
+    for field, help_text in metric_fields.items():
+        metric = f"pipeline_stage_{field}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for record in records:
+            if record[field] is None:
+                continue
+            labels = f'pipeline="{record["pipeline"]}",stage="{record["stage"]}"'
+            lines.append(f"{metric}{{{labels}}} {record[field]}")
+    lines.append("# HELP pipeline_stage_success Whether the stage succeeded")
+    lines.append("# TYPE pipeline_stage_success gauge")
+    for record in records:
+        labels = f'pipeline="{record["pipeline"]}",stage="{record["stage"]}"'
+        lines.append(f"pipeline_stage_success{{{labels}}} {int(record['status'] in ('ok', 'skipped'))}")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+# Function: Peak RSS ----
+def _rss_peak_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    divisor = 1024 ** 2 if os.uname().sysname == "Darwin" else 1024
+    return round(peak / divisor, 3)
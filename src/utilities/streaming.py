@@ -0,0 +1,304 @@
+# Libraries ----
+import contextvars
+import heapq
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+_DONE = object()
+
+
+# Function: Run Stream ----
+def run_stream(
+    source: Iterable,
+    stages: Sequence[Callable[[Any], Any]] = (),
+    sink: Optional[Callable[[Any], None]] = None,
+    maxsize: int = 4
+) -> Dict[str, Any]:
+    """
+    Push items from a producer through transform stages into a sink, each on its own thread.
+
+    Threads are connected by bounded queues: when a downstream stage falls
+    behind, the queue fills and the upstream `put` blocks, so at most
+    `maxsize` batches wait between any two stages however long the source
+    is, and fetching the next batch overlaps with transforming and writing
+    the previous ones. A stage returning None drops the item. The first
+    exception in any thread stops the others and is re-raised here.
+
+    Args:
+        source (iterable): Producer, typically a generator yielding record batches
+        stages (list): Functions applied to each item in order
+        sink (callable): Consumer of the final items; runs on the calling thread
+        maxsize (int): Batches buffered between two stages
+
+    Returns:
+        dict: Items passed through each step and seconds each step spent blocked on a full queue
+    """
+    queues = [queue.Queue(maxsize=maxsize) for _ in range(len(stages) + 1)]
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    names = ["source"] + [getattr(stage, "__name__", f"stage_{i}") for i, stage in enumerate(stages, 1)]
+    stats = {"items": {name: 0 for name in names + ["sink"]}, "blocked_seconds": {name: 0.0 for name in names}}
+
+    def put(name: str, q: queue.Queue, item: Any) -> bool:
+        start = time.perf_counter()
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                stats["blocked_seconds"][name] += time.perf_counter() - start
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(q: queue.Queue) -> Any:
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def produce() -> None:
+        try:
+            for item in source:
+                stats["items"]["source"] += 1
+                if not put("source", queues[0], item):
+                    return
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            put("source", queues[0], _DONE)
+
+    def transform(i: int, stage: Callable) -> None:
+        name = names[i + 1]
+        try:
+            while True:
+                item = get(queues[i])
+                if item is _DONE:
+                    break
+                result = stage(item)
+                stats["items"][name] += 1
+                if result is not None and not put(name, queues[i + 1], result):
+                    return
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            put(name, queues[i + 1], _DONE)
+
+    # Each thread runs in a copy of the caller's context, so e.g. HTTP calls
+    # stay attributed to the calling pipeline stage
+    threads = [
+        threading.Thread(target=contextvars.copy_context().run, args=(produce,), name="stream-source", daemon=True)
+    ]
+    threads += [
+        threading.Thread(
+            target=contextvars.copy_context().run, args=(transform, i, stage), name=f"stream-{names[i + 1]}", daemon=True
+        )
+        for i, stage in enumerate(stages)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = get(queues[-1])
+            if item is _DONE:
+                break
+            if sink is not None:
+                sink(item)
+            stats["items"]["sink"] += 1
+    except BaseException as e:
+        errors.append(e)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+    stats["blocked_seconds"] = {name: round(seconds, 6) for name, seconds in stats["blocked_seconds"].items()}
+    return stats
+
+
+class ParquetBatchWriter:
+    """
+    Append record batches to a Parquet file without holding the whole output.
+
+    Rows are buffered until `row_group_size` and written as a row group, so
+    memory is bounded by one row group. The file is written under a
+    temporary name and renamed on `close`, so readers of "the most recent
+    file" never see a partial output; an exception inside a `with` block
+    discards it.
+
+    With `sort_by`, the whole file is sorted (so row group statistics still
+    prune) by an external merge sort: each full buffer is sorted and spilled
+    to a run file, and `close` merges the runs, reading one batch per run
+    at a time, so memory stays bounded by a row group plus one batch per run.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        schema: Optional[pa.Schema] = None,
+        row_group_size: int = 10_000,
+        sort_by: Optional[List[str]] = None
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            path (str): Output Parquet file
+            schema (pyarrow.Schema): Output schema (default: taken from the first batch)
+            row_group_size (int): Rows per row group
+            sort_by (list): Columns to sort the file by
+        """
+        self.path = Path(path)
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.sort_by = sort_by
+        self.rows = 0
+        self.row_groups = 0
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._buffer: List[pa.Table] = []
+        self._buffered = 0
+        self._runs_dir = self.path.with_name(f".{self.path.name}.{os.getpid()}.runs")
+        self._runs: List[Path] = []
+
+    def _to_table(self, batch: Any) -> pa.Table:
+        if isinstance(batch, pa.Table):
+            table = batch
+        elif isinstance(batch, pd.DataFrame):
+            table = pa.Table.from_pandas(batch, preserve_index=False)
+        elif hasattr(batch, "to_arrow"):  # polars
+            table = batch.to_arrow()
+        else:
+            table = pa.Table.from_pylist(list(batch), schema=self.schema)
+        if self.schema is None:
+            self.schema = table.schema
+        if table.schema != self.schema:
+            # Fill columns the batch lacks, then cast to the file's types
+            missing = [field for field in self.schema if field.name not in table.column_names]
+            for field in missing:
+                table = table.append_column(field, pa.nulls(len(table), field.type))
+            table = table.select(self.schema.names).cast(self.schema)
+        return table
+
+    def write(self, batch: Any) -> None:
+        """
+        Add a batch of rows.
+
+        Args:
+            batch: List of dicts, pandas/polars DataFrame or pyarrow Table
+        """
+        table = self._to_table(batch)
+        if not len(table):
+            return
+        self._buffer.append(table)
+        self._buffered += len(table)
+        while self._buffered >= self.row_group_size:
+            if self.sort_by:
+                self._spill_run()
+            else:
+                self._flush(self.row_group_size)
+
+    def _write_group(self, group: pa.Table) -> None:
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self._tmp_path, self.schema)
+        self._writer.write_table(group, row_group_size=len(group))
+        self.rows += len(group)
+        self.row_groups += 1
+
+    def _flush(self, n_rows: Optional[int] = None) -> None:
+        if not self._buffered:
+            return
+        table = pa.concat_tables(self._buffer)
+        n_rows = len(table) if n_rows is None else n_rows
+        group, rest = table.slice(0, n_rows), table.slice(n_rows)
+        self._write_group(group)
+        self._buffer = [rest] if len(rest) else []
+        self._buffered = len(rest)
+
+    # External Sort ----
+    def _sorted_buffer(self) -> pa.Table:
+        table = pa.concat_tables(self._buffer)
+        self._buffer, self._buffered = [], 0
+        return table.sort_by([(column, "ascending") for column in self.sort_by])
+
+    def _spill_run(self) -> None:
+        """Sort the buffered rows and write them to a run file."""
+        if not self._buffered:
+            return
+        self._runs_dir.mkdir(parents=True, exist_ok=True)
+        run_path = self._runs_dir / f"{len(self._runs):06d}.parquet"
+        pq.write_table(self._sorted_buffer(), run_path)
+        self._runs.append(run_path)
+
+    def _iter_run(self, run_path: Path, run: int) -> Iterable[tuple]:
+        for batch in pq.ParquetFile(run_path).iter_batches(batch_size=self.row_group_size):
+            for row in batch.to_pylist():
+                # Nulls sort last, as in Table.sort_by
+                key = tuple((row[column] is None, row[column]) for column in self.sort_by)
+                yield key, run, row
+
+    def _merge_runs(self) -> None:
+        """K-way merge of the sorted runs into row groups of the output file."""
+        if not self._runs:
+            if self._buffered:
+                self._write_group(self._sorted_buffer())
+            return
+        self._spill_run()
+        rows = []
+        merged = heapq.merge(*(self._iter_run(path, i) for i, path in enumerate(self._runs)))
+        for _, _, row in merged:
+            rows.append(row)
+            if len(rows) == self.row_group_size:
+                self._write_group(pa.Table.from_pylist(rows, schema=self.schema))
+                rows = []
+        if rows:
+            self._write_group(pa.Table.from_pylist(rows, schema=self.schema))
+        shutil.rmtree(self._runs_dir, ignore_errors=True)
+        self._runs = []
+
+    def close(self) -> Path:
+        """Write the remaining rows and publish the file (an empty file if no rows were written)."""
+        if self.sort_by:
+            self._merge_runs()
+        else:
+            self._flush()
+        if self._writer is None:
+            if self.schema is None:
+                raise ValueError(f"No rows or schema for {self.path}")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self._tmp_path, self.schema)
+        self._writer.close()
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        """Discard the partial file."""
+        if self._writer is not None:
+            self._writer.close()
+        self._tmp_path.unlink(missing_ok=True)
+        shutil.rmtree(self._runs_dir, ignore_errors=True)
+
+    def __enter__(self) -> "ParquetBatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
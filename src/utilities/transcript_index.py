@@ -0,0 +1,425 @@
+# Libraries ----
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+# "[Music]", "[Applause]" etc. from auto-generated transcripts
+SPECIAL_STRING_PATTERN = re.compile(r"\[[^\]]*\]")
+QUERY_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+
+# Title tokens are stored at positions from TITLE_BASE on, so one posting
+# list serves both fields and phrases never span the title/transcript border
+TITLE_BASE = 1 << 24
+NO_TRANSCRIPT = "No transcript available"
+
+
+# Function: Tokenize ----
+def tokenize(text: Optional[str]) -> List[str]:
+    """Casefolded word tokens with bracketed special strings removed."""
+    if not isinstance(text, str) or text == NO_TRANSCRIPT:
+        return []
+    return TOKEN_PATTERN.findall(SPECIAL_STRING_PATTERN.sub(" ", text).casefold())
+
+
+# Posting Lists ----
+# Each term's posting list is stored as zlib-compressed uint32s:
+# [doc id deltas | term frequencies | position deltas (restarting per doc)]
+def _decode_postings(blob: bytes, n_docs: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    values = np.frombuffer(zlib.decompress(blob), dtype=np.uint32).astype(np.int64)
+    doc_ids = np.cumsum(values[:n_docs])
+    tfs = values[n_docs:2 * n_docs]
+    position_deltas = values[2 * n_docs:]
+    running = np.cumsum(position_deltas)
+    starts = np.cumsum(tfs) - tfs
+    base = running[starts] - position_deltas[starts]
+    return doc_ids, tfs, running - np.repeat(base, tfs)
+
+
+class _Segment:
+    """One immutable on-disk batch of documents: term dictionary, postings and docs."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path / "terms.json") as f:
+            terms = json.load(f)
+        arrays = np.load(path / "terms.npz")
+        self.term_ids = {term: i for i, term in enumerate(terms)}
+        self.offsets = arrays["offsets"]
+        self.lengths = arrays["lengths"]
+        self.doc_freqs = arrays["doc_freqs"]
+        self.docs = pd.read_parquet(path / "docs.parquet")
+        self._file = open(path / "postings.bin", "rb")
+        self._postings = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.lengths.sum() else b""
+
+    def postings(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        i = self.term_ids.get(term)
+        # Terms whose documents were all dropped by a merge have no postings
+        if i is None or not self.lengths[i]:
+            return None
+        offset, length = int(self.offsets[i]), int(self.lengths[i])
+        return _decode_postings(self._postings[offset:offset + length], int(self.doc_freqs[i]))
+
+    def close(self) -> None:
+        if isinstance(self._postings, mmap.mmap):
+            self._postings.close()
+        self._file.close()
+
+    @staticmethod
+    def write(
+        path: Path,
+        docs: pd.DataFrame,
+        terms: np.ndarray,
+        term_codes: np.ndarray,
+        doc_ids: np.ndarray,
+        positions: np.ndarray
+    ) -> None:
+        """
+        Write a segment from token occurrences (term code, doc id, position).
+
+        Args:
+            path (Path): New segment directory
+            docs (pandas.DataFrame): doc_id, video_id, title and length of its documents
+            terms (numpy.ndarray): Sorted vocabulary; term_codes index into it
+            term_codes, doc_ids, positions (numpy.ndarray): One entry per token occurrence
+        """
+        path.mkdir(parents=True)
+        order = np.lexsort((positions, doc_ids, term_codes))
+        term_codes, doc_ids, positions = term_codes[order], doc_ids[order], positions[order]
+        n = len(term_codes)
+
+        # One posting entry per (term, doc); deltas restart at each term / entry
+        new_term = np.ones(n, dtype=bool)
+        new_term[1:] = term_codes[1:] != term_codes[:-1]
+        new_entry = new_term.copy()
+        new_entry[1:] |= doc_ids[1:] != doc_ids[:-1]
+        entry_starts = np.flatnonzero(new_entry)
+        entry_docs = doc_ids[entry_starts]
+        entry_tfs = np.diff(np.append(entry_starts, n))
+        entry_new_term = new_term[entry_starts]
+
+        doc_deltas = np.diff(entry_docs, prepend=0)
+        doc_deltas[entry_new_term] = entry_docs[entry_new_term]
+        position_deltas = np.diff(positions, prepend=0)
+        position_deltas[entry_starts] = positions[entry_starts]
+
+        term_entry_bounds = np.append(np.flatnonzero(entry_new_term), len(entry_starts))
+        term_token_bounds = np.append(np.flatnonzero(new_term), n)
+        present = term_codes[new_term]
+
+        offsets = np.zeros(len(terms), dtype=np.int64)
+        lengths = np.zeros(len(terms), dtype=np.int64)
+        doc_freqs = np.zeros(len(terms), dtype=np.int64)
+        with open(path / "postings.bin", "wb") as f:
+            offset = 0
+            for i, code in enumerate(present):
+                e0, e1 = term_entry_bounds[i], term_entry_bounds[i + 1]
+                t0, t1 = term_token_bounds[i], term_token_bounds[i + 1]
+                blob = zlib.compress(np.concatenate([
+                    doc_deltas[e0:e1], entry_tfs[e0:e1], position_deltas[t0:t1]
+                ]).astype(np.uint32).tobytes())
+                f.write(blob)
+                offsets[code], lengths[code], doc_freqs[code] = offset, len(blob), e1 - e0
+                offset += len(blob)
+
+        with open(path / "terms.json", "w") as f:
+            json.dump([str(term) for term in terms], f)
+        np.savez(path / "terms.npz", offsets=offsets, lengths=lengths, doc_freqs=doc_freqs)
+        docs.to_parquet(path / "docs.parquet", index=False)
+
+
+class TranscriptIndex:
+    """
+    Persisted inverted index over video titles and transcripts with BM25 search.
+
+    Each batch of added videos becomes an immutable segment holding a
+    sorted term dictionary and compressed posting lists (doc ids, term
+    frequencies and positions, so quoted phrases can be matched). A query
+    only decodes the posting lists of its own terms, so latency follows the
+    number of matching documents rather than corpus size. Re-added videos
+    tombstone their old document, and segments are merged once there are
+    more than `max_segments`.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = "data/transcript_index/",
+        title_weight: float = 2.0,
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_segments: int = 8
+    ):
+        """
+        Open (or create) an index.
+
+        Args:
+            path (str): Index directory
+            title_weight (float): Weight of a title occurrence relative to a transcript one
+            k1 (float): BM25 term frequency saturation
+            b (float): BM25 length normalization
+            max_segments (int): Merge all segments once there are more than this
+        """
+        self.path = Path(path)
+        self.title_weight = title_weight
+        self.k1 = k1
+        self.b = b
+        self.max_segments = max_segments
+
+        self.manifest = {"segments": [], "next_doc_id": 0, "deleted": [], "files": []}
+        manifest_path = self.path / "manifest.json"
+        if manifest_path.exists():
+            with open(manifest_path) as f:
+                self.manifest = json.load(f)
+        self._load_segments()
+
+    def _load_segments(self) -> None:
+        self.segments = [_Segment(self.path / name) for name in self.manifest["segments"]]
+        self._deleted = np.array(sorted(self.manifest["deleted"]), dtype=np.int64)
+        docs = [segment.docs for segment in self.segments]
+        self.docs = (
+            pd.concat(docs, ignore_index=True) if docs
+            else pd.DataFrame({"doc_id": pd.Series(dtype="int64"), "video_id": pd.Series(dtype="str"),
+                               "title": pd.Series(dtype="str"), "length": pd.Series(dtype="int64")})
+        )
+        live = ~self.docs["doc_id"].isin(self._deleted)
+        self._live_docs = self.docs[live].set_index("doc_id")
+        self._doc_by_video = dict(zip(self._live_docs["video_id"], self._live_docs.index))
+        self._avg_length = float(self._live_docs["length"].mean()) if len(self._live_docs) else 0.0
+
+    def __len__(self) -> int:
+        return len(self._live_docs)
+
+    def close(self) -> None:
+        for segment in self.segments:
+            segment.close()
+
+    def _save_manifest(self) -> None:
+        self.manifest["updated_at"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        tmp_path = self.path / "manifest.json.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self.path / "manifest.json")
+
+    # Indexing ----
+    def add_documents(self, df: pd.DataFrame) -> int:
+        """
+        Index videos as one new segment, replacing earlier versions of the same video_id.
+
+        Args:
+            df (pandas.DataFrame): Rows with video_id, title and transcript
+
+        Returns:
+            int: Number of videos indexed
+        """
+        df = df.drop_duplicates("video_id", keep="last")
+        if df.empty:
+            return 0
+
+        tokens, doc_parts, position_parts, doc_rows = [], [], [], []
+        doc_id = self.manifest["next_doc_id"]
+        for row in df.itertuples(index=False):
+            title_tokens = tokenize(row.title)
+            transcript_tokens = tokenize(row.transcript)
+            tokens += transcript_tokens + title_tokens
+            doc_parts.append(np.full(len(transcript_tokens) + len(title_tokens), doc_id, dtype=np.int64))
+            position_parts += [np.arange(len(transcript_tokens)), TITLE_BASE + np.arange(len(title_tokens))]
+
+            doc_rows.append({
+                "doc_id": doc_id, "video_id": row.video_id, "title": row.title,
+                "length": len(transcript_tokens) + len(title_tokens),
+            })
+            if row.video_id in self._doc_by_video:
+                self.manifest["deleted"].append(int(self._doc_by_video[row.video_id]))
+            doc_id += 1
+
+        term_codes, terms = pd.factorize(pd.Series(tokens, dtype=object), sort=True)
+        name = f"segment_{doc_id:010d}"
+        _Segment.write(
+            self.path / name, pd.DataFrame(doc_rows), np.asarray(terms, dtype=object), term_codes.astype(np.int64),
+            np.concatenate(doc_parts), np.concatenate(position_parts).astype(np.int64)
+        )
+        self.manifest["segments"].append(name)
+        self.manifest["next_doc_id"] = doc_id
+
+        self.close()
+        if len(self.manifest["segments"]) > self.max_segments:
+            self._merge_segments()
+        self._save_manifest()
+        self._load_segments()
+        return len(doc_rows)
+
+    def _merge_segments(self) -> None:
+        """Rewrite all segments as one, dropping tombstoned documents."""
+        segments = [_Segment(self.path / name) for name in self.manifest["segments"]]
+        deleted = np.array(sorted(self.manifest["deleted"]), dtype=np.int64)
+        vocabulary = sorted(set().union(*(segment.term_ids for segment in segments)))
+        codes = {term: code for code, term in enumerate(vocabulary)}
+        code_parts, doc_parts, position_parts = [], [], []
+        for segment in segments:
+            for term in segment.term_ids:
+                postings = segment.postings(term)
+                if postings is None:
+                    continue
+                doc_ids, tfs, positions = postings
+                occurrence_docs = np.repeat(doc_ids, tfs)
+                keep = ~np.isin(occurrence_docs, deleted)
+                code_parts.append(np.full(keep.sum(), codes[term], dtype=np.int64))
+                doc_parts.append(occurrence_docs[keep])
+                position_parts.append(positions[keep])
+        docs = pd.concat([s.docs for s in segments], ignore_index=True)
+        docs = docs[~docs["doc_id"].isin(deleted)]
+        for segment in segments:
+            segment.close()
+
+        name = f"segment_{self.manifest['next_doc_id']:010d}_merged"
+        _Segment.write(
+            self.path / name, docs, np.asarray(vocabulary, dtype=object), np.concatenate(code_parts),
+            np.concatenate(doc_parts), np.concatenate(position_parts)
+        )
+        old = self.manifest["segments"]
+        self.manifest["segments"] = [name]
+        self.manifest["deleted"] = []
+        # Old segments are only removed after the manifest points at the merge
+        self._save_manifest()
+        for old_name in old:
+            shutil.rmtree(self.path / old_name, ignore_errors=True)
+
+    def update_from_files(self, data_path: str = "data/", pattern: str = "video_transcripts*.parquet") -> int:
+        """
+        Index transcript parquet files not indexed yet (oldest first).
+
+        Args:
+            data_path (str): Directory with get_video_transcripts output
+            pattern (str): File glob
+
+        Returns:
+            int: Number of videos indexed
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        seen = set(self.manifest["files"])
+        files = sorted(
+            (f for f in Path(data_path).glob(pattern) if f.name not in seen), key=lambda f: f.stat().st_mtime
+        )
+        indexed = 0
+        for file in files:
+            df = pd.read_parquet(file, columns=["video_id", "title", "transcript"])
+            self.manifest["files"].append(file.name)
+            indexed += self.add_documents(df)
+        if files:
+            self._save_manifest()
+        return indexed
+
+    # Search ----
+    def _term_postings(self, term: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Live postings of a term across segments: doc ids, transcript tf, title tf, positions per doc."""
+        doc_parts, transcript_parts, title_parts, position_parts = [], [], [], []
+        for segment in self.segments:
+            postings = segment.postings(term)
+            if postings is None:
+                continue
+            doc_ids, tfs, positions = postings
+            doc_index = np.repeat(np.arange(len(doc_ids)), tfs)
+            title_tf = np.bincount(doc_index, weights=positions >= TITLE_BASE, minlength=len(doc_ids))
+            doc_parts.append(doc_ids)
+            title_parts.append(title_tf)
+            transcript_parts.append(tfs - title_tf)
+            position_parts.append((np.repeat(doc_ids, tfs), positions))
+
+        if not doc_parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty, (empty, empty)
+        doc_ids = np.concatenate(doc_parts)
+        live = ~np.isin(doc_ids, self._deleted)
+        return (
+            doc_ids[live],
+            np.concatenate(transcript_parts)[live],
+            np.concatenate(title_parts)[live],
+            (np.concatenate([p[0] for p in position_parts]), np.concatenate([p[1] for p in position_parts])),
+        )
+
+    @staticmethod
+    def _phrase_docs(term_positions: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """Doc ids where the terms occur at consecutive positions."""
+        keys = None
+        for i, (doc_ids, positions) in enumerate(term_positions):
+            term_keys = (doc_ids << 32) | (positions - i + TITLE_BASE)
+            keys = term_keys if keys is None else np.intersect1d(keys, term_keys, assume_unique=False)
+        return np.unique(keys >> 32) if keys is not None else np.empty(0, dtype=np.int64)
+
+    def search(self, query: str, k: int = 10) -> pd.DataFrame:
+        """
+        BM25-ranked search over titles and transcripts.
+
+        Quoted parts of the query ("weather api") must match as phrases;
+        every query term contributes to the score.
+
+        Args:
+            query (str): Search terms and/or quoted phrases
+            k (int): Number of results
+
+        Returns:
+            pandas.DataFrame: video_id, title and score of the top `k` videos
+        """
+        columns = ["video_id", "title", "score"]
+        n_docs = len(self._live_docs)
+        if n_docs == 0:
+            return pd.DataFrame(columns=columns)
+
+        terms, phrases = [], []
+        for phrase, word in QUERY_PATTERN.findall(query):
+            tokens = tokenize(phrase or word)
+            terms += tokens
+            if phrase and len(tokens) > 1:
+                phrases.append(tokens)
+
+        postings = {term: self._term_postings(term) for term in set(terms)}
+        score_docs, score_values = [], []
+        for term in set(terms):
+            doc_ids, transcript_tf, title_tf, _ = postings[term]
+            if not len(doc_ids):
+                continue
+            df = len(doc_ids)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            tf = transcript_tf + self.title_weight * title_tf
+            lengths = self._live_docs["length"].reindex(doc_ids).to_numpy()
+            norm = self.k1 * (1 - self.b + self.b * lengths / max(self._avg_length, 1e-9))
+            score_docs.append(doc_ids)
+            score_values.append(idf * tf * (self.k1 + 1) / (tf + norm))
+
+        if not score_docs:
+            return pd.DataFrame(columns=columns)
+        scores = pd.Series(np.concatenate(score_values)).groupby(np.concatenate(score_docs)).sum()
+
+        for phrase in phrases:
+            matches = self._phrase_docs([postings[term][3] for term in phrase])
+            scores = scores[scores.index.isin(matches)]
+
+        top = scores.nlargest(k)
+        result = self._live_docs.loc[top.index, ["video_id", "title"]].reset_index(drop=True)
+        result["score"] = top.to_numpy()
+        return result
+
+
+# Function: Update Transcript Index ----
+def update_transcript_index(data_path: str = "data/", index_path: str = "data/transcript_index/") -> int:
+    """
+    Index transcript files written since the last update.
+
+    Returns:
+        int: Number of videos indexed
+    """
+    index = TranscriptIndex(index_path)
+    try:
+        return index.update_from_files(data_path)
+    finally:
+        index.close()
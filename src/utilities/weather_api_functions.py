@@ -11,16 +11,20 @@ from typing import List
 import glob
 from dotenv import load_dotenv
 import logging
+import contextlib
+import itertools
+import socket
+import threading
+
+from src.utilities.file_lock import file_lock
 
 # API Key ----
 OPEN_WEATHER_API_KEY = os.getenv("OPEN_WEATHER_API_KEY")
+OPEN_WEATHER_BASE_URL = os.getenv("OPEN_WEATHER_BASE_URL", "https://api.openweathermap.org")
 
 # Logging ----
-logging.basicConfig(
-    filename = "log.log",
-    level = logging.INFO,
-    format = "%(asctime)s:%(levelname)s:%(message)s"
-)
+# Handlers are installed by src.utilities.logging_setup.setup_logging()
+logger = logging.getLogger(__name__)
 
 # Function: Kelvin to Fahrenheit ----
 def get_kelvin_to_fahrenheit(temp_in_kelvin):
@@ -135,7 +139,8 @@ def get_kelvin_to_fahrenheit(temp_in_kelvin):
 
 #     return df
 
-def get_current_weather_data(country="US", state="MD", city="Odenton", verbose=False):
+def get_current_weather_data(country="US", state="MD", city="Odenton", verbose=False, session=None, timeout=None,
+                             city_id=None, lat=None, lon=None):
     """
     Fetch current weather data for a given location with optional verbose output.
 
@@ -144,6 +149,11 @@ def get_current_weather_data(country="US", state="MD", city="Odenton", verbose=F
         state (str): State code (default: "MD")
         city (str): City name (default: "Odenton")
         verbose (bool): Whether to print detailed progress (default: False)
+        session (requests.Session): Optional session to reuse pooled connections
+        timeout (float): Optional request timeout in seconds
+        city_id (int): OpenWeather city ID; skips server-side geocoding of the name
+        lat (float): Latitude, used with `lon` when no city_id is given
+        lon (float): Longitude, used with `lat` when no city_id is given
 
     Returns:
         pandas.DataFrame: Weather data or None if error occurs
@@ -151,11 +161,16 @@ def get_current_weather_data(country="US", state="MD", city="Odenton", verbose=F
 
     if verbose:
         print(f"\nFetching weather data for {city}, {state}, {country}...")
-        logging.info(f"Fetching weather data for {city}, {state}, {country}...")
+        logger.info(f"Fetching weather data for {city}, {state}, {country}...")
 
     # api_key = ""
     api_key = OPEN_WEATHER_API_KEY
-    URL = f"https://api.openweathermap.org/data/2.5/weather?q={city},{state},{country}&appid={api_key}"
+    if city_id is not None:
+        URL = f"{OPEN_WEATHER_BASE_URL}/data/2.5/weather?id={city_id}&appid={api_key}"
+    elif lat is not None and lon is not None:
+        URL = f"{OPEN_WEATHER_BASE_URL}/data/2.5/weather?lat={lat}&lon={lon}&appid={api_key}"
+    else:
+        URL = f"{OPEN_WEATHER_BASE_URL}/data/2.5/weather?q={city},{state},{country}&appid={api_key}"
 
     # Initialize progress bar
     progress = tqdm(total=4, disable=not verbose, desc="Processing")
@@ -164,7 +179,7 @@ def get_current_weather_data(country="US", state="MD", city="Odenton", verbose=F
     try:
         if verbose:
             print("\nMaking API request...")
-        response = requests.get(URL)
+        response = (session or requests).get(URL, timeout=timeout)
         progress.update(1)
     except requests.exceptions.RequestException as e:
         print("Error: Cannot connect to the weather API.")
@@ -229,22 +244,97 @@ def get_current_weather_data(country="US", state="MD", city="Odenton", verbose=F
 # data = get_current_weather_data(verbose=True)
 
 
+# Function: Atomic CSV Write ----
+def write_csv_atomic(df: pd.DataFrame, file_name) -> None:
+    """
+    Write a CSV so readers only ever see the complete file.
+
+    The data goes to a temp file in the same directory, is fsynced and then
+    renamed over `file_name`; a crash leaves at most a stray `.tmp` file,
+    which the `*.csv` globs here never pick up.
+
+    Args:
+        df (pandas.DataFrame): Data to write
+        file_name (str): Final path
+    """
+    file_name = Path(file_name)
+    tmp_name = file_name.with_name(f".{file_name.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_name, "w", newline="") as f:
+            df.to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, file_name)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_name)
+        raise
+
+    # Persist the rename itself (not supported for directories on Windows)
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(file_name.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+_snapshot_sequence = itertools.count()
+_snapshot_sequence_lock = threading.Lock()
+
+
+def get_snapshot_file_name(data_path: str = "data/open_weather_data/") -> Path:
+    """
+    Collision-free snapshot path: timestamp plus host, pid and a per-process sequence.
+
+    The timestamp stays first so snapshot files still sort by time.
+    """
+    with _snapshot_sequence_lock:
+        sequence = next(_snapshot_sequence)
+    current_timestamp = datetime.now().strftime("%Y-%m-%d_%H.%M.%S")
+    host = "".join(c if c.isalnum() or c == "-" else "-" for c in socket.gethostname()) or "host"
+    return Path(data_path) / f"open_weather_data_{current_timestamp}_{host}_{os.getpid()}_{sequence:06d}.csv"
+
+
+@contextlib.contextmanager
+def weather_file_lock(data_path: str = "data/open_weather_data/", timeout: float = 300):
+    """
+    Exclusive lock for rebuilding the combined weather file.
+
+    A `file_lock` on a lock file in `data_path`, so it covers threads and
+    processes on the same host.
+
+    Args:
+        data_path (str): Snapshot directory
+        timeout (float): Seconds to wait for the lock before raising TimeoutError
+    """
+    with file_lock(Path(data_path) / ".open_weather_data_combined.lock", timeout=timeout):
+        yield
+
+
 # Function: Save Weather Data ----
-def get_save_weather_data(data: pd.DataFrame):
+def get_save_weather_data(data: pd.DataFrame, data_path: str = "data/open_weather_data/"):
     """
     Save weather data to a CSV file.
 
+    The snapshot is written atomically under a collision-free name, so any
+    number of producers can save into the same directory concurrently.
+
     Args:
         data (pandas.DataFrame): Weather data
+        data_path (str): Directory to save the snapshot in
+
+    Returns:
+        str: Path of the written snapshot
     """
 
     df = data
 
-    current_timestamp = datetime.now().strftime("%Y-%m-%d_%H.%M.%S")
-    file_name = f"data/open_weather_data/open_weather_data_{current_timestamp}.csv"
-    df.to_csv(file_name, index=False)
+    file_name = str(get_snapshot_file_name(data_path))
+    write_csv_atomic(df, file_name)
 
     print(f"\nWeather data saved to {file_name}!")
+    return file_name
 
 # get_save_weather_data(data)
 
@@ -253,7 +343,9 @@ def get_save_weather_data(data: pd.DataFrame):
 def get_combine_weather_data(
     data_path: str = "data/open_weather_data/",
     verbose: bool = False,
-    overwrite: bool = True
+    overwrite: bool = True,
+    lock: bool = False,
+    changefeed: bool = True
 
 ) -> None:
     """
@@ -262,7 +354,18 @@ def get_combine_weather_data(
     Args:
         data_path (str): Path to the directory containing weather data CSV files
         verbose (bool): Whether to print detailed progress messages
+        lock (bool): Hold `weather_file_lock` while combining, so concurrent
+            combine steps (e.g. from parallel fetchers) don't interleave
+        changefeed (bool): Append rows of snapshots not yet in the change feed
+            (`data_path`/changefeed/, see WeatherChangeFeed) as a new batch;
+            the append always holds `weather_file_lock`, even without `lock`
     """
+    if lock:
+        with weather_file_lock(data_path):
+            return get_combine_weather_data(
+                data_path, verbose=verbose, overwrite=overwrite, lock=False, changefeed=changefeed
+            )
+
     # Convert to Path object for better path handling
     path = Path(data_path)
     output_file = path / "open_weather_data_combined.csv"
@@ -302,6 +405,7 @@ def get_combine_weather_data(
 
     # Initialize empty list to store dataframes
     dfs: List[pd.DataFrame] = []
+    frames_by_file = {}
 
     # Read each CSV file
     for file in csv_files:
@@ -313,6 +417,7 @@ def get_combine_weather_data(
             # Verify the file has data
             if len(df) > 0:
                 dfs.append(df)
+                frames_by_file[file.name] = df
             else:
                 print(f"Warning: {file.name} is empty")
 
@@ -338,11 +443,21 @@ def get_combine_weather_data(
     try:
         if verbose:
             print(f"Saving combined data to {output_file}")
-        combined_df.to_csv(output_file, index=False)
+        write_csv_atomic(combined_df, output_file)
         print(f"\nSuccessfully combined {len(dfs)} files into {output_file}")
         print(f"Total rows: {len(combined_df)}")
     except Exception as e:
         print(f"Error saving combined file: {str(e)}")
+        return
+
+    # Append newly combined snapshots to the change feed
+    if changefeed:
+        from src.utilities.weather_changefeed import WeatherChangeFeed
+        # Offsets come from the index, so appends must never interleave
+        with weather_file_lock(data_path):
+            appended = WeatherChangeFeed(path / "changefeed").append_snapshots(frames_by_file)
+        if appended is not None:
+            print(f"Change feed: appended offsets {appended[0]} to {appended[1] - 1}")
 
 # get_combine_weather_data(verbose=True, overwrite=True)
 
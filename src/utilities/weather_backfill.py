@@ -0,0 +1,293 @@
+# Libraries ----
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+import requests
+
+from src.utilities import weather_api_functions
+from src.utilities.weather_api_functions import get_current_weather_data, get_kelvin_to_fahrenheit, write_csv_atomic
+
+logger = logging.getLogger(__name__)
+
+OPEN_WEATHER_HISTORY_BASE_URL = os.getenv("OPEN_WEATHER_HISTORY_BASE_URL", "https://history.openweathermap.org")
+
+# The history endpoint returns at most one week of hourly data per call
+MAX_UNIT_HOURS = 24 * 7
+
+SNAPSHOT_COLUMNS = [
+    "request_datetime", "city_name", "city_id", "city_country", "longitude", "latitude",
+    "weather_description", "temp_farenheit", "temp_min_farenheit", "temp_max_farenheit",
+    "humidity", "wind_speed",
+]
+
+
+class RateLimiter:
+    """Token bucket shared by worker threads: at most `calls_per_minute` calls."""
+
+    def __init__(self, calls_per_minute: float):
+        self.interval = 60.0 / calls_per_minute
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# Function: Split Date Range ----
+def split_date_range(start: datetime, end: datetime, unit_hours: int = MAX_UNIT_HOURS) -> List[Tuple[datetime, datetime]]:
+    """
+    Split [start, end) into consecutive work units of at most `unit_hours`.
+
+    Args:
+        start (datetime): Range start (UTC)
+        end (datetime): Range end, exclusive (UTC)
+        unit_hours (int): Maximum hours per unit
+
+    Returns:
+        list: (unit_start, unit_end) tuples
+    """
+    units = []
+    step = timedelta(hours=min(unit_hours, MAX_UNIT_HOURS))
+    cursor = start
+    while cursor < end:
+        units.append((cursor, min(cursor + step, end)))
+        cursor += step
+    return units
+
+
+# Function: Existing Snapshot Keys ----
+def get_stored_snapshot_keys(data_path: str = "data/open_weather_data/") -> Set[Tuple[int, str]]:
+    """
+    Collect (city_id, hour) keys already present in stored snapshots.
+
+    Live snapshots are taken at arbitrary minutes while history is hourly,
+    so stored rows are matched on the (local time) hour they fall in.
+
+    Returns:
+        set: (city_id, "YYYY-MM-DD HH") keys
+    """
+    keys = set()
+    for file in Path(data_path).glob("*.csv"):
+        try:
+            df = pd.read_csv(file, usecols=["city_id", "request_datetime"])
+        except (ValueError, pd.errors.EmptyDataError):
+            continue
+        hours = df["request_datetime"].astype(str).str.slice(0, 13)
+        keys.update(zip(df["city_id"].astype(int), hours))
+    return keys
+
+
+class WeatherBackfill:
+    """
+    Pull historical observations for many cities over a date range.
+
+    The range is split per city into week-long work units fetched in
+    parallel under a shared rate limit. Each finished unit is written as a
+    snapshot CSV in `data_path` (so `get_combine_weather_data` picks it up)
+    and recorded in a checkpoint file, so an interrupted backfill resumes
+    with only the missing units. Hours that already have a stored snapshot
+    for the city are dropped.
+    """
+
+    def __init__(
+        self,
+        locations: List[Dict],
+        start: datetime,
+        end: datetime,
+        data_path: str = "data/open_weather_data/",
+        checkpoint_path: str = "data/open_weather_backfill_checkpoint.jsonl",
+        max_workers: int = 4,
+        calls_per_minute: float = 60,
+        max_retries: int = 3,
+        api_key: Optional[str] = None
+    ):
+        """
+        Initialize the backfill.
+
+        Args:
+            locations (list): Location dicts with "city", "state", "country" and optionally
+                "city_id", "city_name", "longitude", "latitude" (looked up once if missing)
+            start (datetime): Range start (UTC)
+            end (datetime): Range end, exclusive (UTC)
+            data_path (str): Snapshot directory to write to and deduplicate against
+            checkpoint_path (str): JSON lines file of completed units
+            max_workers (int): Units fetched in parallel
+            calls_per_minute (float): Rate limit across all workers
+            max_retries (int): Retries per unit on 429/5xx or connection errors
+            api_key (str): OpenWeather API key (default: OPEN_WEATHER_API_KEY)
+        """
+        self.locations = locations
+        self.start = start.replace(tzinfo=timezone.utc) if start.tzinfo is None else start
+        self.end = end.replace(tzinfo=timezone.utc) if end.tzinfo is None else end
+        self.data_path = Path(data_path)
+        self.checkpoint_path = Path(checkpoint_path)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.api_key = api_key or weather_api_functions.OPEN_WEATHER_API_KEY
+        self.rate_limiter = RateLimiter(calls_per_minute)
+        self.session = requests.Session()
+        self._checkpoint_lock = threading.Lock()
+
+    # Checkpoints ----
+    def load_checkpoint(self) -> Set[str]:
+        """Return the ids of units completed by earlier runs."""
+        if not self.checkpoint_path.exists():
+            return set()
+        done = set()
+        with open(self.checkpoint_path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    done.add(json.loads(line)["unit_id"])
+        return done
+
+    def _mark_done(self, unit_id: str, rows: int) -> None:
+        with self._checkpoint_lock:
+            self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.checkpoint_path, "a") as f:
+                f.write(json.dumps({"unit_id": unit_id, "rows": rows, "completed_at": datetime.now().isoformat()}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    # Locations ----
+    def resolve_location(self, location: Dict) -> Dict:
+        """Fill in city_id, name and coordinates with one current-weather call if missing."""
+        needed = ("city_id", "city_name", "city_country", "longitude", "latitude")
+        if all(key in location for key in needed):
+            return location
+
+        current = None
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            current = get_current_weather_data(
+                country=location["country"], state=location["state"], city=location["city"], session=self.session
+            )
+            if current is not None:
+                break
+            if attempt < self.max_retries:
+                time.sleep(2 ** attempt)
+        if current is None:
+            raise ValueError(f"Could not resolve location {location}")
+        resolved = dict(location)
+        for key in needed:
+            resolved.setdefault(key, current[key].iloc[0])
+        return resolved
+
+    # Fetching ----
+    def fetch_unit(self, location: Dict, unit_start: datetime, unit_end: datetime) -> pd.DataFrame:
+        """Fetch one unit of hourly history and shape it like a live snapshot."""
+        params = {
+            "id": int(location["city_id"]),
+            "type": "hour",
+            "start": int(unit_start.timestamp()),
+            "end": int(unit_end.timestamp()),
+            "appid": self.api_key,
+        }
+        url = f"{OPEN_WEATHER_HISTORY_BASE_URL}/data/2.5/history/city"
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            try:
+                response = self.session.get(url, params=params, timeout=30)
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+                response.raise_for_status()
+                items = response.json().get("list", [])
+                break
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if attempt == self.max_retries or (status is not None and status < 500 and status != 429):
+                    raise
+                time.sleep(2 ** attempt)
+
+        rows = []
+        for item in items:
+            # Live snapshots stamp request_datetime in local time; match them so dedupe/combine line up
+            main = item.get("main", {})
+            rows.append({
+                "request_datetime": datetime.fromtimestamp(item["dt"]).strftime('%Y-%m-%d %H:%M:%S'),
+                "city_name": location["city_name"],
+                "city_id": int(location["city_id"]),
+                "city_country": location["city_country"],
+                "longitude": location["longitude"],
+                "latitude": location["latitude"],
+                "weather_description": (item.get("weather") or [{}])[0].get("description"),
+                "temp_farenheit": get_kelvin_to_fahrenheit(main["temp"]),
+                "temp_min_farenheit": get_kelvin_to_fahrenheit(main.get("temp_min", main["temp"])),
+                "temp_max_farenheit": get_kelvin_to_fahrenheit(main.get("temp_max", main["temp"])),
+                "humidity": main.get("humidity"),
+                "wind_speed": item.get("wind", {}).get("speed"),
+            })
+        return pd.DataFrame(rows, columns=SNAPSHOT_COLUMNS)
+
+    def _run_unit(self, unit_id: str, location: Dict, unit_start: datetime, unit_end: datetime, stored: Set) -> int:
+        df = self.fetch_unit(location, unit_start, unit_end)
+        if not df.empty:
+            hours = df["request_datetime"].str.slice(0, 13)
+            keep = [(city_id, hour) not in stored for city_id, hour in zip(df["city_id"], hours)]
+            df = df[keep]
+        if not df.empty:
+            self.data_path.mkdir(parents=True, exist_ok=True)
+            file_name = self.data_path / f"open_weather_data_backfill_{location['city_id']}_{unit_start.strftime('%Y-%m-%d_%H.%M.%S')}.csv"
+            write_csv_atomic(df, file_name)
+        self._mark_done(unit_id, len(df))
+        return len(df)
+
+    def run(self) -> Dict[str, int]:
+        """
+        Fetch every unit not yet in the checkpoint.
+
+        Returns:
+            dict: Counts of units (total, skipped, completed, failed) and rows written
+        """
+        done = self.load_checkpoint()
+        stored = get_stored_snapshot_keys(self.data_path)
+        units = split_date_range(self.start, self.end)
+
+        stats = {"units": 0, "skipped": 0, "completed": 0, "failed": 0, "rows": 0}
+        work = []
+        for location in self.locations:
+            try:
+                resolved = self.resolve_location(location)
+            except ValueError as e:
+                stats["units"] += len(units)
+                stats["failed"] += len(units)
+                logger.error(str(e))
+                continue
+            for unit_start, unit_end in units:
+                unit_id = f"{int(resolved['city_id'])}:{int(unit_start.timestamp())}:{int(unit_end.timestamp())}"
+                stats["units"] += 1
+                if unit_id in done:
+                    stats["skipped"] += 1
+                    continue
+                work.append((unit_id, resolved, unit_start, unit_end))
+
+        logger.info(f"Backfilling {len(work)} units ({stats['skipped']} already done) with {self.max_workers} workers")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._run_unit, *unit, stored): unit[0] for unit in work}
+            for future in as_completed(futures):
+                try:
+                    stats["rows"] += future.result()
+                    stats["completed"] += 1
+                except Exception as e:
+                    stats["failed"] += 1
+                    logger.error(f"Backfill unit {futures[future]} failed: {str(e)}")
+
+        logger.info(
+            f"Backfill finished: {stats['completed']} units completed, {stats['failed']} failed, "
+            f"{stats['rows']} rows written"
+        )
+        return stats
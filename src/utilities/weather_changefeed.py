@@ -0,0 +1,303 @@
+# Libraries ----
+import bisect
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utilities.file_lock import file_lock
+from src.utilities.weather_schema import WEATHER_ARROW_SCHEMA, WEATHER_SCHEMA, apply_weather_schema
+
+OFFSET_COLUMN = "_offset"
+
+# Compact weather types except for measurements and coordinates, which stay
+# float64: feed consumers (e.g. BigQuery FLOAT64 columns) get the exact values
+FEED_ARROW_SCHEMA = pa.schema([
+    field.with_type(pa.float64()) if field.type == pa.float32() else field
+    for field in WEATHER_ARROW_SCHEMA
+])
+_FLOAT_COLUMNS = [column for column, dtype in WEATHER_SCHEMA.items() if dtype == "float32"]
+
+
+def _apply_feed_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """`apply_weather_schema` without narrowing float columns to float32."""
+    floats = [column for column in _FLOAT_COLUMNS if column in df.columns]
+    typed = apply_weather_schema(df.drop(columns=floats))
+    for column in floats:
+        typed[column] = pd.to_numeric(df[column]).astype("float64")
+    return typed[list(df.columns)]
+
+
+def _write_feed_parquet(df: pd.DataFrame, path: Path) -> None:
+    df = _apply_feed_schema(df)
+    known = [field.name for field in FEED_ARROW_SCHEMA if field.name in df.columns]
+    extra = [column for column in df.columns if column not in WEATHER_SCHEMA]
+    schema = pa.schema(
+        [FEED_ARROW_SCHEMA.field(name) for name in known]
+        + [pa.Schema.from_pandas(df[extra], preserve_index=False).field(name) for name in extra]
+    )
+    pq.write_table(pa.Table.from_pandas(df[known + extra], schema=schema, preserve_index=False), path)
+
+
+class WeatherChangeFeed:
+    """
+    Append-only log of the row batches added to the combined weather dataset.
+
+    Every row gets an offset, one more than the row before it. A batch is
+    one Parquet file named after its first offset, with the compact weather
+    types except that floats are kept as float64. `index.jsonl` is the
+    commit point: a line is appended and fsynced only after the batch file
+    is in place, so a batch file with no index line (from a crash) is
+    ignored and overwritten by the next append, and a torn index line is
+    truncated away before the next line is written. Each index entry also
+    lists the snapshot files the batch came from, so a snapshot is
+    appended exactly once no matter how often the combined file is rebuilt.
+
+    Consumers read "everything since offset N" in time proportional to the
+    rows returned, and can store their position here with `commit`.
+    """
+
+    def __init__(self, path: Union[str, Path] = "data/open_weather_data/changefeed/"):
+        """
+        Open (or create) a change feed.
+
+        Args:
+            path (str): Feed directory (batches/, index.jsonl and consumers.json inside)
+        """
+        self.path = Path(path)
+        self.batches_dir = self.path / "batches"
+        self.index_path = self.path / "index.jsonl"
+        self.consumers_path = self.path / "consumers.json"
+        self.consumers_lock_path = self.path / ".consumers.json.lock"
+        self.batches_dir.mkdir(parents=True, exist_ok=True)
+        self.entries: List[Dict] = []
+        self._load_index()
+
+    def _load_index(self) -> None:
+        self.entries = []
+        self._starts: List[int] = []
+        # Bytes of complete index lines; anything after them is a torn write
+        self._index_size = 0
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn last line from a crash
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                self.entries.append(entry)
+                self._index_size += len(line)
+        self._starts = [entry["first_offset"] for entry in self.entries]
+
+    # Offsets ----
+    @property
+    def next_offset(self) -> int:
+        """Offset the next appended row will get (total rows ever appended)."""
+        if not self.entries:
+            return 0
+        last = self.entries[-1]
+        return last["first_offset"] + last["rows"]
+
+    @property
+    def first_offset(self) -> int:
+        """Oldest offset still readable (after `prune`)."""
+        for entry in self.entries:
+            if not entry.get("pruned"):
+                return entry["first_offset"]
+        return self.next_offset
+
+    def _batch_path(self, first_offset: int) -> Path:
+        return self.batches_dir / f"{first_offset:020d}.parquet"
+
+    # Writing ----
+    def fed_sources(self) -> set:
+        """Snapshot file names already appended."""
+        return {source for entry in self.entries for source in entry.get("sources", [])}
+
+    def append(self, df: pd.DataFrame, sources: Iterable[str] = ()) -> Optional[Tuple[int, int]]:
+        """
+        Append a batch of rows.
+
+        Callers must serialize appends (get_combine_weather_data holds the
+        weather file lock while calling this).
+
+        Args:
+            df (pandas.DataFrame): Rows to append
+            sources (list): Snapshot file names the rows came from
+
+        Returns:
+            tuple: (first offset, next offset) of the batch, or None if `df` is empty
+        """
+        if df.empty:
+            return None
+        first_offset = self.next_offset
+        path = self._batch_path(first_offset)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        _write_feed_parquet(df, tmp_path)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        entry = {
+            "first_offset": first_offset,
+            "rows": len(df),
+            "file": path.name,
+            "sources": sorted(sources),
+            "created_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        line = (json.dumps(entry) + "\n").encode()
+        with open(self.index_path, "ab") as f:
+            if f.tell() > self._index_size:
+                # Drop a torn line so the new entry starts on a line of its own
+                f.truncate(self._index_size)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._index_size += len(line)
+        self.entries.append(entry)
+        self._starts.append(first_offset)
+        return first_offset, first_offset + len(df)
+
+    def append_snapshots(self, frames: Dict[str, pd.DataFrame]) -> Optional[Tuple[int, int]]:
+        """
+        Append the snapshots not yet in the feed as one batch.
+
+        Args:
+            frames (dict): Snapshot file name -> its rows
+
+        Returns:
+            tuple: (first offset, next offset) of the batch, or None if nothing was new
+        """
+        fed = self.fed_sources()
+        new = sorted(name for name in frames if name not in fed)
+        if not new:
+            return None
+        batch = pd.concat([frames[name] for name in new], ignore_index=True)
+        if "request_datetime" in batch.columns:
+            batch = batch.sort_values("request_datetime", kind="stable")
+        return self.append(batch, sources=new)
+
+    # Reading ----
+    def iter_batches(self, since: int = 0, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Yield the rows at offsets >= `since`, one batch at a time, with an `_offset` column.
+
+        Args:
+            since (int): First offset wanted
+            columns (list): Optional subset of columns
+
+        Yields:
+            pandas.DataFrame: Rows of one batch
+        """
+        if since < self.first_offset:
+            raise ValueError(f"Offset {since} was pruned; the feed starts at {self.first_offset}")
+        # Batch holding `since`, found by binary search over first offsets
+        position = max(0, bisect.bisect_right(self._starts, since) - 1)
+        for entry in self.entries[position:]:
+            end = entry["first_offset"] + entry["rows"]
+            if end <= since:
+                continue
+            table = pq.read_table(self.batches_dir / entry["file"], columns=columns)
+            skip = max(0, since - entry["first_offset"])
+            if skip:
+                table = table.slice(skip)
+            offsets = pa.array(range(entry["first_offset"] + skip, end), type=pa.int64())
+            yield _apply_feed_schema(table.append_column(OFFSET_COLUMN, offsets).to_pandas())
+
+    def read_since(
+        self,
+        since: int = 0,
+        max_rows: Optional[int] = None,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[pd.DataFrame, int]:
+        """
+        Rows at offsets >= `since`, optionally at most `max_rows` of them.
+
+        Args:
+            since (int): First offset wanted
+            max_rows (int): Optional cap on rows returned
+            columns (list): Optional subset of columns
+
+        Returns:
+            tuple: (rows with an `_offset` column, offset to read from next time)
+        """
+        frames, rows = [], 0
+        for frame in self.iter_batches(since, columns=columns):
+            if max_rows is not None and rows + len(frame) > max_rows:
+                frame = frame.iloc[:max_rows - rows]
+            frames.append(frame)
+            rows += len(frame)
+            if max_rows is not None and rows >= max_rows:
+                break
+        if not frames:
+            return pd.DataFrame(columns=(columns or []) + [OFFSET_COLUMN]), max(since, self.first_offset)
+        df = pd.concat(frames, ignore_index=True)
+        # Categoricals with different categories fall back to object on concat
+        return _apply_feed_schema(df), since + len(df)
+
+    # Consumers ----
+    def committed(self, consumer: str) -> int:
+        """Offset a consumer has committed (0 if it never has)."""
+        if not self.consumers_path.exists():
+            return 0
+        with open(self.consumers_path) as f:
+            return json.load(f).get(consumer, {}).get("offset", 0)
+
+    def commit(self, consumer: str, offset: int) -> None:
+        """
+        Record that `consumer` has processed every row before `offset`.
+
+        The read-modify-write of consumers.json runs under a file lock and
+        replaces the file atomically, so concurrent consumers don't lose
+        each other's commits.
+        """
+        with file_lock(self.consumers_lock_path):
+            consumers = {}
+            if self.consumers_path.exists():
+                with open(self.consumers_path) as f:
+                    consumers = json.load(f)
+            consumers[consumer] = {"offset": offset, "committed_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+            tmp_path = self.consumers_path.with_name(f".{self.consumers_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(consumers, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.consumers_path)
+
+    # Retention ----
+    def prune(self, before: int) -> int:
+        """
+        Delete batch files that lie entirely before offset `before`.
+
+        Index entries are kept (marked pruned) so offsets keep increasing
+        and their snapshots are never appended again.
+
+        Args:
+            before (int): Oldest offset that must stay readable
+
+        Returns:
+            int: Number of batch files deleted
+        """
+        deleted = 0
+        for entry in self.entries:
+            if entry.get("pruned") or entry["first_offset"] + entry["rows"] > before:
+                continue
+            (self.batches_dir / entry["file"]).unlink(missing_ok=True)
+            entry["pruned"] = True
+            deleted += 1
+        if deleted:
+            tmp_path = self.index_path.with_name(f".{self.index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                for entry in self.entries:
+                    f.write((json.dumps(entry) + "\n").encode())
+                self._index_size = f.tell()
+            os.replace(tmp_path, self.index_path)
+        return deleted
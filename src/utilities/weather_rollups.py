@@ -0,0 +1,254 @@
+# Libraries ----
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.utilities.file_lock import file_lock
+
+PERIODS = {
+    "daily": "%Y-%m-%d",
+    "monthly": "%Y-%m",
+}
+
+# Mergeable aggregate state: column -> (source column, how to combine partials)
+ROLLUP_STATE = {
+    "observations": ("temp_farenheit", "count"),
+    "temp_sum": ("temp_farenheit", "sum"),
+    "temp_min": ("temp_min_farenheit", "min"),
+    "temp_max": ("temp_max_farenheit", "max"),
+    "humidity_count": ("humidity", "count"),
+    "humidity_sum": ("humidity", "sum"),
+    "humidity_min": ("humidity", "min"),
+    "humidity_max": ("humidity", "max"),
+    "wind_speed_count": ("wind_speed", "count"),
+    "wind_speed_sum": ("wind_speed", "sum"),
+    "wind_speed_max": ("wind_speed", "max"),
+}
+
+MERGE_HOW = {"count": "sum", "sum": "sum", "min": "min", "max": "max"}
+KEYS = ["city_id", "period"]
+
+# Per-column non-null counts added after the first rollups were written
+LEGACY_COUNT_COLUMNS = ["humidity_count", "wind_speed_count"]
+ROLLUP_LOCK_NAME = ".rollups.lock"
+
+
+# Function: Partial Aggregates ----
+def _partial_rollup(df: pd.DataFrame, period_format: str) -> tuple:
+    """Aggregate new rows into (state, description counts) for one period type."""
+    df = df.assign(period=pd.to_datetime(df["request_datetime"]).dt.strftime(period_format))
+    grouped = df.groupby(KEYS, sort=False)
+
+    state = grouped.agg(
+        city_name=("city_name", "last"),
+        city_country=("city_country", "last"),
+        **{name: (source, how) for name, (source, how) in ROLLUP_STATE.items()}
+    ).reset_index()
+
+    descriptions = (
+        df.groupby(KEYS + ["weather_description"], sort=False)
+        .size()
+        .rename("count")
+        .reset_index()
+    )
+    return state, descriptions
+
+
+def _merge_state(existing: Optional[pd.DataFrame], partial: pd.DataFrame) -> pd.DataFrame:
+    """Combine stored aggregate state with partials from new rows."""
+    if existing is None or existing.empty:
+        return partial
+    # State written before per-column counts existed only knows the observation count
+    existing = existing.assign(**{
+        column: existing["observations"] for column in LEGACY_COUNT_COLUMNS if column not in existing.columns
+    })
+    combined = pd.concat([existing[partial.columns], partial], ignore_index=True)
+    how = {"city_name": "last", "city_country": "last"}
+    how.update({name: MERGE_HOW[agg] for name, (_, agg) in ROLLUP_STATE.items()})
+    return combined.groupby(KEYS, sort=False).agg(how).reset_index()
+
+
+def _merge_descriptions(existing: Optional[pd.DataFrame], partial: pd.DataFrame) -> pd.DataFrame:
+    if existing is None or existing.empty:
+        return partial
+    combined = pd.concat([existing, partial], ignore_index=True)
+    return combined.groupby(KEYS + ["weather_description"], sort=False)["count"].sum().reset_index()
+
+
+def _finalize(state: pd.DataFrame, descriptions: pd.DataFrame) -> pd.DataFrame:
+    """Add means and the dominant weather description to the aggregate state."""
+    dominant = (
+        descriptions.sort_values(KEYS + ["count", "weather_description"], ascending=[True, True, False, True])
+        .drop_duplicates(KEYS)
+        .rename(columns={"weather_description": "dominant_weather_description"})
+        [KEYS + ["dominant_weather_description"]]
+    )
+    table = state.merge(dominant, on=KEYS, how="left")
+    table["temp_mean"] = table["temp_sum"] / table["observations"]
+    # Missing humidity/wind readings must not dilute their means
+    table["humidity_mean"] = table["humidity_sum"] / table["humidity_count"]
+    table["wind_speed_mean"] = table["wind_speed_sum"] / table["wind_speed_count"]
+    return table.sort_values(KEYS).reset_index(drop=True)
+
+
+def _current_generation(rollup_dir: Path) -> tuple:
+    """Return (generation number, directory holding its tables and manifest)."""
+    pointer = rollup_dir / "CURRENT"
+    if pointer.exists():
+        with open(pointer) as f:
+            generation = json.load(f)["generation"]
+        return generation, rollup_dir / f"generation_{generation:06d}"
+    # Tables written before generations were introduced sit in rollup_dir itself
+    return 0, rollup_dir
+
+
+# Function: Load Weather Rollup ----
+def load_weather_rollup(
+    period: str = "daily",
+    rollup_path: str = "data/open_weather_rollups/",
+    descriptions: bool = False
+) -> pd.DataFrame:
+    """
+    Read a rollup table from the current generation.
+
+    Args:
+        period (str): "daily" or "monthly"
+        rollup_path (str): Directory for the rollup tables
+        descriptions (bool): Read the weather description counts instead
+
+    Returns:
+        pandas.DataFrame: The table (empty if no rollups were written yet)
+    """
+    _, generation_dir = _current_generation(Path(rollup_path))
+    path = generation_dir / (f"{period}_weather_descriptions.csv" if descriptions else f"{period}.csv")
+    if not path.exists():
+        return pd.DataFrame()
+    return pd.read_csv(path, dtype={"period": str})
+
+
+# Function: Update Weather Rollups ----
+def update_weather_rollups(
+    data_path: str = "data/open_weather_data/",
+    rollup_path: str = "data/open_weather_rollups/",
+    verbose: bool = False
+) -> Dict[str, int]:
+    """
+    Update daily and monthly per-city rollups from snapshots not yet seen.
+
+    Each rollup table stores mergeable state (observation count, sums,
+    min/max) next to the derived means and dominant weather description,
+    with description counts kept in a side table. Only snapshot files not
+    listed in `processed_files.json` are read, and their partial aggregates
+    are merged into the stored state, so the cost of an update follows the
+    number of new snapshots rather than the full history. Files that fail
+    to read are left out of the manifest and retried on the next run.
+
+    The tables and the manifest of one update form a generation directory;
+    the `CURRENT` pointer is switched to it with a single atomic rename, so
+    a crash at any point leaves the previous generation in place and no
+    snapshot is ever counted twice. Read the tables with `load_weather_rollup`.
+    Concurrent updates are serialized by a lock file in `rollup_path`.
+
+    Args:
+        data_path (str): Snapshot directory
+        rollup_path (str): Directory for the rollup tables
+        verbose (bool): Print progress
+
+    Returns:
+        dict: Number of new files and rows processed
+    """
+    rollup_dir = Path(rollup_path)
+    rollup_dir.mkdir(parents=True, exist_ok=True)
+    with file_lock(rollup_dir / ROLLUP_LOCK_NAME):
+        return _update_weather_rollups(Path(data_path), rollup_dir, verbose)
+
+
+def _update_weather_rollups(data_dir: Path, rollup_dir: Path, verbose: bool) -> Dict[str, int]:
+    """Read, build and publish one rollup generation; the caller holds the rollup lock."""
+    generation, current_dir = _current_generation(rollup_dir)
+    manifest_path = current_dir / "processed_files.json"
+
+    processed: List[str] = []
+    if manifest_path.exists():
+        with open(manifest_path) as f:
+            processed = json.load(f)["files"]
+    seen = set(processed)
+
+    new_files = sorted(
+        f for f in data_dir.glob("*.csv")
+        if not f.name.endswith("combined.csv") and f.name not in seen
+    )
+    if not new_files:
+        if verbose:
+            print("No new snapshots to roll up")
+        return {"files": 0, "rows": 0}
+
+    frames, read_files = [], []
+    for file in new_files:
+        try:
+            frames.append(pd.read_csv(file))
+            read_files.append(file.name)
+        except Exception as e:
+            print(f"Error reading {file.name}: {str(e)}")
+    if not read_files:
+        return {"files": 0, "rows": 0}
+    new_rows = pd.concat(frames, ignore_index=True)
+    if verbose:
+        print(f"Rolling up {len(new_rows)} rows from {len(read_files)} new snapshot files")
+
+    # Build the next generation beside the current one (clearing any left by a crash)
+    next_generation = generation + 1
+    next_dir = rollup_dir / f"generation_{next_generation:06d}"
+    if next_dir.exists():
+        shutil.rmtree(next_dir)
+    next_dir.mkdir()
+
+    for name, period_format in PERIODS.items():
+        state_path = current_dir / f"{name}.csv"
+        descriptions_path = current_dir / f"{name}_weather_descriptions.csv"
+        if new_rows.empty:
+            # Only empty snapshots were read: carry the tables over unchanged
+            for path in (state_path, descriptions_path):
+                if path.exists():
+                    shutil.copy2(path, next_dir / path.name)
+            continue
+
+        existing_state = pd.read_csv(state_path, dtype={"period": str}) if state_path.exists() else None
+        existing_descriptions = (
+            pd.read_csv(descriptions_path, dtype={"period": str}) if descriptions_path.exists() else None
+        )
+
+        partial_state, partial_descriptions = _partial_rollup(new_rows, period_format)
+        state = _merge_state(existing_state, partial_state)
+        descriptions = _merge_descriptions(existing_descriptions, partial_descriptions)
+
+        descriptions.to_csv(next_dir / descriptions_path.name, index=False)
+        _finalize(state, descriptions).to_csv(next_dir / state_path.name, index=False)
+
+    processed.extend(read_files)
+    updated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    with open(next_dir / "processed_files.json", "w") as f:
+        json.dump({"updated_at": updated_at, "files": processed}, f)
+
+    # Commit point: the tables and the manifest become current together
+    pointer = rollup_dir / "CURRENT"
+    tmp_pointer = pointer.with_name(pointer.name + ".tmp")
+    with open(tmp_pointer, "w") as f:
+        json.dump({"generation": next_generation, "updated_at": updated_at}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_pointer, pointer)
+
+    # Older generations (and tables from before generations) are no longer read
+    for path in rollup_dir.glob("generation_*"):
+        if path != next_dir:
+            shutil.rmtree(path, ignore_errors=True)
+    for path in list(rollup_dir.glob("*.csv")) + [rollup_dir / "processed_files.json"]:
+        path.unlink(missing_ok=True)
+
+    return {"files": len(read_files), "rows": len(new_rows)}
@@ -0,0 +1,280 @@
+# Libraries ----
+import heapq
+import json
+import logging
+import random
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utilities.location_index import LocationIndex
+from src.utilities.weather_api_functions import get_current_weather_data, get_save_weather_data, get_combine_weather_data
+
+logger = logging.getLogger(__name__)
+
+
+# Function: Load Locations ----
+def load_locations(file_path: Union[str, Path]) -> List[Dict]:
+    """
+    Load the locations to poll from a JSON file.
+
+    The file holds a list of objects with "city", "state" and "country"
+    keys, an optional "city_id" and an optional per-location "interval"
+    in seconds, e.g.
+    [{"city": "Odenton", "state": "MD", "country": "US", "interval": 900}]
+
+    Args:
+        file_path (str): Path to the JSON file
+
+    Returns:
+        list: Location dicts
+    """
+    with open(file_path) as f:
+        locations = json.load(f)
+
+    for location in locations:
+        missing = [key for key in ("city", "state", "country") if key not in location]
+        if missing:
+            raise ValueError(f"Location {location} is missing {missing}")
+    return locations
+
+
+class WeatherPollingDaemon:
+    """
+    Poll current weather for many locations from one long-running process.
+
+    Every location has its own interval (with random jitter so polls don't
+    line up). Due polls run on a bounded thread pool sharing one pooled
+    requests.Session, so connections and TLS sessions stay warm between
+    polls. Results are buffered and written as one snapshot file per batch;
+    on shutdown (SIGINT/SIGTERM or `stop()`) in-flight polls finish and the
+    buffer is flushed.
+
+    With a `location_index`, locations polled by name learn their city ID
+    from the first response and are polled by ID from then on.
+    """
+
+    def __init__(
+        self,
+        locations: List[Dict],
+        interval: float = 3600,
+        jitter: float = 0.1,
+        max_concurrency: int = 8,
+        batch_size: int = 100,
+        flush_interval: float = 300,
+        data_path: str = "data/open_weather_data/",
+        combine_on_flush: bool = False,
+        request_timeout: float = 10,
+        fetch: Optional[Callable] = None,
+        writer: Optional[Callable] = None,
+        location_index: Optional[LocationIndex] = None
+    ):
+        """
+        Initialize the polling daemon.
+
+        Args:
+            locations (list): Location dicts (see `load_locations`)
+            interval (float): Default seconds between polls of one location
+            jitter (float): Random +/- fraction applied to each interval (default: 0.1)
+            max_concurrency (int): Maximum polls in flight
+            batch_size (int): Write a snapshot once this many rows are buffered
+            flush_interval (float): Write buffered rows at least this often (seconds)
+            data_path (str): Snapshot directory
+            combine_on_flush (bool): Rebuild the combined CSV after each write
+            request_timeout (float): Per-request timeout in seconds
+            fetch (callable): Override for get_current_weather_data
+            writer (callable): Override for writing a batch DataFrame
+            location_index (LocationIndex): Index to record IDs from name-based responses in
+        """
+        self.locations = locations
+        self.interval = interval
+        self.jitter = jitter
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.data_path = data_path
+        self.combine_on_flush = combine_on_flush
+        self.request_timeout = request_timeout
+        self.fetch = fetch or get_current_weather_data
+        self.writer = writer or (lambda df: get_save_weather_data(df, data_path=self.data_path))
+        self.location_index = location_index
+
+        self.polls = 0
+        self.failures = 0
+        self.rows_written = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._stop = threading.Event()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._buffer: List[pd.DataFrame] = []
+        self._buffer_rows = 0
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _next_delay(self, location: Dict) -> float:
+        interval = float(location.get("interval", self.interval))
+        return max(0.0, interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def stop(self, *args) -> None:
+        """Ask the daemon to shut down (usable as a signal handler)."""
+        if not self._stop.is_set():
+            logger.info("Shutdown requested, finishing in-flight polls")
+        self._stop.set()
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        """
+        Run until stopped (or until `max_polls` polls have been started).
+
+        Args:
+            max_polls (int): Optional poll budget, mainly for testing
+        """
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+
+        # Spread the first round over the jitter window instead of a burst
+        now = time.monotonic()
+        schedule = [
+            (now + random.uniform(0, self.jitter) * float(location.get("interval", self.interval)), i)
+            for i, location in enumerate(self.locations)
+        ]
+        heapq.heapify(schedule)
+        started = 0
+
+        logger.info(f"Polling {len(self.locations)} locations with up to {self.max_concurrency} concurrent requests")
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="weather-poll") as executor:
+            while not self._stop.is_set() and schedule:
+                if max_polls is not None and started >= max_polls:
+                    break
+
+                due_at, index = schedule[0]
+                wait = due_at - time.monotonic()
+                if wait > 0:
+                    self._stop.wait(min(wait, self._time_to_flush()))
+                    self._maybe_flush()
+                    continue
+
+                heapq.heappop(schedule)
+                # Blocks while max_concurrency polls are already in flight
+                self._slots.acquire()
+                executor.submit(self._poll, self.locations[index])
+                started += 1
+                # Schedule from now if we fell behind, so late polls don't burst
+                next_due = max(due_at, time.monotonic()) + self._next_delay(self.locations[index])
+                heapq.heappush(schedule, (next_due, index))
+                self._maybe_flush()
+
+        # Executor has drained; write whatever is left
+        self.flush()
+        self._save_index()
+        self.session.close()
+        logger.info(
+            f"Stopped after {self.polls} polls ({self.failures} failed), {self.rows_written} rows written"
+        )
+
+    def _poll(self, location: Dict) -> None:
+        try:
+            df = self.fetch(
+                country=location["country"],
+                state=location["state"],
+                city=location["city"],
+                session=self.session,
+                timeout=self.request_timeout,
+                city_id=location.get("city_id")
+            )
+            if df is not None and self.location_index is not None and location.get("city_id") is None:
+                self._learn_location(location, df)
+            with self._buffer_lock:
+                self.polls += 1
+                if df is not None:
+                    self._buffer.append(df)
+                    self._buffer_rows += len(df)
+                else:
+                    self.failures += 1
+            if df is None:
+                logger.warning(f"No data for {location['city']}, {location['state']}, {location['country']}")
+        except Exception as e:
+            with self._buffer_lock:
+                self.polls += 1
+                self.failures += 1
+            logger.error(f"Poll failed for {location.get('city')}: {str(e)}")
+        finally:
+            self._slots.release()
+
+    def _learn_location(self, location: Dict, df: pd.DataFrame) -> None:
+        with self._index_lock:
+            self.location_index.add_from_response(location["city"], location.get("state"), location["country"], df)
+        row = df.iloc[0]
+        # Later polls of this location go by ID
+        location.update(city_id=int(row["city_id"]), latitude=float(row["latitude"]), longitude=float(row["longitude"]))
+
+    def _save_index(self) -> None:
+        if self.location_index is None:
+            return
+        with self._index_lock:
+            if self.location_index.dirty:
+                self.location_index.save()
+
+    def _time_to_flush(self) -> float:
+        return max(0.05, self.flush_interval - (time.monotonic() - self._last_flush))
+
+    def _maybe_flush(self) -> None:
+        with self._buffer_lock:
+            rows = self._buffer_rows
+        due = time.monotonic() - self._last_flush >= self.flush_interval
+        if not rows:
+            if due:
+                # Nothing to write: restart the interval instead of waking every 50 ms
+                self._last_flush = time.monotonic()
+            return
+        if rows >= self.batch_size or due:
+            try:
+                self.flush()
+            except Exception as e:
+                # Rows are back in the buffer; try again next interval
+                logger.error(f"Writing {rows} buffered weather rows failed: {str(e)}")
+
+    def flush(self) -> int:
+        """
+        Write all buffered rows as one snapshot.
+
+        If the writer fails, the rows go back to the front of the buffer
+        and the error is raised.
+
+        Returns:
+            int: Rows written
+        """
+        with self._flush_lock:
+            with self._buffer_lock:
+                frames, self._buffer, self._buffer_rows = self._buffer, [], 0
+            self._last_flush = time.monotonic()
+            if not frames:
+                return 0
+
+            batch = pd.concat(frames, ignore_index=True)
+            try:
+                self.writer(batch)
+            except Exception:
+                with self._buffer_lock:
+                    self._buffer = frames + self._buffer
+                    self._buffer_rows += len(batch)
+                raise
+            self.rows_written += len(batch)
+            self._save_index()
+            if self.combine_on_flush:
+                get_combine_weather_data(data_path=self.data_path, lock=True)
+            logger.info(f"Wrote {len(batch)} buffered weather rows")
+            return len(batch)
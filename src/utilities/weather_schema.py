@@ -0,0 +1,158 @@
+# Libraries ----
+from pathlib import Path
+from typing import List, Optional, Union
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Canonical in-memory types for weather snapshot columns. Names, countries and
+# descriptions repeat on every row, so they are categoricals (dictionary
+# encoded in Parquet); coordinates and measurements fit in float32 and
+# humidity (0-100 %) in a nullable int16.
+WEATHER_SCHEMA = {
+    "request_datetime": "datetime64[us]",
+    "city_name": "category",
+    "city_id": "int32",
+    "city_country": "category",
+    "longitude": "float32",
+    "latitude": "float32",
+    "weather_description": "category",
+    "temp_farenheit": "float32",
+    "temp_min_farenheit": "float32",
+    "temp_max_farenheit": "float32",
+    "humidity": "Int16",
+    "wind_speed": "float32",
+}
+
+WEATHER_ARROW_SCHEMA = pa.schema([
+    ("request_datetime", pa.timestamp("us")),
+    ("city_name", pa.dictionary(pa.int32(), pa.string())),
+    ("city_id", pa.int32()),
+    ("city_country", pa.dictionary(pa.int32(), pa.string())),
+    ("longitude", pa.float32()),
+    ("latitude", pa.float32()),
+    ("weather_description", pa.dictionary(pa.int32(), pa.string())),
+    ("temp_farenheit", pa.float32()),
+    ("temp_min_farenheit", pa.float32()),
+    ("temp_max_farenheit", pa.float32()),
+    ("humidity", pa.int16()),
+    ("wind_speed", pa.float32()),
+])
+
+
+# Function: Apply Weather Schema ----
+def apply_weather_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast a weather frame to the compact canonical types.
+
+    Columns not in WEATHER_SCHEMA are left as they are.
+
+    Args:
+        df (pandas.DataFrame): Weather snapshot rows
+
+    Returns:
+        pandas.DataFrame: Typed copy of the frame
+    """
+    casts = {}
+    for column, dtype in WEATHER_SCHEMA.items():
+        if column not in df.columns or str(df[column].dtype) == dtype:
+            continue
+        if dtype.startswith("datetime64"):
+            casts[column] = pd.to_datetime(df[column]).astype(dtype)
+        elif dtype == "Int16":
+            casts[column] = pd.to_numeric(df[column]).round().astype(dtype)
+        else:
+            casts[column] = df[column].astype(dtype)
+    return df.assign(**casts)
+
+
+# Function: Load Weather Frame ----
+def load_weather_frame(
+    path: Union[str, Path] = "data/open_weather_data/open_weather_data_combined.csv",
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Load weather data with the compact canonical types.
+
+    CSVs are parsed straight into the target dtypes, so the object-string
+    intermediate frame is never built. A directory loads every snapshot CSV
+    in it (excluding the combined file).
+
+    Args:
+        path (str): Combined CSV, Parquet file or snapshot directory
+        columns (list): Optional subset of columns to read
+
+    Returns:
+        pandas.DataFrame: Typed weather frame
+    """
+    path = Path(path)
+    if path.is_dir():
+        files = sorted(f for f in path.glob("*.csv") if not f.name.endswith("combined.csv"))
+        if not files:
+            raise FileNotFoundError(f"No weather snapshots found in {path}")
+        frames = [load_weather_frame(f, columns) for f in files]
+        combined = pd.concat(frames, ignore_index=True)
+        # Categoricals with different categories fall back to object on concat
+        for column in combined.columns:
+            if frames[0][column].dtype == "category" and combined[column].dtype != "category":
+                combined[column] = union_categoricals([f[column] for f in frames])
+        return combined
+
+    if path.suffix == ".parquet":
+        return apply_weather_schema(pd.read_parquet(path, columns=columns))
+
+    dtypes = {
+        column: dtype for column, dtype in WEATHER_SCHEMA.items()
+        if not dtype.startswith("datetime64") and (columns is None or column in columns)
+    }
+    parse_dates = ["request_datetime"] if columns is None or "request_datetime" in columns else False
+    df = pd.read_csv(path, usecols=columns, dtype=dtypes, parse_dates=parse_dates)
+    return apply_weather_schema(df)
+
+
+# Function: Save Weather Parquet ----
+def save_weather_parquet(df: pd.DataFrame, path: Union[str, Path], row_group_size: int = 1_000_000) -> None:
+    """
+    Write a weather frame to Parquet with the canonical Arrow schema.
+
+    Args:
+        df (pandas.DataFrame): Weather snapshot rows
+        path (str): Output file
+        row_group_size (int): Rows per Parquet row group
+    """
+    df = apply_weather_schema(df)
+    known = [field.name for field in WEATHER_ARROW_SCHEMA if field.name in df.columns]
+    extra = [column for column in df.columns if column not in WEATHER_SCHEMA]
+    schema = pa.schema(
+        [WEATHER_ARROW_SCHEMA.field(name) for name in known]
+        + [pa.Schema.from_pandas(df[extra], preserve_index=False).field(name) for name in extra]
+    )
+    table = pa.Table.from_pandas(df[known + extra], schema=schema, preserve_index=False)
+    pq.write_table(table, path, row_group_size=row_group_size)
+
+
+# Function: Memory Report ----
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare per-column memory of a frame before and after `apply_weather_schema`.
+
+    Args:
+        df (pandas.DataFrame): Weather frame with default pandas dtypes
+
+    Returns:
+        pandas.DataFrame: dtype and MB per column (plus a total row) with the reduction ratio
+    """
+    compact = apply_weather_schema(df)
+    before = df.memory_usage(deep=True, index=False)
+    after = compact.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "dtype_before": df.dtypes.astype(str),
+        "dtype_after": compact.dtypes.astype(str),
+        "mb_before": before / 1024**2,
+        "mb_after": after / 1024**2,
+    })
+    report.loc["total"] = ["", "", report["mb_before"].sum(), report["mb_after"].sum()]
+    report["reduction"] = report["mb_before"] / report["mb_after"]
+    return report.round(2)
@@ -0,0 +1,241 @@
+# Libraries ----
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+# Observation keys pack (location position, seconds since the first observation)
+# into one int64 so per-location time windows are a single searchsorted
+_TIME_BITS = 34
+
+
+# Function: Haversine Distance ----
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Great-circle distance in kilometres, vectorized over numpy arrays.
+
+    Args:
+        lat1, lon1: Point(s) in degrees
+        lat2, lon2: Point(s) in degrees (broadcast against the first)
+
+    Returns:
+        numpy.ndarray: Distances in km
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class WeatherSpatialIndex:
+    """
+    Radius and nearest-neighbour queries over stored weather observations.
+
+    Tracked locations (one per city_id) are bucketed on a lat/lon grid and
+    sorted by cell, so a query only computes haversine distances for the
+    cells overlapping its bounding box. Observations are sorted by
+    (location, request_datetime), so a time window is a binary search per
+    candidate location instead of a scan of the whole history.
+    """
+
+    def __init__(self, observations: pd.DataFrame, cell_degrees: float = 1.0):
+        """
+        Build the index.
+
+        Args:
+            observations (pandas.DataFrame): Snapshot rows with city_id, latitude,
+                longitude and request_datetime
+            cell_degrees (float): Grid cell size in degrees (default: 1.0, ~111 km)
+        """
+        self.cell_degrees = cell_degrees
+        self._n_lon_cells = int(np.ceil(360 / cell_degrees))
+        self._n_lat_cells = int(np.ceil(180 / cell_degrees))
+
+        df = observations.reset_index(drop=True)
+        times = pd.to_datetime(df["request_datetime"])
+
+        # - Locations ----
+        # Latest coordinates per city_id, ordered by grid cell
+        latest = df.assign(_time=times).sort_values("_time").drop_duplicates("city_id", keep="last")
+        location_columns = [c for c in ["city_id", "city_name", "city_country", "latitude", "longitude"] if c in df.columns]
+        locations = latest[location_columns].reset_index(drop=True)
+        cells = self._cell_ids(locations["latitude"].to_numpy(), locations["longitude"].to_numpy())
+        order = np.argsort(cells, kind="stable")
+        self.locations = locations.iloc[order].reset_index(drop=True)
+        self._cells = cells[order]
+        self._lat = self.locations["latitude"].to_numpy(dtype=np.float64)
+        self._lon = self.locations["longitude"].to_numpy(dtype=np.float64)
+
+        # - Observations ----
+        position = pd.Series(np.arange(len(self.locations)), index=self.locations["city_id"])
+        location_pos = position.reindex(df["city_id"]).to_numpy()
+        seconds = ((times - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+        self._time_origin = int(seconds.min()) if len(seconds) else 0
+        keys = (location_pos.astype(np.int64) << _TIME_BITS) | (seconds - self._time_origin)
+        order = np.argsort(keys, kind="stable")
+        self.observations = df.iloc[order].reset_index(drop=True)
+        self._keys = keys[order]
+
+    @classmethod
+    def from_snapshots(cls, data_path: Union[str, Path] = "data/open_weather_data/", **kwargs) -> "WeatherSpatialIndex":
+        """
+        Build the index from a snapshot directory, preferring the combined file.
+
+        Args:
+            data_path (str): Snapshot directory
+
+        Returns:
+            WeatherSpatialIndex: The index
+        """
+        path = Path(data_path)
+        combined = path / "open_weather_data_combined.csv"
+        if combined.exists():
+            return cls(pd.read_csv(combined), **kwargs)
+        files = [f for f in path.glob("*.csv") if not f.name.endswith("combined.csv")]
+        if not files:
+            raise FileNotFoundError(f"No weather snapshots found in {data_path}")
+        return cls(pd.concat((pd.read_csv(f) for f in files), ignore_index=True), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    # Grid ----
+    def _cell_ids(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        lat_cell = np.clip(((lat + 90) // self.cell_degrees).astype(np.int64), 0, self._n_lat_cells - 1)
+        lon_cell = (((lon + 180) % 360) // self.cell_degrees).astype(np.int64)
+        return lat_cell * self._n_lon_cells + lon_cell
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Positions of locations in grid cells overlapping the query's bounding box."""
+        dlat = radius_km / KM_PER_DEGREE
+        lat_lo, lat_hi = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        # Longitude span widens towards the poles; take the whole row near them
+        max_abs_lat = max(abs(lat_lo), abs(lat_hi))
+        if max_abs_lat >= 89.9 or dlat >= 90:
+            dlon = 180.0
+        else:
+            dlon = dlat / np.cos(np.radians(max_abs_lat))
+
+        row_lo = int(np.clip((lat_lo + 90) // self.cell_degrees, 0, self._n_lat_cells - 1))
+        row_hi = int(np.clip((lat_hi + 90) // self.cell_degrees, 0, self._n_lat_cells - 1))
+        if dlon >= 180:
+            col_ranges = [(0, self._n_lon_cells - 1)]
+        else:
+            col_lo = int(((lon - dlon + 180) % 360) // self.cell_degrees)
+            col_hi = int(((lon + dlon + 180) % 360) // self.cell_degrees)
+            # Split ranges crossing the antimeridian
+            col_ranges = [(col_lo, col_hi)] if col_lo <= col_hi else [(col_lo, self._n_lon_cells - 1), (0, col_hi)]
+
+        slices = []
+        for row in range(row_lo, row_hi + 1):
+            base = row * self._n_lon_cells
+            for col_lo, col_hi in col_ranges:
+                start = np.searchsorted(self._cells, base + col_lo, side="left")
+                end = np.searchsorted(self._cells, base + col_hi, side="right")
+                if end > start:
+                    slices.append(np.arange(start, end))
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    # Time windows ----
+    def _window_bounds(self, positions: np.ndarray, start=None, end=None) -> tuple:
+        """Observation [lo, hi) row ranges for each location within [start, end]."""
+        offset_lo = 0 if start is None else max(0, int(pd.Timestamp(start).timestamp()) - self._time_origin)
+        offset_hi = (1 << _TIME_BITS) - 1 if end is None else int(pd.Timestamp(end).timestamp()) - self._time_origin
+        base = positions.astype(np.int64) << _TIME_BITS
+        if offset_hi < offset_lo:
+            return np.zeros(len(positions), dtype=np.int64), np.zeros(len(positions), dtype=np.int64)
+        lo = np.searchsorted(self._keys, base | offset_lo, side="left")
+        hi = np.searchsorted(self._keys, base | offset_hi, side="right")
+        return lo, hi
+
+    def _gather(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        counts = hi - lo
+        if counts.sum() == 0:
+            return np.empty(0, dtype=np.int64)
+        # Concatenated aranges lo[i]..hi[i] without a Python loop
+        starts = np.repeat(lo - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+        return starts + np.arange(counts.sum())
+
+    # Queries ----
+    def within_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        start=None,
+        end=None
+    ) -> pd.DataFrame:
+        """
+        Observations from locations within `radius_km` of a point.
+
+        Args:
+            lat (float): Query latitude
+            lon (float): Query longitude
+            radius_km (float): Search radius in km
+            start: Optional earliest request_datetime (inclusive)
+            end: Optional latest request_datetime (inclusive)
+
+        Returns:
+            pandas.DataFrame: Observation rows with a distance_km column, nearest first
+        """
+        positions = self._candidates(lat, lon, radius_km)
+        distances = haversine_km(lat, lon, self._lat[positions], self._lon[positions])
+        keep = distances <= radius_km
+        positions, distances = positions[keep], distances[keep]
+
+        lo, hi = self._window_bounds(positions, start, end)
+        rows = self._gather(lo, hi)
+        result = self.observations.iloc[rows].copy()
+        result["distance_km"] = np.repeat(distances, hi - lo)
+        return result.sort_values(["distance_km", "request_datetime"], kind="stable").reset_index(drop=True)
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 1,
+        start=None,
+        end=None
+    ) -> pd.DataFrame:
+        """
+        The `k` tracked locations nearest to a point.
+
+        The search radius starts at one grid cell and doubles until k
+        locations (with observations in the time window, if one is given)
+        are inside it, so only nearby cells are ever scanned.
+
+        Args:
+            lat (float): Query latitude
+            lon (float): Query longitude
+            k (int): Number of locations to return
+            start: Optional earliest request_datetime (inclusive)
+            end: Optional latest request_datetime (inclusive)
+
+        Returns:
+            pandas.DataFrame: Locations with distance_km and observation count, nearest first
+        """
+        radius_km = self.cell_degrees * KM_PER_DEGREE
+        max_radius_km = np.pi * EARTH_RADIUS_KM
+        while True:
+            positions = self._candidates(lat, lon, radius_km)
+            distances = haversine_km(lat, lon, self._lat[positions], self._lon[positions])
+            keep = distances <= radius_km
+            positions, distances = positions[keep], distances[keep]
+            lo, hi = self._window_bounds(positions, start, end)
+            has_rows = hi > lo
+            positions, distances, counts = positions[has_rows], distances[has_rows], (hi - lo)[has_rows]
+            if len(positions) >= k or radius_km >= max_radius_km:
+                break
+            radius_km = min(radius_km * 2, max_radius_km)
+
+        top = np.argsort(distances, kind="stable")[:k]
+        result = self.locations.iloc[positions[top]].copy()
+        result["distance_km"] = distances[top]
+        result["observations"] = counts[top]
+        return result.reset_index(drop=True)
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+from google.cloud import bigquery
+
+from benchmarks.fake_bigquery import FakeBigQueryClient
+from src.utilities.bigquery_functions import BigQueryUploader
+
+
+@pytest.fixture
+def uploader():
+    return BigQueryUploader("test-project", "test_dataset", client=FakeBigQueryClient())
+
+
+SCHEMA = [bigquery.SchemaField("city_id", "INTEGER")]
+
+
+@pytest.mark.parametrize("value", [1e20, "1e20"])
+def test_schema_report_counts_values_outside_int64(uploader, value):
+    df = pd.DataFrame({"city_id": pd.Series([1, value], dtype=object if isinstance(value, str) else None)})
+
+    report = uploader.schema_report(df, SCHEMA).set_index("field")
+
+    assert report.loc["city_id", "out_of_range"] == 1
+    assert report.loc["city_id", "invalid_count"] == 0
+    assert "1 value(s) out of range" in report.loc["city_id", "issue"]
+
+
+def test_validate_schema_raises_on_values_outside_int64(uploader):
+    df = pd.DataFrame({"city_id": [1.0, -1e20]})
+
+    with pytest.raises(ValueError, match="out of range"):
+        uploader.validate_schema(df, SCHEMA)
+
+
+def test_coerce_keeps_values_outside_int64(uploader):
+    df = pd.DataFrame({"city_id": [1.0, 1e20]})
+
+    report = uploader.schema_report(df, SCHEMA, coerce=True).set_index("field")
+
+    assert not report.loc["city_id", "coerced"]
+    assert df["city_id"].tolist() == [1.0, 1e20]
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+from benchmarks.fake_bigquery import FakeBigQueryClient
+from src.utilities.bigquery_functions import BigQueryUploader
+
+TABLE_REF = "test-project.test_dataset.weather"
+
+
+def make_uploader(**client_kwargs):
+    client = FakeBigQueryClient(**client_kwargs)
+    return BigQueryUploader("test-project", "test_dataset", client=client), client
+
+
+def test_chunked_truncate_replaces_target_through_staging():
+    uploader, client = make_uploader()
+    df = pd.DataFrame({"city_id": range(10)})
+
+    stats = uploader.upload_dataframe_chunked(df, "weather", write_disposition="WRITE_TRUNCATE", chunk_size=3)
+
+    assert stats["chunks"] == 4
+    [(staging_ref, destination)] = client.copies
+    assert destination == TABLE_REF
+    assert staging_ref.startswith(f"{TABLE_REF}__staging_")
+    assert staging_ref in client.table_expires
+    assert client.tables == {TABLE_REF}
+
+
+def test_chunked_truncate_failure_leaves_target_untouched():
+    uploader, client = make_uploader(error_rate=1.0)
+    df = pd.DataFrame({"city_id": range(10)})
+
+    with pytest.raises(RuntimeError):
+        uploader.upload_dataframe_chunked(
+            df, "weather", write_disposition="WRITE_TRUNCATE", chunk_size=3, max_retries=0
+        )
+
+    assert client.copies == []
+    assert client.tables == set()
+
+
+def test_upsert_expires_and_deletes_staging_table():
+    uploader, client = make_uploader()
+    client.tables.add(TABLE_REF)
+    df = pd.DataFrame({"city_id": [1, 2], "temp_farenheit": [50.0, 60.0]})
+
+    uploader.upsert_dataframe(df, "weather", key_columns=["city_id"])
+
+    [staging_ref] = client.table_expires
+    assert staging_ref.startswith(f"{TABLE_REF}__staging_")
+    assert client.tables == {TABLE_REF}
+    assert len(client.queries) == 1
+
+
+def test_upsert_deletes_staging_table_when_load_fails():
+    uploader, client = make_uploader(error_rate=1.0)
+    client.tables.add(TABLE_REF)
+    deleted = []
+    client.delete_table = lambda table_ref, not_found_ok=False: deleted.append(table_ref)
+    df = pd.DataFrame({"city_id": [1, 2], "temp_farenheit": [50.0, 60.0]})
+
+    with pytest.raises(RuntimeError):
+        uploader.upsert_dataframe(df, "weather", key_columns=["city_id"])
+
+    assert len(deleted) == 1 and deleted[0].startswith(f"{TABLE_REF}__staging_")
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from src.utilities.location_index import LocationIndex
+from src.utilities.weather_scheduler import WeatherPollingDaemon
+
+
+@pytest.fixture
+def index(tmp_path):
+    return LocationIndex(tmp_path / "location_index.csv")
+
+
+def test_lookup_does_not_substitute_another_states_city(index):
+    index.add("Portland", "OR", "US", 5746545, 45.52, -122.68)
+
+    assert index.lookup("Portland", "ME", "US") is None
+    assert index.lookup("Portland", None, "US")["city_id"] == 5746545
+
+
+def test_lookup_falls_back_to_stateless_entry(index):
+    index.add("Odenton", None, "US", 4364362, 39.08, -76.70, source="snapshots")
+
+    assert index.lookup("Odenton", "MD", "US")["city_id"] == 4364362
+
+
+def test_daemon_learns_city_id_from_name_response(index):
+    calls = []
+
+    def fetch(country, state, city, session, timeout, city_id):
+        calls.append(city_id)
+        return pd.DataFrame({"city_id": [4364362], "latitude": [39.08], "longitude": [-76.70]})
+
+    location = {"city": "Odenton", "state": "MD", "country": "US", "interval": 0}
+    daemon = WeatherPollingDaemon(
+        [location], jitter=0, max_concurrency=1, fetch=fetch, writer=lambda df: None, location_index=index
+    )
+    daemon.run(max_polls=2)
+
+    assert calls == [None, 4364362]
+    assert LocationIndex(index.path).lookup("Odenton", "MD", "US")["city_id"] == 4364362
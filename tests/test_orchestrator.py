@@ -0,0 +1,34 @@
+import pytest
+
+from src.utilities.orchestrator import Orchestrator, Upstream
+
+
+def make_orchestrator(tmp_path):
+    orchestrator = Orchestrator(checkpoint_path=str(tmp_path / "checkpoints.json"), verbose=False)
+    orchestrator.add_source("source")
+    return orchestrator
+
+
+def test_rejects_upstream_result_of_memoized_task(tmp_path):
+    orchestrator = make_orchestrator(tmp_path)
+    orchestrator.add_task("extract", "source", lambda: [1, 2], memo_key="2024-01-01")
+    orchestrator.add_task("save", "source", len, Upstream("extract"))
+
+    with pytest.raises(ValueError, match="memoized task extract"):
+        orchestrator.run()
+
+
+def test_memoized_task_can_be_waited_for(tmp_path):
+    calls = []
+
+    def run():
+        orchestrator = make_orchestrator(tmp_path)
+        orchestrator.add_task("extract", "source", lambda day: calls.append(day), "2024-01-01", memo_key="2024-01-01")
+        orchestrator.add_task("save", "source", lambda: "saved", depends_on=("extract",))
+        return orchestrator.run()
+
+    run()
+    report = run()
+
+    assert calls == ["2024-01-01"]
+    assert {task["task"]: task["status"] for task in report["tasks"]} == {"extract": "skipped", "save": "ok"}
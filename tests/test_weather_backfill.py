@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pandas as pd
+
+from src.utilities.weather_backfill import WeatherBackfill, get_stored_snapshot_keys
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, items):
+        self._items = items
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"list": self._items}
+
+
+class FakeSession:
+    def __init__(self, items):
+        self.items = items
+
+    def get(self, url, params=None, timeout=None):
+        return FakeResponse(self.items)
+
+
+LOCATION = {
+    "city": "Odenton", "state": "MD", "country": "US", "city_id": 4364362, "city_name": "Odenton",
+    "city_country": "US", "longitude": -76.70, "latitude": 39.08,
+}
+
+
+def test_backfill_skips_hours_stored_by_live_snapshots(tmp_path):
+    live_hour = datetime(2024, 1, 1, 12, 30)
+    pd.DataFrame({"city_id": [4364362], "request_datetime": [live_hour.strftime("%Y-%m-%d %H:%M:%S")]}).to_csv(
+        tmp_path / "open_weather_data_live.csv", index=False
+    )
+    items = [
+        {"dt": int(datetime(2024, 1, 1, hour).timestamp()), "main": {"temp": 280.0, "humidity": 50}}
+        for hour in (12, 13)
+    ]
+
+    backfill = WeatherBackfill(
+        [LOCATION], datetime(2024, 1, 1), datetime(2024, 1, 2), data_path=str(tmp_path),
+        checkpoint_path=str(tmp_path / "checkpoint.jsonl"), calls_per_minute=6000
+    )
+    backfill.session = FakeSession(items)
+    rows = backfill._run_unit("unit", LOCATION, backfill.start, backfill.end, get_stored_snapshot_keys(tmp_path))
+
+    assert rows == 1
+    written = pd.read_csv(next(tmp_path.glob("open_weather_data_backfill_*.csv")))
+    assert written["request_datetime"].tolist() == ["2024-01-01 13:00:00"]
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,31 @@
+import pandas as pd
+
+from src.utilities.weather_changefeed import WeatherChangeFeed
+
+
+def rows(n):
+    return pd.DataFrame({"city_id": range(n), "temp_farenheit": [50.0] * n})
+
+
+def test_append_after_torn_index_line(tmp_path):
+    feed = WeatherChangeFeed(tmp_path)
+    feed.append(rows(2), sources=["a.csv"])
+    with open(feed.index_path, "a") as f:
+        f.write('{"first_offset": 2, "ro')
+
+    feed = WeatherChangeFeed(tmp_path)
+    assert feed.append(rows(3), sources=["b.csv"]) == (2, 5)
+
+    reopened = WeatherChangeFeed(tmp_path)
+    assert [entry["sources"] for entry in reopened.entries] == [["a.csv"], ["b.csv"]]
+    assert reopened.read_since(0)[1] == 5
+
+
+def test_commit_keeps_other_consumers(tmp_path):
+    feed = WeatherChangeFeed(tmp_path)
+    feed.commit("bigquery", 10)
+    WeatherChangeFeed(tmp_path).commit("rollups", 4)
+
+    assert feed.committed("bigquery") == 10
+    assert feed.committed("rollups") == 4
+    assert not list(tmp_path.glob(".consumers.json.*.tmp"))
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from src.utilities.weather_rollups import load_weather_rollup, update_weather_rollups
+
+
+def write_snapshot(data_path, name, humidity, wind_speed):
+    pd.DataFrame({
+        "request_datetime": ["2024-01-01 10:00:00", "2024-01-01 11:00:00"],
+        "city_name": ["Odenton"] * 2,
+        "city_id": [4364362] * 2,
+        "city_country": ["US"] * 2,
+        "weather_description": ["clear sky"] * 2,
+        "temp_farenheit": [40.0, 50.0],
+        "temp_min_farenheit": [38.0, 48.0],
+        "temp_max_farenheit": [42.0, 52.0],
+        "humidity": humidity,
+        "wind_speed": wind_speed,
+    }).to_csv(data_path / name, index=False)
+
+
+def test_means_ignore_missing_readings(tmp_path):
+    data_path, rollup_path = tmp_path / "data", tmp_path / "rollups"
+    data_path.mkdir()
+    write_snapshot(data_path, "a.csv", [60, None], [None, 4.0])
+
+    update_weather_rollups(str(data_path), str(rollup_path))
+    daily = load_weather_rollup("daily", str(rollup_path)).iloc[0]
+
+    assert daily["temp_mean"] == pytest.approx(45.0)
+    assert daily["humidity_mean"] == pytest.approx(60.0)
+    assert daily["wind_speed_mean"] == pytest.approx(4.0)
+
+
+def test_update_merges_state_without_per_column_counts(tmp_path):
+    data_path, rollup_path = tmp_path / "data", tmp_path / "rollups"
+    data_path.mkdir()
+    write_snapshot(data_path, "a.csv", [60, 70], [2.0, 4.0])
+    update_weather_rollups(str(data_path), str(rollup_path))
+
+    # Rewrite the current state as it looked before the count columns existed
+    generation_dir = next(rollup_path.glob("generation_*"))
+    for name in ("daily.csv", "monthly.csv"):
+        state = pd.read_csv(generation_dir / name, dtype={"period": str})
+        state.drop(columns=["humidity_count", "wind_speed_count"]).to_csv(generation_dir / name, index=False)
+
+    write_snapshot(data_path, "b.csv", [80, 90], [6.0, 8.0])
+    update_weather_rollups(str(data_path), str(rollup_path))
+    daily = load_weather_rollup("daily", str(rollup_path)).iloc[0]
+
+    assert daily["observations"] == 4
+    assert daily["humidity_count"] == 4
+    assert daily["humidity_mean"] == pytest.approx(75.0)